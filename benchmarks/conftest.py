@@ -0,0 +1,137 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Config shapes that the benchmarks load.
+
+Each fixture returns a config class and an environment to load it from.
+"""
+
+import importlib.util
+import sys
+
+from pathlib import Path
+
+import pytest
+
+import environ
+
+from environ.secrets import VaultEnvSecrets
+
+
+def _import_synthetic():
+    """
+    Import the generator of config classes that's shared with the tests.
+    """
+    path = Path(__file__).parent.parent / "tests" / "_synthetic.py"
+    spec = importlib.util.spec_from_file_location("_synthetic", path)
+    mod = sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+
+    return mod
+
+
+_synthetic = _import_synthetic()
+
+
+@pytest.fixture(name="generate")
+def _generate():
+    """
+    Return `_synthetic.generate` from the tests.
+    """
+    return _synthetic.generate
+
+
+def _config(name, attributes):
+    return environ.config(type(name, (), attributes))
+
+
+@pytest.fixture(name="wide")
+def _wide():
+    """
+    One class with 200 attributes, half of them converted.
+    """
+    cls = _config(
+        "Wide",
+        {
+            f"a{i}": environ.var(converter=int if i % 2 else None)
+            for i in range(200)
+        },
+    )
+
+    return cls, {f"APP_A{i}": str(i) for i in range(200)}
+
+
+@pytest.fixture(name="deep")
+def _deep():
+    """
+    Groups nested 30 levels deep with two attributes each.
+    """
+    cls = _config("Level29", {"x": environ.var(), "y": environ.var("y")})
+    for i in reversed(range(29)):
+        cls = _config(
+            f"Level{i}",
+            {
+                "x": environ.var(),
+                "y": environ.var("y"),
+                f"g{i + 1}": environ.group(cls),
+            },
+        )
+
+    env = {
+        "_".join(["APP", *(f"G{j}" for j in range(1, i + 1)), "X"]): "x"
+        for i in range(30)
+    }
+
+    return cls, env
+
+
+@pytest.fixture(name="optional_heavy")
+def _optional_heavy():
+    """
+    50 optional groups of which only every tenth is present.
+    """
+    group = _config("Opt", {"x": environ.var(), "y": environ.var("y")})
+    cls = _config(
+        "OptionalHeavy",
+        {f"o{i}": environ.group(group, optional=True) for i in range(50)},
+    )
+
+    return cls, {f"APP_O{i}_X": "x" for i in range(0, 50, 10)}
+
+
+@pytest.fixture(name="secret_heavy")
+def _secret_heavy():
+    """
+    100 secrets from the environment using a vault prefix that is computed
+    on each load.
+    """
+    vault = VaultEnvSecrets(vault_prefix=lambda env: env["VAULT_PREFIX"])
+    cls = _config("SecretHeavy", {f"s{i}": vault.secret() for i in range(100)})
+    env = {f"SECRET_S{i}": f"s3kr3t{i}" for i in range(100)}
+    env["VAULT_PREFIX"] = "SECRET"
+
+    return cls, env
+
+
+@pytest.fixture(name="big_environ")
+def _big_environ(wide):
+    """
+    The wide config in an environment with 50,000 unrelated variables.
+    """
+    cls, env = wide
+
+    return cls, {**{f"OTHER_VAR_{i}": "x" * 32 for i in range(50_000)}, **env}
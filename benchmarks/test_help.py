@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+import environ
+
+
+@pytest.mark.parametrize("shape", ["wide", "deep", "optional_heavy"])
+@pytest.mark.parametrize("display_defaults", [True, False])
+def test_generate_help(benchmark, request, shape, display_defaults):
+    """
+    Generating help for configs of all shapes.
+    """
+    cls, _ = request.getfixturevalue(shape)
+
+    benchmark(environ.generate_help, cls, display_defaults=display_defaults)
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Memory used by many loaded configs.
+
+These tests assert instead of timing, but they take too long for the
+regular test suite.
+"""
+
+import logging
+import tracemalloc
+
+import environ
+
+
+@environ.config(prefix="TENANT", frozen=True)
+class Tenant:
+    @environ.config(frozen=True)
+    class Logging:
+        level = environ.var("INFO")
+        fmt = environ.var("json")
+
+    @environ.config(frozen=True)
+    class Pool:
+        size = environ.var("10", converter=int)
+        timeout = environ.var("30", converter=float)
+
+    name = environ.var()
+    logging = environ.group(Logging)
+    pool = environ.group(Pool)
+
+
+def _tenant_envs(n):
+    for i in range(n):
+        yield {
+            "TENANT_NAME": f"tenant-{i}",
+            # Build the string at runtime, so it's not shared already.
+            "TENANT_LOGGING_LEVEL": "".join(list("DEBUG")),
+            "TENANT_POOL_SIZE": "20",
+        }
+
+
+def test_interning(caplog):
+    """
+    Interning reduces the memory used by 10,000 per-tenant configs.
+    """
+    # Captured debug log records would dwarf the configs.
+    caplog.set_level(logging.INFO, logger="environ_config")
+
+    def measure(intern):
+        tracemalloc.start()
+        try:
+            cfgs = list(
+                environ.to_config_many(
+                    Tenant, _tenant_envs(10_000), intern=intern
+                )
+            )
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert 10_000 == len(cfgs)
+
+        return size
+
+    assert measure(intern=True) < measure(intern=False) / 2
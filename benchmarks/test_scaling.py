@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Loading should scale linearly: compare the timings within each group.
+"""
+
+import pytest
+
+import environ
+
+
+MIXED = {"optional": 0.2, "secrets": 0.2, "converters": 0.2}
+
+
+@pytest.mark.benchmark(group="fields")
+@pytest.mark.parametrize("fields", [10, 100, 1000, 10_000])
+def test_fields(benchmark, generate, fields):
+    """
+    Growing number of attributes in 10 levels.
+    """
+    syn = generate(fields, depth=10, **MIXED)
+
+    benchmark(environ.to_config, syn.cls, syn.environ)
+
+
+@pytest.mark.benchmark(group="depth")
+@pytest.mark.parametrize("depth", [1, 10, 100, 500])
+def test_depth(benchmark, generate, depth):
+    """
+    1000 attributes in a growing number of levels.
+    """
+    syn = generate(1000, depth=depth, **MIXED)
+
+    benchmark(environ.to_config, syn.cls, syn.environ)
+
+
+@pytest.mark.benchmark(group="help")
+@pytest.mark.parametrize("fields", [10, 100, 1000, 10_000])
+def test_generate_help(benchmark, generate, fields):
+    """
+    Help for a growing number of attributes in 10 levels.
+    """
+    syn = generate(fields, depth=10, **MIXED)
+
+    benchmark(environ.generate_help, syn.cls)
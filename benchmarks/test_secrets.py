@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from unittest.mock import patch
+
+import boto3
+import pytest
+
+from moto import mock_aws
+
+import environ
+
+from environ.secrets import SecretsManagerSecrets
+from environ.secrets._utils import _SecretStr
+
+
+def test_secret_str_repr(benchmark):
+    """
+    repr() of a single secret.
+    """
+    benchmark(repr, _SecretStr("s3kr3t"))
+
+
+def test_config_repr(benchmark, secret_heavy):
+    """
+    repr() of a config with 100 secrets that have to be censored.
+    """
+    cls, env = secret_heavy
+
+    benchmark(repr, environ.to_config(cls, env))
+
+
+@pytest.fixture(name="secretsmanager")
+def _secretsmanager():
+    with (
+        patch.dict(os.environ, {"AWS_DEFAULT_REGION": "us-east-1"}),
+        mock_aws(),
+    ):
+        client = boto3.client("secretsmanager")
+        for i in range(20):
+            client.create_secret(Name=f"app/s{i}", SecretString=f"s3kr3t{i}")
+
+        yield client
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_secretsmanager(benchmark, secretsmanager, cache):
+    """
+    Loading 20 secrets from (a mocked) AWS Secrets Manager -- with and without
+    the version-checking cache.
+    """
+    sm = SecretsManagerSecrets(client=secretsmanager, cache=cache)
+
+    cls = environ.config(
+        type("Cfg", (), {f"s{i}": sm.secret() for i in range(20)})
+    )
+    env = {f"APP_S{i}": f"app/s{i}" for i in range(20)}
+
+    benchmark(environ.to_config, cls, env)
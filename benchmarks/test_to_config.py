@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+import environ
+
+
+@pytest.mark.parametrize(
+    "shape", ["wide", "deep", "optional_heavy", "secret_heavy", "big_environ"]
+)
+def test_to_config(benchmark, request, shape):
+    """
+    Loading configs of all shapes.
+    """
+    cls, env = request.getfixturevalue(shape)
+
+    benchmark(environ.to_config, cls, env)
+
+
+def test_to_config_many(benchmark, wide):
+    """
+    Loading one config from 100 environments.
+    """
+    cls, env = wide
+    envs = [env] * 100
+
+    benchmark(lambda: list(environ.to_config_many(cls, envs)))
+
+
+def test_to_config_instrumented(benchmark, wide):
+    """
+    Loading with an instrumentation hook registered.
+    """
+    cls, env = wide
+
+    def on_field(event):
+        pass
+
+    remove = environ.instrument(on_field=on_field)
+    try:
+        benchmark(environ.to_config, cls, env)
+    finally:
+        remove()
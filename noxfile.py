@@ -116,6 +116,36 @@ def tests_oldest_attrs(session: nox.Session) -> None:
     _cov(session, posargs)
 
 
+@nox.session(python=ALL_SUPPORTED[-2])
+def benchmarks(session: nox.Session) -> None:
+    """
+    Compare the benchmarks to the saved baseline and fail if the fastest run
+    of one got more than 25% slower.
+
+    Save a baseline -- for example before starting to work on a branch --
+    using ``nox -s benchmarks -- save``.
+    """
+    session.install(".", "--group", "benchmarks")
+
+    args = ["benchmarks", "--benchmark-storage=.benchmarks"]
+    if session.posargs and session.posargs[0] == "save":
+        args += ["--benchmark-save=baseline", *session.posargs[1:]]
+    elif not any(Path(".benchmarks").glob("*/*_baseline.json")):
+        session.warn(
+            "No baseline saved, so there's nothing to compare to. "
+            "Save one using `nox -s benchmarks -- save`."
+        )
+        args += session.posargs
+    else:
+        args += [
+            "--benchmark-compare",
+            "--benchmark-compare-fail=min:25%",
+            *session.posargs,
+        ]
+
+    session.run("pytest", *args)
+
+
 @nox.session
 def coverage_report(session: nox.Session) -> None:
     session.install("coverage")
@@ -14,31 +14,61 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import secrets
+from typing import TYPE_CHECKING, Any
+
 from ._environ_config import (
     bool_var,
     config,
     generate_help,
     group,
+    prefetch,
     to_config,
+    to_config_many,
     var,
 )
-from .exceptions import MissingEnvValueError
+from ._instrument import FieldEvent, GroupEvent, LoadEvent, instrument
+from ._profile import LoadProfile, profile
+from .exceptions import LoadTimeoutError, MissingEnvValueError
+
+
+if TYPE_CHECKING:
+    from . import metrics, secrets, snapshot
 
 
 __all__ = [
+    "FieldEvent",
+    "GroupEvent",
+    "LoadEvent",
+    "LoadProfile",
+    "LoadTimeoutError",
     "MissingEnvValueError",
     "bool_var",
     "config",
     "generate_help",
     "group",
+    "instrument",
+    "metrics",
+    "prefetch",
+    "profile",
     "secrets",
+    "snapshot",
     "to_config",
+    "to_config_many",
     "var",
 ]
 
 
-def __getattr__(name: str) -> str:
+# Submodules with expensive imports -- like boto3 or shared memory -- are only
+# imported once they're used.
+_LAZY_SUBMODULES = ("metrics", "secrets", "snapshot")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        import importlib
+
+        return importlib.import_module(f"{__name__}.{name}")
+
     dunder_to_metadata = {
         "__version__": "version",
         "__description__": "summary",
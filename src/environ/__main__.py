@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Command line tools:
+
+    $ python -m environ profile mymodule:Cfg
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+
+from ._profile import profile
+
+
+def _import_class(spec):
+    """
+    Import a class from *spec* in the form ``package.module:Class.Nested``.
+    """
+    module, _, qualname = spec.partition(":")
+    if not qualname:
+        msg = f"{spec!r} is not in the form 'module:Class'."
+        raise argparse.ArgumentTypeError(msg)
+
+    try:
+        obj = importlib.import_module(module)
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError) as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+    return obj
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the command line interface and return the exit status.
+    """
+    parser = argparse.ArgumentParser(prog="python -m environ")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser(
+        "profile",
+        help="load a config from the environment and show where time goes",
+    )
+    p.add_argument(
+        "config_cls",
+        metavar="module:Class",
+        type=_import_class,
+        help="the config class to load",
+    )
+    p.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="how many of the slowest getters and classes to show",
+    )
+
+    args = parser.parse_args(argv)
+
+    prof = profile(args.config_cls)
+    print(prof.report(args.limit))  # noqa: T201
+
+    return 0 if prof.load.exception is None else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
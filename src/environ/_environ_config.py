@@ -16,15 +16,42 @@
 
 from __future__ import annotations
 
+import contextlib
+import contextvars
+import functools
 import logging
 import os
-
-from collections.abc import Callable
+import queue
+import threading
+import time
+import weakref
+
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor, Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextvars import ContextVar
 from typing import Any, Literal, TypeVar, overload
 
 import attrs
 
-from .exceptions import MissingEnvValueError, MissingSecretError
+from . import _instrument
+from ._instrument import (
+    FieldEvent,
+    _active_hooks,
+    _backend,
+    _emit,
+    _field_record,
+    _FieldRecord,
+    _group_done,
+    _note_cache,
+    _note_var,
+    _observe_load,
+)
+from .exceptions import (
+    LoadTimeoutError,
+    MissingEnvValueError,
+    MissingSecretError,
+)
 
 
 CNF_KEY = "environ_config"
@@ -60,6 +87,39 @@ class Raise:
 RAISE = Raise()
 
 
+class _Secret:
+    """
+    Mixin for values that are censored in the reprs of config classes.
+    """
+
+    __slots__ = ()
+
+
+def _censoring_repr(val):
+    return "<SECRET>" if isinstance(val, _Secret) else repr(val)
+
+
+def _secret_repr(val):
+    """
+    ``repr`` for attributes whose values are secret no matter their type --
+    like numbers from JSON secrets that can't be marked using `_Secret`.
+    """
+    return "<SECRET>"
+
+
+def _censor_secrets(cls, fields):
+    """
+    Field transformer that makes the ``__repr__`` of config classes censor
+    secrets.
+
+    Deciding it per field once is much cheaper than having every secret find
+    out who's calling its ``__repr__``.
+    """
+    return [
+        f.evolve(repr=_censoring_repr) if f.repr is True else f for f in fields
+    ]
+
+
 T = TypeVar("T")
 
 
@@ -70,6 +130,7 @@ def config(
     from_environ: str = "from_environ",
     generate_help: str = "generate_help",
     frozen: bool = False,
+    cache_hash: bool = False,
 ) -> Callable[[type[T]], type[T]]: ...
 
 
@@ -84,6 +145,7 @@ def config(
     from_environ: str = "from_environ",
     generate_help: str = "generate_help",
     frozen: bool = False,
+    cache_hash: bool = False,
 ) -> type[T] | Callable[[type[T]], type[T]]:
     """
     Make a class a configuration class.
@@ -108,6 +170,15 @@ def config(
         frozen:
             The configuration will be immutable after instantiation, if `True`.
 
+        cache_hash:
+            Compute the hash of the -- necessarily *frozen* -- configuration
+            only once and cache it.  Makes it cheap to use config instances as
+            keys in dicts or `functools.lru_cache`.
+
+            Additionally, comparisons short-circuit if both sides are the same
+            object (for example shared groups) or if their cached hashes
+            differ.
+
     .. versionadded:: 19.1.0
        *from_environ*
     .. versionadded:: 19.1.0
@@ -116,21 +187,34 @@ def config(
        *frozen*
     .. versionchanged:: 21.1.0
        *prefix* now defaults to *PREFIX_NOT_SET* instead of ``APP``.
+    .. versionadded:: 26.2.0
+       *cache_hash*
     """
 
     def wrap(cls):
-        def from_environ_fnc(cls, environ=os.environ):
-            return __to_config(cls, environ)
+        def from_environ_fnc(cls, environ=os.environ, **kwargs):
+            return __to_config(cls, environ, **kwargs)
 
         def generate_help_fnc(cls, **kwargs):
             return __generate_help(cls, **kwargs)
 
         cls._prefix = prefix
+        cls._frozen = frozen
         if from_environ is not None:
             setattr(cls, from_environ, classmethod(from_environ_fnc))
         if generate_help is not None:
             setattr(cls, generate_help, classmethod(generate_help_fnc))
-        return attrs.define(cls, frozen=frozen, slots=True)
+        cls = attrs.define(
+            cls,
+            frozen=frozen,
+            slots=True,
+            cache_hash=cache_hash,
+            field_transformer=_censor_secrets,
+        )
+        if cache_hash:
+            _add_fast_eq(cls)
+
+        return cls
 
     if maybe_cls is None:
         return wrap
@@ -138,6 +222,32 @@ def config(
     return wrap(maybe_cls)
 
 
+def _add_fast_eq(cls):
+    """
+    Wrap *cls*'s ``__eq__`` such that it's O(1) for identical objects and --
+    thanks to cached hashes -- for most unequal objects.
+
+    *attrs*'s ``__ne__`` delegates to ``__eq__``, so it's covered too.
+    """
+    attrs_eq = cls.__eq__
+
+    def eq(self, other):
+        if self is other:
+            return True
+        if other.__class__ is self.__class__:
+            try:
+                if hash(self) != hash(other):
+                    return False
+            except TypeError:  # unhashable values
+                pass
+
+        return attrs_eq(self, other)
+
+    eq.__name__ = "__eq__"
+    eq.__qualname__ = f"{cls.__qualname__}.__eq__"
+    cls.__eq__ = eq
+
+
 @attrs.define(slots=True)
 class _ConfigEntry:
     name: str | None = attrs.field(default=None)
@@ -271,82 +381,667 @@ def _default_getter(environ, metadata, prefix, name):
     """
     ce = metadata[CNF_KEY]
     var = ce.name if ce.name is not None else "_".join((*prefix, name)).upper()
-    log.debug("looking for env var '%s'.", var)
+    _note_var(var)
     try:
         return environ[var]
     except KeyError:
         raise MissingEnvValueError(var) from None
 
 
-def _to_config_recurse(config_cls, environ, prefixes, default=RAISE):
+class _Unprefixed(tuple):
+    """
+    The prefixes of a group in a config whose app prefix is empty.
+
+    Getters usually drop the first prefix because it's the app prefix; this
+    tells them that there is none.  See `_group_path`.
+    """
+
+    __slots__ = ()
+
+
+def _group_path(prefix):
+    """
+    Return the prefixes in *prefix* that belong to groups.
+
+    For use by getters that map groups onto paths.
+    """
+    if isinstance(prefix, _Unprefixed):
+        return prefix
+
+    return prefix[1:]
+
+
+@attrs.define(slots=True)
+class _FieldPlan:
+    """
+    A pre-computed instruction how to fill a single config attribute.
+
+    *path* is the dotted path of attribute names leading to it.
+    """
+
+    name: str
+    path: str
+    metadata: Any
+    ce: _ConfigEntry
+    getter: Callable | None
+    sub: _Plan | None
+
+
+@attrs.define(slots=True)
+class _Plan:
+    """
+    The pre-computed tree of a config class: its full prefix and what to do
+    for each of its attributes.
+
+    *path* is the dotted path of attribute names leading to the class within
+    the tree, *help_prefix* the prefix that `generate_help` uses for it.  If
+    *positional* is true, all attributes of *cls* are in *fields* and can be
+    passed positionally.
+
+    Planning doesn't depend on the environment, so it's done once per class
+    and cached.
+    """
+
+    cls: type
+    prefixes: tuple[str, ...]
+    default: Any
+    path: str
+    help_prefix: str | Sentinel
+    positional: bool
+    fields: list[_FieldPlan] = attrs.Factory(list)
+
+
+def _build_plan(config_cls, prefixes):
+    """
+    Build the plan tree of the top-level *config_cls* whose variables start
+    with *prefixes*.
+    """
+    top = _Plan(
+        config_cls,
+        prefixes,
+        RAISE,
+        "",
+        config_cls._prefix,
+        _takes_positional(config_cls),
+    )
+    # An explicit stack, so deep nesting doesn't hit the recursion limit.
+    todo = [top]
+    while todo:
+        plan = todo.pop()
+        for attr_obj in attrs.fields(plan.cls):
+            try:
+                ce = attr_obj.metadata[CNF_KEY]
+            except KeyError:
+                continue
+            name = attr_obj.name
+            path = f"{plan.path}.{name}" if plan.path else name
+
+            if ce.sub_cls is not None:
+                sub = _Plan(
+                    ce.sub_cls,
+                    type(plan.prefixes)(
+                        (*plan.prefixes, ce.sub_cls._prefix or name)
+                    ),
+                    ce.default,
+                    path,
+                    _generate_new_prefix(plan.help_prefix, name),
+                    _takes_positional(ce.sub_cls),
+                )
+                todo.append(sub)
+                fp = _FieldPlan(name, path, attr_obj.metadata, ce, None, sub)
+            else:
+                getter = ce.callback or _default_getter
+                fp = _FieldPlan(
+                    name, path, attr_obj.metadata, ce, getter, None
+                )
+
+            plan.fields.append(fp)
+
+    return top
+
+
+def _takes_positional(config_cls):
+    """
+    Return whether the values of all attributes of *config_cls* can be passed
+    to its ``__init__`` positionally and in order.
+
+    Passing thousands of attributes by keyword is slow, since CPython matches
+    each keyword argument by walking the parameter names.
+    """
+    return all(
+        CNF_KEY in a.metadata
+        and a.init
+        and not a.kw_only
+        and not a.name.startswith("_")
+        for a in attrs.fields(config_cls)
+    )
+
+
+def _walk(plan):
+    """
+    Yield ``(fp, owner)`` for all fields in the tree of *plan* where *owner*
+    is the plan that *fp* belongs to.
+
+    The order is the same as of nested loops over the fields: depth-first,
+    with the fields of a group right after the group itself.
+    """
+    todo = [(fp, plan) for fp in reversed(plan.fields)]
+    while todo:
+        fp, owner = todo.pop()
+        yield fp, owner
+        if fp.sub is not None:
+            todo.extend((sub_fp, fp.sub) for sub_fp in reversed(fp.sub.fields))
+
+
+def _get_plan(config_cls):
+    """
+    Return the cached plan for loading *config_cls* as a top-level config.
+    """
+    # Look into __dict__ directly so subclasses don't pick up their parent's
+    # plan.
+    plan = config_cls.__dict__.get("_environ_plan")
+    if plan is None:
+        # The canonical app prefix might be falsey in which case we'll still
+        # set the default prefix for this top level config object
+        app_prefix = _get_prefix(config_cls)
+        plan = _build_plan(
+            config_cls, (app_prefix,) if app_prefix else _Unprefixed()
+        )
+        config_cls._environ_plan = plan
+
+    return plan
+
+
+class _Interner:
+    """
+    Share equal string values and equal hashable -- in other words: frozen --
+    group instances across many loads.
+    """
+
+    __slots__ = ("_groups", "_strs")
+
+    def __init__(self):
+        self._strs = {}
+        self._groups = {}
+
+    def value(self, val):
+        # We don't use sys.intern() because unique values like tenant names
+        # would bloat the global table for the lifetime of the process.
+        if isinstance(val, str):
+            # Key on the type too, so secret strings stay secret.
+            return self._strs.setdefault((type(val), val), val)
+
+        return val
+
+    def group(self, inst):
+        try:
+            return self._groups.setdefault(inst, inst)
+        except TypeError:  # unhashable, so probably not frozen
+            return inst
+
+
+def _default_value(ce):
+    """
+    Return the value that is passed into the class if *ce* is missing.
+
+    `attrs.Factory` defaults are left to *attrs*.
+    """
+    if isinstance(ce.default, attrs.Factory):
+        return attrs.NOTHING
+
+    return ce.default
+
+
+class _Memo:
+    """
+    Memoization of expensive lookups -- like fetching a secret that is used by
+    multiple attributes -- for the duration of a single load.
+
+    Safe to use from concurrently running getters: each key is computed only
+    once.
+    """
+
+    __slots__ = ("_entries", "_lock")
+
+    _UNSET = object()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [threading.Lock(), self._UNSET]
+
+        with entry[0]:
+            if entry[1] is self._UNSET:
+                entry[1] = compute()
+
+            return entry[1]
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+_memo: ContextVar[_Memo | None] = ContextVar(
+    "environ_config_memo", default=None
+)
+
+
+@contextlib.contextmanager
+def _load_scope():
+    """
+    Make getters that are called within share a `_Memo`.
+    """
+    token = _memo.set(_Memo())
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def _per_load(key, compute, *, note=True):
+    """
+    Return the result of calling *compute* -- but only call it once per *key*
+    for each load.
+
+    If *note* is false, the lookup doesn't count as a cache hit or miss for
+    instrumentation.  Use that for helper lookups that don't cache the value
+    itself -- like resolving a prefix.
+
+    For use by getters.
+    """
+    memo = _memo.get()
+    if memo is None:
+        return compute()
+
+    if note:
+        _note_cache(key in memo)
+
+    return memo.get(key, compute)
+
+
+@attrs.define(slots=True)
+class _Load:
+    """
+    State of a single load.
+
+    If *raw* is set, it maps ids of leaf field plans to the values that their
+    getters returned (or `_Failed`) in advance.  If *recs* is set, it maps the
+    same ids to what the getters reported while doing so.  Values without a
+    record have been prefetched.
+
+    *hooks* are the registered instrumentation hooks or `None` if there are
+    none.
+    """
+
+    environ: Mapping[str, str]
+    interner: _Interner | None = None
+    raw: dict[int, Any] | None = None
+    hooks: tuple[_instrument._Hooks, ...] | None = None
+    recs: dict[int, _FieldRecord] | None = None
+
+    def get(self, fp, prefixes, rec=None):
+        """
+        Get the raw value for the leaf *fp*.
+
+        If *rec* is passed, record what happened in it.
+        """
+        if self.raw is None:
+            if rec is None:
+                return fp.getter(self.environ, fp.metadata, prefixes, fp.name)
+
+            return _call_recorded(fp, self.environ, prefixes, rec)
+
+        if rec is not None:
+            done = None if self.recs is None else self.recs.get(id(fp))
+            if done is None:
+                rec.cache_hit = True
+            else:
+                rec.var = done.var
+                rec.cache_hit = done.cache_hit
+                rec.duration = done.duration
+
+        val = self.raw[id(fp)]
+        if isinstance(val, _Failed):
+            raise val.exc
+
+        return val
+
+
+@attrs.define(slots=True)
+class _Failed:
+    """
+    A getter raised *exc* while resolving raw values in advance.
+    """
+
+    exc: Exception
+
+
+def _iter_leaves(plan):
+    """
+    Yield ``(fp, prefixes)`` for all leaves in *plan*.
+    """
+    for fp, owner in _walk(plan):
+        if fp.sub is None:
+            yield fp, owner.prefixes
+
+
+def _call_recorded(fp, environ, prefixes, rec):
+    """
+    Call the getter of *fp* and record what it reported and how long it took
+    in *rec*.
+    """
+    token = _field_record.set(rec)
+    start = time.perf_counter()
+    try:
+        return fp.getter(environ, fp.metadata, prefixes, fp.name)
+    finally:
+        rec.duration = time.perf_counter() - start
+        _field_record.reset(token)
+
+
+def _run_getter(fp, environ, prefixes, rec=None):
+    try:
+        if rec is None:
+            return fp.getter(environ, fp.metadata, prefixes, fp.name)
+
+        return _call_recorded(fp, environ, prefixes, rec)
+    except Exception as e:  # noqa: BLE001
+        return _Failed(e)
+
+
+def _resolve_raw(plan, environ, raw):
+    """
+    Run the getters of all leaves in *plan* and store the results in *raw* the
+    way `_Load` expects them.
+    """
+    for fp, prefixes in _iter_leaves(plan):
+        raw[id(fp)] = _run_getter(fp, environ, prefixes)
+
+
+class _DaemonPool:
+    """
+    Up to *size* daemon threads called *name* that run functions in the
+    background -- like getters for loads with a timeout.
+
+    Threads are started on demand and reused.  They're daemon threads, so
+    hanging getters or requests don't prevent the interpreter from exiting.
     """
-    Traverse *config_cls* to construct an instance with values from *environ*.
 
-    This function walks through a potential tree of config definition classes
-    and uses the specified (via attributes set through class construction) or
-    default implementation of config variable lookup to collect values from the
-    provided *environ* object. The collected configuration values (including
-    sub-config objects, e.g. for groups) are used to instantiate the
-    well-structured *config_cls* with those values being accessible via the new
-    object's attributes.
+    def __init__(self, size, name):
+        self._size = size
+        self._name = name
+        self._tasks = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._threads = 0
+        self._idle = 0
+        self._queued = 0
+
+    def submit(self, fnc, *args):
+        with self._lock:
+            self._queued += 1
+            if self._queued > self._idle and self._threads < self._size:
+                self._threads += 1
+                threading.Thread(
+                    target=self._work, name=self._name, daemon=True
+                ).start()
+
+        self._tasks.put((fnc, args))
+
+    def _work(self):
+        while True:
+            with self._lock:
+                self._idle += 1
+            fnc, args = self._tasks.get()
+            with self._lock:
+                self._idle -= 1
+                self._queued -= 1
+
+            fnc(*args)
+
+
+# How many getters are run concurrently if there's a deadline.
+_MAX_WORKERS = 16
+_pool = _DaemonPool(_MAX_WORKERS, "environ-getter")
+
+# Ids of the leaf field plans whose getters are still running on the pool --
+# possibly hanging since an earlier load.
+_running = set()
+_running_lock = threading.Lock()
+
+
+def _resolve_raw_within(plan, environ, timeout, record=False):
     """
-    # We keep track of values we actually got from the getter vs those we set
-    # from the `ConfigEntry` default value
-    got = {}
-    defaulted = {}
-    missing_vars = set()
-    missing_secrets = set()
+    Run the getters of all leaves in *plan* concurrently and return the raw
+    values of those that finished within *timeout* seconds.
 
-    for attr_obj in attrs.fields(config_cls):
+    If *record* is true, also return what the getters of those leaves
+    reported as a dict that `_Load` understands.  `None` otherwise.
+
+    Leaves whose getters are still running since an earlier load are
+    skipped, so hanging getters don't pile up.
+    """
+    todo = []
+    with _running_lock:
+        for fp, prefixes in _iter_leaves(plan):
+            if id(fp) not in _running:
+                _running.add(id(fp))
+                todo.append((fp, prefixes))
+
+    raw = {}
+    recs = {}
+    pending = [len(todo)]
+    cond = threading.Condition()
+
+    def run(fp, prefixes):
+        rec = _FieldRecord() if record else None
         try:
-            ce = attr_obj.metadata[CNF_KEY]
-        except KeyError:
+            val = _run_getter(fp, environ, prefixes, rec)
+        finally:
+            with _running_lock:
+                _running.discard(id(fp))
+
+        with cond:
+            raw[id(fp)] = val
+            if rec is not None:
+                recs[id(fp)] = rec
+            pending[0] -= 1
+            cond.notify()
+
+    for fp, prefixes in todo:
+        # Each getter gets its own copy of the context, so they share the
+        # memo of this load but not what's being recorded.
+        _pool.submit(contextvars.copy_context().run, run, fp, prefixes)
+
+    with cond:
+        cond.wait_for(lambda: not pending[0], timeout)
+
+        return dict(raw), dict(recs) if record else None
+
+
+# Maps config classes to the raw values of their last load with a timeout.
+_last_good = weakref.WeakKeyDictionary()
+
+
+def _complete_raw(config_cls, plan, raw, fallback):
+    """
+    Make sure *raw* has values for all leaves of *plan* -- using the
+    last-known-good ones if *fallback* is true -- and remember them.
+
+    Raise `LoadTimeoutError` otherwise.
+    """
+    last_good = _last_good.get(config_cls, {})
+    unresolved = []
+    for fp, _ in _iter_leaves(plan):
+        if id(fp) in raw:
             continue
-        name = attr_obj.name
 
-        if ce.sub_cls is not None:
-            prefix = ce.sub_cls._prefix or name
-            got[name] = _to_config_recurse(
-                ce.sub_cls, environ, (*prefixes, prefix), default=ce.default
-            )
+        if fallback and id(fp) in last_good:
+            log.debug("using last known good value for '%s'.", fp.name)
+            raw[id(fp)] = last_good[id(fp)]
         else:
-            getter = ce.callback or _default_getter
+            unresolved.append(fp.path)
+
+    if unresolved:
+        raise LoadTimeoutError(*unresolved)
+
+    _last_good[config_cls] = {
+        k: v for k, v in raw.items() if not isinstance(v, _Failed)
+    }
+
+    return raw
+
+
+class _Frame:
+    """
+    The state of loading a single group while `_load_plan` walks the tree.
+    """
+
+    __slots__ = (
+        "fields",
+        "got",
+        "missing_secrets",
+        "missing_vars",
+        "name",
+        "plan",
+        "start",
+        "values",
+    )
+
+    def __init__(self, plan, name, start):
+        self.plan = plan
+        self.name = name
+        self.start = start
+        self.fields = iter(plan.fields)
+        # The values for the attributes in the order of the fields.
+        self.values = {}
+        # Whether we've got *any* value that isn't a default.
+        self.got = False
+        self.missing_vars = set()
+        self.missing_secrets = set()
+
+
+def _load_plan(plan, load):
+    """
+    Walk *plan* to construct an instance with values from the environment of
+    *load*.
+
+    The values of leaves are collected using the specified (via attributes
+    set through class construction) or default getters.  Each group is
+    instantiated as soon as all of its values are collected, and becomes a
+    value of its parent.
+
+    The tree is walked using an explicit stack, so there's no limit on how
+    deeply groups can be nested.
+    """
+    hooks = load.hooks
+    interner = load.interner
+    stack = [
+        _Frame(plan, None, None if hooks is None else time.perf_counter())
+    ]
+    while True:
+        frame = stack[-1]
+        plan = frame.plan
+        for fp in frame.fields:
+            name = fp.name
+            if fp.sub is not None:
+                stack.append(
+                    _Frame(
+                        fp.sub,
+                        name,
+                        None if hooks is None else time.perf_counter(),
+                    )
+                )
+                break
+
+            rec = None if hooks is None else _FieldRecord()
+            defaulted = False
             try:
-                got[name] = getter(environ, attr_obj.metadata, prefixes, name)
+                val = load.get(fp, plan.prefixes, rec)
+                frame.values[name] = (
+                    val if interner is None else interner.value(val)
+                )
+                frame.got = True
             except (MissingEnvValueError, MissingSecretError) as exc:
-                if isinstance(ce.default, Raise):
+                if isinstance(fp.ce.default, Raise):
                     if isinstance(exc, MissingSecretError):
-                        missing_secrets |= set(exc.args)
+                        frame.missing_secrets |= set(exc.args)
                     else:
-                        missing_vars |= set(exc.args)
+                        frame.missing_vars |= set(exc.args)
                 else:
-                    defaulted[name] = (
-                        attrs.NOTHING
-                        if isinstance(ce.default, attrs.Factory)
-                        else ce.default
-                    )
+                    frame.values[name] = _default_value(fp.ce)
+                    defaulted = True
+
+            if rec is not None:
+                _emit(
+                    hooks,
+                    "on_field",
+                    FieldEvent(
+                        fp.path,
+                        rec.var,
+                        _backend(fp.getter),
+                        rec.duration,
+                        rec.cache_hit,
+                        defaulted,
+                    ),
+                )
+        else:
+            inst = _finish_group(frame, hooks, interner)
+            stack.pop()
+            if not stack:
+                return inst
+
+            parent = stack[-1]
+            parent.values[frame.name] = inst
+            # Even defaulted groups count as values of their parent.
+            parent.got = True
+
 
-    if missing_vars or missing_secrets:
+def _finish_group(frame, hooks, interner):
+    """
+    Instantiate the group of *frame* once all of its values are collected.
+
+    Raise a ``Missing..Error`` or return the group's default if values are
+    missing.
+    """
+    plan = frame.plan
+    if frame.missing_vars or frame.missing_secrets:
         # If we were told to raise OR if we got *any* values for our attrs, we
         # will raise a `Missing..Error` with all the missing variables
-        if isinstance(default, Raise) or got:
+        if isinstance(plan.default, Raise) or frame.got:
             # Raise MissingSecretError if there was any missing secrets, since
             # that used to bubble all the way up, and thus was always prioritized
             # over `MissingEnvValueError`.
-            if missing_secrets:
-                raise MissingSecretError(*missing_secrets) from None
-            raise MissingEnvValueError(*missing_vars) from None
+            if frame.missing_secrets:
+                raise MissingSecretError(*frame.missing_secrets) from None
+            raise MissingEnvValueError(*frame.missing_vars) from None
 
-        # Otherwise we will simply use the default passed into this call.
+        # Otherwise we will simply use the default of the group.
         # Should be no need to handle `Factory`s here.
-        return default
+        _group_done(hooks, plan.path, plan.cls, frame.start)
+
+        return plan.default
 
-    # Merge the defaulted and actually collected values into the config type
-    defaulted.update(got)
-    return config_cls(**defaulted)
+    init_start = None if hooks is None else time.perf_counter()
+    if plan.positional:
+        inst = plan.cls(*frame.values.values())
+    else:
+        inst = plan.cls(**frame.values)
+    _group_done(hooks, plan.path, plan.cls, frame.start, init_start)
 
+    return inst if interner is None else interner.group(inst)
 
-def to_config(config_cls: type[T], environ: dict[str, str] = os.environ) -> T:
+
+def to_config(
+    config_cls: type[T],
+    environ: dict[str, str] = os.environ,
+    *,
+    timeout: float | None = None,
+    fallback: bool = False,
+) -> T:
     """
     Load the configuration as declared by *config_cls* from *environ*.
 
@@ -355,15 +1050,215 @@ def to_config(config_cls: type[T], environ: dict[str, str] = os.environ) -> T:
 
         environ: Source of the configuration.  `os.environ` by default.
 
+        timeout:
+            If set, the maximum number of seconds that collecting the values
+            may take.  The getters -- including those that fetch secrets --
+            then run concurrently on a bounded pool of background threads
+            and if any of them haven't finished when the time is up,
+            `LoadTimeoutError` is raised.  Getters that still hang since an
+            earlier load aren't called again until they return.
+
+        fallback:
+            If *timeout* is set and some getters didn't finish in time, use
+            the values that they returned during the last successful load
+            with a *timeout* of the same class.
+
     Returns:
         An instance of *config_cls*.
 
+    Raises:
+        LoadTimeoutError:
+            If *timeout* is set and not all values could be collected in
+            time.
+
     This is equivalent to calling ``config_cls.from_environ()``.
+
+    If `prefetch` has been called for *config_cls* and the same *environ*, the
+    values that have been prefetched are used.
+
+    .. versionadded:: 26.2.0 *timeout* and *fallback*
+    """
+    hooks = _active_hooks()
+
+    def load():
+        plan = _get_plan(config_cls)
+        raw = _consume_prefetch(config_cls, environ, timeout)
+        recs = None
+        with _load_scope():
+            if timeout is not None:
+                if raw is None:
+                    raw, recs = _resolve_raw_within(
+                        plan, environ, timeout, record=hooks is not None
+                    )
+                raw = _complete_raw(config_cls, plan, raw, fallback)
+
+            return _load_plan(
+                plan, _Load(environ, raw=raw, hooks=hooks, recs=recs)
+            )
+
+    if hooks is None:
+        return load()
+
+    return _observe_load(config_cls, hooks, load)
+
+
+# Maps config classes to (environ, future, raw values) of pending prefetches.
+_prefetches = {}
+
+
+def _consume_prefetch(config_cls, environ, timeout=None):
+    """
+    Return the prefetched raw values for *config_cls* if they've been
+    prefetched from *environ* -- waiting for them up to *timeout* seconds if
+    necessary.
+
+    If the prefetch doesn't finish in time, the values that have been
+    resolved so far are returned.
+    """
+    try:
+        pf_environ, fut, raw = _prefetches.pop(config_cls)
+    except KeyError:
+        return None
+
+    if pf_environ is not environ:
+        log.debug("discarding prefetch for different environment.")
+        return None
+
+    try:
+        fut.result(timeout)
+    except FuturesTimeoutError:
+        return dict(raw)
+
+    return raw
+
+
+def prefetch(
+    config_cls: type, environ: Mapping[str, str] = os.environ
+) -> Future[None]:
+    """
+    Start running all getters of *config_cls* on a background thread.
+
+    The next time *config_cls* is loaded from *environ* -- for example using
+    ``config_cls.from_environ()`` -- the prefetched values are used instead of
+    running the getters again.  That way slow I/O like fetching secrets
+    overlaps with the rest of the application's startup.
+
+    Prefetched values are only used once.  Converters and validators run when
+    the config is loaded and exceptions from getters are raised at that time
+    too.
+
+    Args:
+        config_cls: The configuration class to prefetch.
+
+        environ:
+            The environment to prefetch from.  Must be the very same object
+            that is used for loading later.
+
+    Returns:
+        A future that is resolved with `None` as soon as all getters ran.
+
+    .. versionadded:: 26.2.0
+    """
+    plan = _get_plan(config_cls)
+    fut = Future()
+    raw = {}
+    _prefetches[config_cls] = (environ, fut, raw)
+
+    def run():
+        fut.set_running_or_notify_cancel()
+        try:
+            with _load_scope():
+                _resolve_raw(plan, environ, raw)
+        except BaseException as e:  # noqa: BLE001 # pragma: no cover
+            fut.set_exception(e)
+        else:
+            fut.set_result(None)
+
+    threading.Thread(
+        target=run, name=f"environ-prefetch-{config_cls.__name__}", daemon=True
+    ).start()
+
+    return fut
+
+
+def _to_config_or_error(config_cls, interner, environ):
+    hooks = _active_hooks()
+
+    def load():
+        with _load_scope():
+            return _load_plan(
+                _get_plan(config_cls), _Load(environ, interner, hooks=hooks)
+            )
+
+    try:
+        if hooks is None:
+            return load()
+
+        return _observe_load(config_cls, hooks, load)
+    except Exception as e:  # noqa: BLE001
+        return e
+
+
+def to_config_many(
+    config_cls: type[T],
+    environs: Iterable[Mapping[str, str]],
+    *,
+    executor: Executor | None = None,
+    chunksize: int = 1,
+    intern: bool = False,
+) -> Iterator[T | Exception]:
     """
-    # The canonical app prefix might be falsey in which case we'll still set
-    # the default prefix for this top level config object
-    app_prefix = tuple(p for p in (_get_prefix(config_cls),) if p)
-    return _to_config_recurse(config_cls, environ, app_prefix)
+    Load one instance of *config_cls* for each mapping in *environs*.
+
+    The class is only planned once and the results are yielded lazily in the
+    order of *environs*.
+
+    A failing item does **not** abort the batch: instead of the config
+    instance, the exception that loading raised (for example, a
+    `MissingEnvValueError`) is yielded in its place.
+
+    Args:
+        config_cls: The configuration class to fill.
+
+        environs: An iterable of sources of the configuration.
+
+        executor:
+            If passed, the loading is fanned out using its
+            `~concurrent.futures.Executor.map` method.  When using a
+            `concurrent.futures.ProcessPoolExecutor`, *config_cls* and the
+            mappings must be picklable -- in other words, *config_cls* must be
+            importable and you need to pass plain `dict` instances instead of
+            `os.environ`.
+
+        chunksize:
+            Passed to `~concurrent.futures.Executor.map` if *executor* is
+            passed.
+
+        intern:
+            Share memory between the loaded instances: equal string values
+            become the same object and so do equal group instances.  Groups
+            are only shared if they're hashable -- which means in practice
+            that they have to be frozen (``@environ.config(frozen=True)``).
+
+            Sharing happens within the current process, so it's pointless
+            when using a `concurrent.futures.ProcessPoolExecutor`.
+
+    Returns:
+        An iterator of instances of *config_cls* or exceptions.
+
+    .. versionadded:: 26.2.0
+    """
+    interner = _Interner() if intern else None
+    if executor is not None:
+        yield from executor.map(
+            functools.partial(_to_config_or_error, config_cls, interner),
+            environs,
+            chunksize=chunksize,
+        )
+        return
+
+    for environ in environs:
+        yield _to_config_or_error(config_cls, interner, environ)
 
 
 def _format_help_dicts(help_dicts, display_defaults=False):
@@ -430,7 +1325,7 @@ def _generate_new_prefix(current_prefix, class_name):
     )
 
 
-def _generate_help_dicts(config_cls, _prefix=PREFIX_NOT_SET):
+def _generate_help_dicts(config_cls):
     """
     Generate dictionaries for use in building help strings.
 
@@ -449,28 +1344,22 @@ def _generate_help_dicts(config_cls, _prefix=PREFIX_NOT_SET):
     vs explicitly setting a value to None.
     """
     help_dicts = []
-    _prefix = _prefix if _prefix is not PREFIX_NOT_SET else config_cls._prefix
-    for a in attrs.fields(config_cls):
-        try:
-            ce = a.metadata[CNF_KEY]
-        except KeyError:
+    for fp, owner in _walk(_get_plan(config_cls)):
+        if fp.sub is not None:
             continue
-        if ce.sub_cls is None:  # Base case for "leaves".
-            if ce.name is None:
-                var_name = _generate_var_name(_prefix, a.name)
-            else:
-                var_name = ce.name
-            req = isinstance(ce.default, Raise)
-            help_dict = {"var_name": var_name, "required": req}
-            if not req:
-                help_dict["default"] = ce.default
-            if ce.help is not None:
-                help_dict["help_str"] = ce.help
-            help_dicts.append(help_dict)
-        else:  # Construct the new prefix and recurse.
-            help_dicts += _generate_help_dicts(
-                ce.sub_cls, _prefix=_generate_new_prefix(_prefix, a.name)
-            )
+        ce = fp.ce
+        if ce.name is None:
+            var_name = _generate_var_name(owner.help_prefix, fp.name)
+        else:
+            var_name = ce.name
+        req = isinstance(ce.default, Raise)
+        help_dict = {"var_name": var_name, "required": req}
+        if not req:
+            help_dict["default"] = ce.default
+        if ce.help is not None:
+            help_dict["help_str"] = ce.help
+        help_dicts.append(help_dict)
+
     return help_dicts
 
 
@@ -0,0 +1,355 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Hooks that observe where the time of loading configs goes.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from collections.abc import Callable
+from contextvars import ContextVar
+
+import attrs
+
+
+# The logger of environ-config's core.
+log = logging.getLogger("environ_config")
+
+
+@attrs.frozen
+class FieldEvent:
+    """
+    How a single attribute has been loaded.
+
+    Attributes:
+        path: The dotted path of the attribute, like ``db.password``.
+
+        var:
+            The environment variable, secret, or key that has been looked up
+            -- if the getter reported it.
+
+        backend:
+            Where the value came from: ``env`` for environment variables and
+            the class name of the secrets backend otherwise -- for example
+            ``VaultEnvSecrets``.
+
+        duration:
+            Seconds that the getter took or `None` if the value has been
+            prefetched by `environ.prefetch`.
+
+        cache_hit:
+            Whether the value has been served from a cache -- for example
+            because another attribute shares the same secret or because it
+            has been prefetched.  `None` if no cache has been involved.
+
+        defaulted: Whether the value was missing and the default was used.
+
+    .. versionadded:: 26.2.0
+    """
+
+    path: str
+    var: str | None
+    backend: str
+    duration: float | None
+    cache_hit: bool | None
+    defaulted: bool
+
+
+@attrs.frozen
+class GroupEvent:
+    """
+    How a config class -- top-level or a group -- has been instantiated.
+
+    Attributes:
+        path: The dotted path of the group.  Empty for the top-level class.
+
+        cls: The config class.
+
+        duration: Seconds that loading the group took, including its fields.
+
+        init_duration:
+            Seconds that instantiating the class took.  That's where
+            converters and validators run.
+
+        defaulted: Whether all values were missing and the default was used.
+
+    .. versionadded:: 26.2.0
+    """
+
+    path: str
+    cls: type
+    duration: float
+    init_duration: float
+    defaulted: bool
+
+
+@attrs.frozen
+class LoadEvent:
+    """
+    How a whole config has been loaded.
+
+    Attributes:
+        cls: The config class.
+
+        duration: Seconds that the load took.
+
+        exception: The exception that made the load fail, if any.
+
+    .. versionadded:: 26.2.0
+    """
+
+    cls: type
+    duration: float
+    exception: BaseException | None
+
+
+@attrs.define
+class _Hooks:
+    on_field: Callable[[FieldEvent], None] | None
+    on_group: Callable[[GroupEvent], None] | None
+    on_load: Callable[[LoadEvent], None] | None
+
+
+# Loads read this once, so registering is thread-safe without locking there.
+_hooks: tuple[_Hooks, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+def instrument(
+    on_field: Callable[[FieldEvent], None] | None = None,
+    on_group: Callable[[GroupEvent], None] | None = None,
+    on_load: Callable[[LoadEvent], None] | None = None,
+) -> Callable[[], None]:
+    """
+    Register hooks that are called while configs are loaded.
+
+    Args:
+        on_field: Called with a `FieldEvent` after each attribute.
+
+        on_group: Called with a `GroupEvent` after each config class.
+
+        on_load: Called with a `LoadEvent` after each load.
+
+    Returns:
+        A callable that removes the hooks again.
+
+    Exceptions raised by hooks are not caught.
+
+    As long as no hooks are registered, loading isn't slowed down.
+
+    Independently of registered hooks, loads are traced to the
+    ``environ_config`` logger if it's enabled for debug messages when they
+    start.
+
+    .. versionadded:: 26.2.0
+    """
+    global _hooks  # noqa: PLW0603
+
+    hooks = _Hooks(on_field, on_group, on_load)
+    with _hooks_lock:
+        _hooks = (*_hooks, hooks)
+
+    def remove() -> None:
+        global _hooks  # noqa: PLW0603
+
+        with _hooks_lock:
+            _hooks = tuple(h for h in _hooks if h is not hooks)
+
+    return remove
+
+
+def _trace_field(event):
+    log.debug(
+        "%s: looked up %s using %s%s%s.",
+        event.path,
+        event.var or "a value",
+        event.backend,
+        "" if event.duration is None else f" in {_ms(event.duration)}",
+        "; missing, using the default" if event.defaulted else "",
+    )
+
+
+def _trace_group(event):
+    if event.defaulted:
+        log.debug("%s: all values missing, using the default.", event.path)
+
+
+def _trace_load(event):
+    if event.exception is None:
+        log.debug(
+            "loaded %s in %s.", event.cls.__qualname__, _ms(event.duration)
+        )
+    else:
+        log.debug(
+            "loading %s failed after %s: %r",
+            event.cls.__qualname__,
+            _ms(event.duration),
+            event.exception,
+        )
+
+
+def _ms(duration):
+    return f"{duration * 1000:.3f} ms"
+
+
+# Tracing to the debug log is just another set of hooks.
+_TRACE = _Hooks(_trace_field, _trace_group, _trace_load)
+
+
+def _active_hooks():
+    """
+    Return the hooks for a load that starts now or None if there are none.
+
+    Whether the load is traced is decided here once, so that getters don't
+    have to log -- or even check whether they should -- for every lookup.
+    """
+    if log.isEnabledFor(logging.DEBUG):
+        return (*_hooks, _TRACE)
+
+    return _hooks or None
+
+
+@attrs.define(slots=True)
+class _FieldRecord:
+    """
+    What the getter of the attribute that is currently loaded reported.
+    """
+
+    var: str | None = None
+    cache_hit: bool | None = None
+    duration: float | None = None
+
+
+_field_record: ContextVar[_FieldRecord | None] = ContextVar(
+    "environ_field_record", default=None
+)
+
+
+def _note_var(var):
+    """
+    Tell instrumentation which variable the running getter looks up.
+
+    For use by getters.
+    """
+    rec = _field_record.get()
+    if rec is not None:
+        rec.var = var
+
+
+# Maps backend names to how many requests they made to their remote services
+# while a load is profiled.
+_request_counts: ContextVar[dict[str, int] | None] = ContextVar(
+    "environ_request_counts", default=None
+)
+
+
+def _note_request(backend):
+    """
+    Tell instrumentation that *backend* makes a request to its remote
+    service.
+
+    For use by backends through `environ.metrics._fetching`.
+    """
+    counts = _request_counts.get()
+    if counts is not None:
+        counts[backend] = counts.get(backend, 0) + 1
+
+
+def _note_cache(hit):
+    """
+    Tell instrumentation whether the running getter hit a cache.
+
+    A getter only counts as a hit if all of its lookups are.
+    """
+    rec = _field_record.get()
+    if rec is not None:
+        rec.cache_hit = hit and rec.cache_hit is not False
+
+
+def _emit(hooks, name, event):
+    """
+    Call the hook *name* of all *hooks* that have one with *event*.
+    """
+    for h in hooks:
+        hook = getattr(h, name)
+        if hook is not None:
+            hook(event)
+
+
+def _group_done(hooks, path, cls, start, init_start=None):
+    """
+    Tell *hooks* -- if any -- that the group at the dotted *path* is done.
+
+    If *init_start* is None, the group has been defaulted.
+    """
+    if hooks is None:
+        return
+
+    now = time.perf_counter()
+    _emit(
+        hooks,
+        "on_group",
+        GroupEvent(
+            path,
+            cls,
+            now - start,
+            0.0 if init_start is None else now - init_start,
+            init_start is None,
+        ),
+    )
+
+
+def _observe_load(config_cls, hooks, load):
+    """
+    Call *load* and tell *hooks* how long it took and whether it failed.
+    """
+    start = time.perf_counter()
+    try:
+        rv = load()
+    except BaseException as e:
+        _emit(
+            hooks,
+            "on_load",
+            LoadEvent(config_cls, time.perf_counter() - start, e),
+        )
+        raise
+
+    _emit(
+        hooks,
+        "on_load",
+        LoadEvent(config_cls, time.perf_counter() - start, None),
+    )
+
+    return rv
+
+
+def _backend(getter):
+    """
+    Return a human-readable name of the backend behind *getter*.
+    """
+    owner = getattr(getter, "__self__", None)
+    if owner is not None:
+        return owner.__class__.__name__
+
+    if getter.__name__ == "_default_getter":
+        return "env"
+
+    return getter.__qualname__
@@ -0,0 +1,224 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Find out why loading a config is slow.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+from collections.abc import Mapping
+from typing import Any
+
+import attrs
+
+from ._environ_config import to_config
+from ._instrument import (
+    FieldEvent,
+    GroupEvent,
+    LoadEvent,
+    _ms,
+    _request_counts,
+    instrument,
+)
+
+
+@attrs.define
+class LoadProfile:
+    """
+    What happened while loading a config using `profile`.
+
+    Attributes:
+        config: The loaded config or `None` if loading failed.
+
+        load: The `LoadEvent` of the load.
+
+        fields: A `FieldEvent` for each attribute.
+
+        groups: A `GroupEvent` for each config class.
+
+        requests:
+            How many requests each secrets backend made to its remote
+            service -- no matter how many attributes they served.
+
+    .. versionadded:: 26.2.0
+    """
+
+    config: Any
+    load: LoadEvent
+    fields: list[FieldEvent]
+    groups: list[GroupEvent]
+    requests: dict[str, int] = attrs.Factory(dict)
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Return a human-readable report.
+
+        Args:
+            limit: How many of the slowest getters and classes to list.
+        """
+        summary = (
+            f"Loaded {self.load.cls.__qualname__} in "
+            f"{_ms(self.load.duration)} ({len(self.fields)} attributes, "
+            f"{len(self.groups)} classes)."
+        )
+        lines = [summary]
+
+        getters = sorted(
+            (f for f in self.fields if f.duration is not None),
+            key=lambda f: f.duration,
+            reverse=True,
+        )[:limit]
+        if getters:
+            lines += ["", "Slowest getters:"]
+            lines += _table(
+                ("duration", "backend", "attribute", "variable"),
+                [
+                    (_ms(f.duration), f.backend, f.path, f.var or "")
+                    for f in getters
+                ],
+            )
+
+        inits = sorted(
+            (g for g in self.groups if not g.defaulted),
+            key=lambda g: g.init_duration,
+            reverse=True,
+        )[:limit]
+        if inits:
+            lines += ["", "Slowest converters and validators (per class):"]
+            lines += _table(
+                ("duration", "class", "group"),
+                [
+                    (_ms(g.init_duration), g.cls.__qualname__, g.path)
+                    for g in inits
+                ],
+            )
+
+        lines += ["", "Backends:"]
+        lines += _table(
+            ("requests", "attributes", "cached", "duration", "backend"),
+            [
+                (
+                    str(self.requests.get(backend, 0)),
+                    str(attributes),
+                    str(cached),
+                    _ms(duration),
+                    backend,
+                )
+                for backend, (attributes, cached, duration) in sorted(
+                    self._backends().items(),
+                    key=lambda item: item[1][2],
+                    reverse=True,
+                )
+            ],
+        )
+
+        missing = [f for f in self.fields if f.defaulted]
+        if missing:
+            lines += ["", "Missing values (defaults used):"]
+            lines += _table(
+                ("attribute", "variable"),
+                [(f.path, f.var or "") for f in missing],
+            )
+
+        if self.load.exception is not None:
+            e = self.load.exception
+            lines += ["", f"Loading failed: {e.__class__.__name__}: {e}"]
+
+        return "\n".join(lines)
+
+    def _backends(self):
+        """
+        Return a dict of backend names to the number of attributes they
+        served, how many of them hit a cache, and their total duration.
+        """
+        rv = {}
+        for f in self.fields:
+            attributes, cached, duration = rv.get(f.backend, (0, 0, 0.0))
+            rv[f.backend] = (
+                attributes + 1,
+                cached + bool(f.cache_hit),
+                duration + (f.duration or 0.0),
+            )
+
+        return rv
+
+
+def profile(
+    config_cls: type, environ: Mapping[str, str] = os.environ
+) -> LoadProfile:
+    """
+    Load *config_cls* from *environ* and record where the time went.
+
+    Exceptions from loading are not raised but recorded in the returned
+    profile.
+
+    Args:
+        config_cls: The configuration class to load.
+
+        environ: Source of the configuration.  `os.environ` by default.
+
+    .. versionadded:: 26.2.0
+    """
+    fields = []
+    groups = []
+    loads = []
+    ident = threading.get_ident()
+
+    def only_ours(record):
+        # Hooks are global, so ignore loads on other threads.
+        def hook(event):
+            if threading.get_ident() == ident:
+                record(event)
+
+        return hook
+
+    requests = {}
+    remove = instrument(
+        on_field=only_ours(fields.append),
+        on_group=only_ours(groups.append),
+        on_load=only_ours(loads.append),
+    )
+    token = _request_counts.set(requests)
+    try:
+        config = to_config(config_cls, environ)
+    except Exception:  # noqa: BLE001
+        config = None
+    finally:
+        _request_counts.reset(token)
+        remove()
+
+    return LoadProfile(config, loads[0], fields, groups, requests)
+
+
+def _table(header, rows):
+    """
+    Format *rows* under *header* in aligned columns.
+    """
+    widths = [
+        max(len(row[i]) for row in (header, *rows)) for i in range(len(header))
+    ]
+
+    return [
+        "  "
+        + "  ".join(
+            cell.ljust(width) for cell, width in zip(row, widths, strict=True)
+        ).rstrip()
+        for row in (header, *rows)
+    ]
@@ -35,6 +35,17 @@ class MissingSecretError(ConfigError):
     """
 
 
+class LoadTimeoutError(ConfigError):
+    """
+    Not all values could be collected within the timeout.
+
+    The arguments are the paths of the attributes whose values are missing,
+    for example ``db.password``.
+
+    .. versionadded:: 26.2.0
+    """
+
+
 class MissingSecretImplementationError(Exception):
     """
     A secret implementation could not be loaded
@@ -0,0 +1,478 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Metrics about config loads and secrets backends in the Prometheus text
+format -- without depending on a Prometheus client.
+
+Call `enable` once at startup and serve `Registry.render` from your metrics
+endpoint.
+
+.. versionadded:: 26.2.0
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import math
+import threading
+import time
+import weakref
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from ._instrument import FieldEvent, LoadEvent, _note_request, instrument
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "Counter",
+    "Histogram",
+    "Registry",
+    "disable",
+    "enable",
+]
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels):
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            msg = f"{self.name} requires the label {e.args[0]!r}."
+            raise ValueError(msg) from None
+
+    def render(self) -> Iterator[str]:
+        """
+        Yield the lines of the metric in the Prometheus text format.
+        """
+        yield f"# HELP {self.name} {_escape_help(self.help)}"
+        yield f"# TYPE {self.name} {self.type}"
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield from self._samples(key, value)
+
+    def _labels(self, key, extra=()):
+        pairs = [*zip(self.labelnames, key, strict=True), *extra]
+        if not pairs:
+            return ""
+
+        return (
+            "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+        )
+
+
+class Counter(_Metric):
+    """
+    A value that only goes up.
+
+    .. versionadded:: 26.2.0
+    """
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increase the counter for *labels* by *amount*.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """
+        Return the current value for *labels*.
+        """
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self, key, value):
+        yield f"{self.name}{self._labels(key)} {_num(value)}"
+
+
+class Histogram(_Metric):
+    """
+    Observations -- like durations -- counted into cumulative buckets.
+
+    .. versionadded:: 26.2.0
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Record *value* for *labels*.
+        """
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Per-bucket counts (the last one is +Inf), sum.
+                entry = self._values[key] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                ]
+            entry[0][bisect.bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+
+    def count(self, **labels: str) -> int:
+        """
+        Return the number of observations for *labels*.
+        """
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return 0 if entry is None else sum(entry[0])
+
+    def _samples(self, key, value):
+        counts, total = value
+        cumulative = 0
+        for bound, n in zip((*self.buckets, math.inf), counts, strict=True):
+            cumulative += n
+            le = "+Inf" if bound == math.inf else _num(bound)
+            yield (
+                f"{self.name}_bucket{self._labels(key, [('le', le)])} "
+                f"{cumulative}"
+            )
+        yield f"{self.name}_sum{self._labels(key)} {_num(total)}"
+        yield f"{self.name}_count{self._labels(key)} {cumulative}"
+
+
+class Registry:
+    """
+    A collection of metrics.
+
+    .. versionadded:: 26.2.0
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, help: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """
+        Return the counter called *name*, creating it if necessary.
+        """
+        return self._get(Counter, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        Return the histogram called *name*, creating it if necessary.
+        """
+        return self._get(Histogram, name, help, labelnames, buckets)
+
+    def get(self, name: str) -> Counter | Histogram | None:
+        """
+        Return the metric called *name* or `None` if there's none.
+        """
+        with self._lock:
+            return self._metrics.get(name)  # type: ignore[return-value]
+
+    def _get(self, cls, name, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            elif type(metric) is not cls:
+                msg = f"{name} is already registered as a {metric.type}."
+                raise ValueError(msg)
+
+            return metric
+
+    def render(self) -> str:
+        """
+        Return all metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+
+        return "".join(
+            line + "\n" for _, metric in metrics for line in metric.render()
+        )
+
+
+class _Metrics:
+    """
+    The metrics that environ-config reports into.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.loads = registry.counter(
+            "environ_loads_total",
+            "Config loads.",
+            ("config", "outcome"),
+        )
+        self.reloads = registry.counter(
+            "environ_reloads_total",
+            "Loads of config classes that have been loaded before.",
+            ("config",),
+        )
+        self.load_seconds = registry.histogram(
+            "environ_load_duration_seconds",
+            "Duration of config loads.",
+            ("config",),
+        )
+        self.getter_seconds = registry.histogram(
+            "environ_getter_duration_seconds",
+            "Duration of looking up single attributes.",
+            ("backend",),
+        )
+        self.cache = registry.counter(
+            "environ_cache_lookups_total",
+            "Cache lookups by backends and loads.",
+            ("backend", "cache", "result"),
+        )
+        self.fetches = registry.counter(
+            "environ_backend_fetches_total",
+            "Requests by secrets backends to their remote services.",
+            ("backend", "outcome"),
+        )
+        self.fetch_seconds = registry.histogram(
+            "environ_backend_fetch_duration_seconds",
+            "Duration of requests by secrets backends.",
+            ("backend",),
+        )
+        self.retries = registry.counter(
+            "environ_backend_retries_total",
+            "Retried requests by secrets backends -- for example because "
+            "they were throttled.",
+            ("backend",),
+        )
+        self._loaded = weakref.WeakSet()
+        self.remove_hooks = instrument(
+            on_field=self._on_field, on_load=self._on_load
+        )
+
+    def _on_field(self, event: FieldEvent) -> None:
+        if event.duration is not None:
+            self.getter_seconds.observe(event.duration, backend=event.backend)
+        if event.cache_hit is not None:
+            self.cache.inc(
+                backend=event.backend,
+                cache="load",
+                result="hit" if event.cache_hit else "miss",
+            )
+
+    def _on_load(self, event: LoadEvent) -> None:
+        config = f"{event.cls.__module__}.{event.cls.__qualname__}"
+        self.loads.inc(
+            config=config,
+            outcome="ok" if event.exception is None else "error",
+        )
+        self.load_seconds.observe(event.duration, config=config)
+        if event.cls in self._loaded:
+            self.reloads.inc(config=config)
+        else:
+            self._loaded.add(event.cls)
+
+
+_active: _Metrics | None = None
+_active_lock = threading.Lock()
+
+
+def enable(registry: Registry | None = None) -> Registry:
+    """
+    Start reporting metrics about config loads and secrets backends into
+    *registry*.
+
+    Args:
+        registry: Where to report to.  A new one is created if `None`.
+
+    Returns:
+        The registry that is reported into.
+
+    Reported metrics:
+
+    - ``environ_loads_total`` by ``config`` and ``outcome`` (``ok`` or
+      ``error``),
+    - ``environ_reloads_total`` by ``config``,
+    - ``environ_load_duration_seconds`` by ``config``,
+    - ``environ_getter_duration_seconds`` by ``backend``,
+    - ``environ_cache_lookups_total`` by ``backend``, ``cache``, and
+      ``result`` (``hit`` or ``miss``),
+    - ``environ_backend_fetches_total`` by ``backend`` and ``outcome``,
+    - ``environ_backend_fetch_duration_seconds`` by ``backend``,
+    - and ``environ_backend_retries_total`` by ``backend``.
+
+    .. versionadded:: 26.2.0
+    """
+    global _active  # noqa: PLW0603
+
+    if registry is None:
+        registry = Registry()
+
+    with _active_lock:
+        if _active is not None:
+            _active.remove_hooks()
+        _active = _Metrics(registry)
+
+    return registry
+
+
+def disable() -> None:
+    """
+    Stop reporting metrics.
+
+    .. versionadded:: 26.2.0
+    """
+    global _active  # noqa: PLW0603
+
+    with _active_lock:
+        if _active is not None:
+            _active.remove_hooks()
+        _active = None
+
+
+@contextlib.contextmanager
+def _observe(metrics, backend):
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        metrics.fetches.inc(backend=backend, outcome="error")
+        raise
+    else:
+        metrics.fetches.inc(backend=backend, outcome="ok")
+    finally:
+        metrics.fetch_seconds.observe(
+            time.perf_counter() - start, backend=backend
+        )
+
+
+_NOTHING = contextlib.nullcontext()
+
+
+def _fetching(backend):
+    """
+    Return a context manager that records a request by *backend* to its
+    remote service.
+
+    For use by backends.
+    """
+    _note_request(backend)
+    metrics = _active
+    if metrics is None:
+        return _NOTHING
+
+    return _observe(metrics, backend)
+
+
+def _retried(backend, n=1):
+    """
+    Record that *backend* retried a request *n* times.
+
+    For use by backends.
+    """
+    metrics = _active
+    if metrics is not None and n:
+        metrics.retries.inc(n, backend=backend)
+
+
+def _cache_lookup(backend, cache, hit):
+    """
+    Record a lookup in the cache called *cache* of *backend*.
+
+    For use by backends.
+    """
+    metrics = _active
+    if metrics is not None:
+        metrics.cache.inc(
+            backend=backend, cache=cache, result="hit" if hit else "miss"
+        )
+
+
+def _boto_call(backend, fnc):
+    """
+    Call *fnc* that makes a boto3 request for *backend* and record the
+    request and how often botocore retried it -- for example because it was
+    throttled.
+
+    For use by backends.
+    """
+    with _fetching(backend):
+        try:
+            resp = fnc()
+        except Exception as e:
+            _retried(backend, _boto_retries(getattr(e, "response", {})))
+            raise
+
+    _retried(backend, _boto_retries(resp))
+
+    return resp
+
+
+def _boto_retries(resp):
+    return resp.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+
+
+def _num(value):
+    return repr(float(value))
+
+
+def _escape_help(text):
+    return text.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _escape_label(value):
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
@@ -18,6 +18,10 @@
 Handling of sensitive data.
 """
 
+import importlib
+
+from typing import TYPE_CHECKING
+
 from environ.exceptions import MissingSecretImplementationError
 
 from ._dir import DirectorySecrets
@@ -25,19 +29,65 @@ from ._ini import INISecrets
 from ._vault import VaultEnvSecrets
 
 
-try:
-    from environ.secrets.awssm import SecretsManagerSecrets
-except ImportError:  # pragma: no cover
+if TYPE_CHECKING:
+    from .awslambda import LambdaExtensionSecrets
+    from .awssm import SecretsManagerSecrets
+    from .awsssm import SSMParameters
+    from .hostcache import HostCacheSecrets
+    from .vaultkv import VaultKVSecrets
+
+
+# Backends that need expensive imports -- like boto3, http.client, or
+# socketserver -- are only imported once they're used.
+_LAZY = {
+    "HostCacheSecrets": "hostcache",
+    "LambdaExtensionSecrets": "awslambda",
+    "SSMParameters": "awsssm",
+    "SecretsManagerSecrets": "awssm",
+    "VaultKVSecrets": "vaultkv",
+}
+
+_REQUIRE_BOTO3 = {
+    "SSMParameters": "AWS Systems Manager Parameter Store",
+    "SecretsManagerSecrets": "AWS secrets manager",
+}
+
 
-    class SecretsManagerSecrets:
+def __getattr__(name: str) -> type:
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        msg = f"module {__name__} has no attribute {name}"
+        raise AttributeError(msg) from None
+
+    try:
+        cls = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    except ImportError:  # pragma: no cover
+        if name not in _REQUIRE_BOTO3:
+            raise
+        cls = _requires_boto3(_REQUIRE_BOTO3[name])
+
+    globals()[name] = cls
+
+    return cls
+
+
+def _requires_boto3(service):  # pragma: no cover
+    class RequiresBoto3:
         def secret(self, *args, **kwargs):
-            msg = "AWS secrets manager requires boto3"
+            msg = f"{service} requires boto3"
             raise MissingSecretImplementationError(msg)
 
+    return RequiresBoto3
+
 
 __all__ = [
     "DirectorySecrets",
+    "HostCacheSecrets",
     "INISecrets",
+    "LambdaExtensionSecrets",
+    "SSMParameters",
     "SecretsManagerSecrets",
     "VaultEnvSecrets",
+    "VaultKVSecrets",
 ]
@@ -20,8 +20,6 @@ Handling of sensitive data from directories.
 
 from __future__ import annotations
 
-import logging
-
 from collections.abc import Callable
 from pathlib import Path
 from typing import Any
@@ -29,13 +27,11 @@ from typing import Any
 import attrs
 
 from environ._environ_config import CNF_KEY, RAISE, _ConfigEntry
+from environ._instrument import _note_var
 
 from ._utils import _get_default_secret, _SecretStr
 
 
-log = logging.getLogger(__name__)
-
-
 FileOpenError = OSError
 
 
@@ -110,7 +106,7 @@ class DirectorySecrets:
             secrets_dir = self.secrets_dir
 
         secret_path = Path(secrets_dir) / filename
-        log.debug("looking for secret in file '%s'.", secret_path)
+        _note_var(str(secret_path))
 
         try:
             return _SecretStr(secret_path.read_text())
@@ -0,0 +1,133 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Encrypted on-disk cache of Secrets Manager responses that survives restarts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from pathlib import Path
+
+import attrs
+
+from environ.exceptions import MissingSecretImplementationError
+
+from ._secretsmanager import _dump_response, _load_response
+
+
+log = logging.getLogger(__name__)
+
+
+@attrs.define
+class _DiskCache:
+    """
+    Store ``GetSecretValue`` responses in *path*, encrypted using the Fernet
+    key from the environment variable *key_env*.
+
+    Entries older than *ttl* seconds are ignored.  If the key is missing, the
+    cache is disabled.
+    """
+
+    path: Path = attrs.field(converter=Path)
+    key_env: str
+    ttl: int
+
+    def load(self, secret_name):
+        """
+        Return the cached response for *secret_name* or None.
+        """
+        fernet = self._fernet()
+        if fernet is None:
+            return None
+
+        from cryptography.fernet import InvalidToken
+
+        try:
+            data = fernet.decrypt(
+                self._file(secret_name).read_bytes(), self.ttl
+            )
+        except FileNotFoundError:
+            return None
+        except InvalidToken:
+            # Expired, tampered with, or encrypted with a different key.
+            log.debug("ignoring unusable cache entry for %s", secret_name)
+            return None
+
+        entry = json.loads(data)
+        if entry["name"] != secret_name:  # pragma: no cover
+            return None
+
+        return _load_response(entry["resp"])
+
+    def store(self, secret_name, resp):
+        """
+        Store *resp* for *secret_name* atomically and only readable by the
+        current user.
+        """
+        fernet = self._fernet()
+        if fernet is None:
+            return
+
+        data = fernet.encrypt(
+            json.dumps(
+                {"name": secret_name, "resp": _dump_response(resp)}
+            ).encode()
+        )
+
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path = self._file(secret_name)
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=f".{path.name}.")
+        try:
+            try:
+                f = os.fdopen(fd, "wb")
+            except BaseException:
+                os.close(fd)
+                raise
+            with f:
+                f.write(data)
+            Path(tmp).replace(path)
+        except BaseException:
+            Path(tmp).unlink()
+            raise
+
+    def _file(self, secret_name):
+        # Secret names can contain slashes and other funny characters.
+        return (
+            self.path
+            / hashlib.blake2b(secret_name.encode(), digest_size=16).hexdigest()
+        )
+
+    def _fernet(self):
+        try:
+            from cryptography.fernet import Fernet
+        except ImportError:  # pragma: no cover
+            msg = "Caching secrets on disk requires cryptography"
+            raise MissingSecretImplementationError(msg) from None
+
+        try:
+            return Fernet(os.environ[self.key_env])
+        except KeyError:
+            log.warning(
+                "%s is not set, not caching secrets on disk", self.key_env
+            )
+            return None
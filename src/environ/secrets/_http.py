@@ -0,0 +1,102 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Minimal HTTP client for secrets backends that don't need a whole SDK.
+"""
+
+from __future__ import annotations
+
+import http.client
+import logging
+import threading
+
+from urllib.parse import urlsplit
+
+import attrs
+
+from environ.metrics import _retried
+
+
+log = logging.getLogger(__name__)
+
+
+@attrs.define
+class _KeepAlive:
+    """
+    Send requests for *backend* to *base_url* over kept-alive connections.
+
+    ``http.client`` connections aren't thread-safe but getters may run
+    concurrently, so each thread gets its own connection.
+    """
+
+    base_url: str
+    timeout: float
+    backend: str
+    _local: threading.local = attrs.field(
+        init=False, factory=threading.local, repr=False
+    )
+
+    def request(
+        self, method, path, headers=None, body=None
+    ) -> tuple[int, bytes]:
+        """
+        Send a request and return the status and the body of the response.
+
+        If the server closed our idle connection, retry once with a fresh
+        one.
+        """
+        try:
+            return self._send(method, path, headers or {}, body)
+        except (http.client.HTTPException, ConnectionError):
+            log.debug("connection to %s lost, reconnecting", self.base_url)
+            _retried(self.backend)
+
+        return self._send(method, path, headers or {}, body)
+
+    def close(self) -> None:
+        """
+        Close the connection of the current thread.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            del self._local.conn
+
+    def _send(self, method, path, headers, body) -> tuple[int, bytes]:
+        conn = self._connection()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            return resp.status, resp.read()
+        except BaseException:
+            self.close()
+            raise
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            url = urlsplit(self.base_url)
+            cls = (
+                http.client.HTTPSConnection
+                if url.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = self._local.conn = cls(
+                url.hostname, url.port, timeout=self.timeout
+            )
+
+        return conn
@@ -30,6 +30,7 @@ from typing import Any
 import attrs
 
 from environ._environ_config import CNF_KEY, RAISE, _ConfigEntry
+from environ._instrument import _note_var
 
 from ._utils import _get_default_secret, _load_ini, _SecretStr
 
@@ -131,7 +132,7 @@ class INISecrets:
 
         var = ce.name if ce.name is not None else "_".join((*prefix[1:], name))
         try:
-            log.debug("looking for '%s' in section '%s'.", var, section)
+            _note_var(f"{section}:{var}")
             val = self._cfg.get(section, var)
 
             return _SecretStr(val)
@@ -0,0 +1,221 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2021 Chris Rose
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Backend-independent handling of AWS Secrets Manager secrets.
+
+Doesn't depend on boto3.
+"""
+
+from __future__ import annotations
+
+import base64
+import copyreg
+import json
+
+from collections.abc import Callable
+from typing import Any
+
+import attrs
+
+from environ._environ_config import (
+    CNF_KEY,
+    RAISE,
+    _ConfigEntry,
+    _per_load,
+    _secret_repr,
+)
+from environ._instrument import _note_var
+
+from ._utils import _get_default_secret, _SecretStr
+
+
+def convert_secret(key):
+    def converter(value):
+        if isinstance(value, str):
+            return value
+        return value[key]
+
+    return converter
+
+
+_DEFAULT_CONVERTER = convert_secret("SecretString")
+
+
+def _readonly_memoryview(data):
+    return memoryview(data).toreadonly()
+
+
+def _reduce_memoryview(mv):
+    """
+    Pickle read-only memoryviews -- like binary secrets -- as bytes, such that
+    snapshots and process pools can carry them.
+    """
+    if not mv.readonly:
+        msg = "cannot pickle 'memoryview' object"
+        raise TypeError(msg)
+
+    return _readonly_memoryview, (mv.tobytes(),)
+
+
+copyreg.pickle(memoryview, _reduce_memoryview)
+
+# The parts of a GetSecretValue response that are worth keeping.
+_RESPONSE_FIELDS = ("ARN", "Name", "VersionId", "SecretString", "SecretBinary")
+
+
+def _dump_response(resp):
+    """
+    Make a ``GetSecretValue`` response JSON-serializable.
+    """
+    rv = {k: resp[k] for k in _RESPONSE_FIELDS if k in resp}
+    if "SecretBinary" in rv:
+        rv["SecretBinary"] = base64.b64encode(rv["SecretBinary"]).decode()
+
+    return rv
+
+
+def _load_response(resp):
+    """
+    Undo `_dump_response`.
+    """
+    if "SecretBinary" in resp:
+        resp["SecretBinary"] = base64.b64decode(resp["SecretBinary"])
+
+    return resp
+
+
+class _SecretsManagerBase:
+    """
+    Declaration and lookup of Secrets Manager secrets.
+
+    Subclasses implement ``_get_secret_value(secret_name)`` that returns a
+    ``GetSecretValue`` response with a decoded ``SecretBinary``.
+    """
+
+    __slots__ = ()
+
+    def secret(
+        self,
+        default: Any = RAISE,
+        converter: Callable | None = _DEFAULT_CONVERTER,
+        name: str | None = None,
+        help: str | None = None,
+        *,
+        json_key: str | None = None,
+        binary: bool = False,
+    ):
+        """
+        Declare a secrets manager secret on an `environ.config`-decorated class
+
+        Args:
+            json_key:
+                Treat the ``SecretString`` as a JSON object and use the value
+                of this key.  Each secret is fetched and parsed only once per
+                load, no matter how many attributes use it.  No converter is
+                applied by default.
+
+            binary:
+                Use the ``SecretBinary`` of the secret as a read-only
+                `memoryview` without copying or decoding it.  If the secret
+                has no binary payload, it's treated as missing.  No converter
+                is applied by default.
+
+        Other parameters work just like in `environ.var`.
+
+        .. note::
+
+            By default, a converter is set that will extract the
+            ``SecretString`` field from the
+            ``SecretsManager.Client.get_secret_value()`` response for you. If
+            you wish you convert the value yourself and therefore overwrite the
+            converter, you must take this into account and grab
+            ``SecretString`` (or ``SecretBinary``) yourself.
+
+        .. versionadded:: 26.2.0 *json_key*
+        .. versionadded:: 26.2.0 *binary*
+        """
+        if json_key is not None and binary:
+            msg = "json_key and binary are mutually exclusive."
+            raise TypeError(msg)
+
+        if (
+            json_key is not None or binary
+        ) and converter is _DEFAULT_CONVERTER:
+            converter = None
+
+        return attrs.field(
+            default=default,
+            metadata={
+                CNF_KEY: _ConfigEntry(name, default, None, self._get, help),
+                CNF_AWSSM_SECRET_KEY: _AWSSMConfig(json_key, binary),
+            },
+            converter=converter,
+            # JSON values and binary payloads aren't necessarily strings.
+            repr=_secret_repr,
+        )
+
+    def _get(self, environ, metadata, prefix, name):
+        ce = metadata[CNF_KEY]
+        secret_name_envvar = ce.name or "_".join((*prefix, name)).upper()
+
+        _note_var(secret_name_envvar)
+        try:
+            secret_name = environ[secret_name_envvar]
+        except KeyError:
+            return _get_default_secret(secret_name_envvar, ce.default)
+
+        _note_var(secret_name)
+
+        # Multiple attributes may share a secret, but we fetch it only once.
+        resp = _per_load(
+            (id(self), secret_name),
+            lambda: self._get_secret_value(secret_name),
+        )
+
+        ac = metadata.get(CNF_AWSSM_SECRET_KEY)
+        if ac is not None and ac.binary:
+            try:
+                # boto3 already decoded the base64; don't copy it again.
+                return memoryview(resp["SecretBinary"]).toreadonly()
+            except KeyError:
+                return _get_default_secret(secret_name_envvar, ce.default)
+
+        if ac is None or ac.json_key is None:
+            return resp
+
+        parsed = _per_load(
+            (id(self), secret_name, "json"),
+            lambda: json.loads(resp["SecretString"]),
+            note=False,
+        )
+        try:
+            val = parsed[ac.json_key]
+        except KeyError:
+            return _get_default_secret(
+                f"{secret_name_envvar}[{ac.json_key}]", ce.default
+            )
+
+        return _SecretStr(val) if isinstance(val, str) else val
+
+
+CNF_AWSSM_SECRET_KEY = CNF_KEY + "_awssm_secret"
+
+
+@attrs.define
+class _AWSSMConfig:
+    json_key: str | None = attrs.field(default=None)
+    binary: bool = attrs.field(default=False)
@@ -14,17 +14,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import sys
+import threading
 
 from configparser import RawConfigParser
 from pathlib import Path
 
 import attrs
 
-from environ._environ_config import Raise
+from environ._environ_config import Raise, _Secret
 from environ.exceptions import MissingSecretError
 
 
+# boto3's default session isn't thread-safe and getters may run concurrently,
+# so clients are created one at a time.
+_boto3_lock = threading.Lock()
+
+
 def _get_default_secret(var, default):
     """
     Get default or raise MissingSecretError.
@@ -49,20 +54,9 @@ def _load_ini(path: str) -> RawConfigParser:
     return cfg
 
 
-class _SecretStr(str):
+class _SecretStr(_Secret, str):
     """
-    String that censors its __repr__ if called from an attrs repr.
+    String that is censored in the reprs of config classes.
     """
 
     __slots__ = ()
-
-    def __repr__(self) -> str:
-        # The frame numbers varies across attrs versions. Use this convoluted
-        # form to make the call lazy.
-        if (
-            sys._getframe(1).f_code.co_name == "__repr__"
-            or sys._getframe(2).f_code.co_name == "__repr__"
-        ):
-            return "<SECRET>"
-
-        return str.__repr__(self)
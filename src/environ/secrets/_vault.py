@@ -20,29 +20,32 @@ Handling of sensitive data from environment variables.
 
 from __future__ import annotations
 
-import logging
-
 from collections.abc import Callable
 from typing import Any
 
 import attrs
 
-from environ._environ_config import CNF_KEY, RAISE, _ConfigEntry
+from environ._environ_config import CNF_KEY, RAISE, _ConfigEntry, _per_load
+from environ._instrument import _note_var
 
 from ._utils import _get_default_secret, _SecretStr
 
 
-log = logging.getLogger(__name__)
-
-
 @attrs.define
 class VaultEnvSecrets:
     """
     Loads secrets from environment variables that follow the naming style from
     `envconsul <https://github.com/hashicorp/envconsul>`_.
+
+    *vault_prefix* can also be a callable that takes the environment and
+    returns the prefix.  It's called once per load.
     """
 
     vault_prefix: str = attrs.field()
+    # (prefix, name) -> env var; only used if vault_prefix is static.
+    _vars: dict[tuple[tuple[str, ...], str], str] = attrs.field(
+        init=False, factory=dict, repr=False, eq=False
+    )
 
     def secret(
         self,
@@ -68,16 +71,29 @@ class VaultEnvSecrets:
 
         if ce.name is not None:
             var = ce.name
+        elif callable(self.vault_prefix):
+            # Resolve the prefix only once per load, not once per secret.
+            vp = _per_load(
+                (id(self), "vault_prefix"),
+                lambda: self.vault_prefix(environ),
+                note=False,
+            )
+            var = _env_var(vp, prefix, name)
         else:
-            if callable(self.vault_prefix):
-                vp = self.vault_prefix(environ)
-            else:
-                vp = self.vault_prefix
-            var = "_".join((vp, *prefix[1:], name)).upper()
-
-        log.debug("looking for env var '%s'.", var)
+            try:
+                var = self._vars[prefix, name]
+            except KeyError:
+                var = self._vars[prefix, name] = _env_var(
+                    self.vault_prefix, prefix, name
+                )
+
+        _note_var(var)
         try:
             val = environ[var]
             return _SecretStr(val)
         except KeyError:
             return _get_default_secret(var, ce.default)
+
+
+def _env_var(vault_prefix, prefix, name):
+    return "_".join((vault_prefix, *prefix[1:], name)).upper()
@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Handling of sensitive data served by the AWS Parameters and Secrets Lambda
+Extension.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+
+from urllib.parse import urlencode
+
+import attrs
+
+from environ.metrics import _fetching
+
+from ._http import _KeepAlive
+from ._secretsmanager import _load_response, _SecretsManagerBase
+
+
+DEFAULT_PORT = 2773
+
+
+@attrs.define
+class LambdaExtensionSecrets(_SecretsManagerBase):
+    """
+    Load AWS Secrets Manager secrets from the `AWS Parameters and Secrets
+    Lambda Extension
+    <https://docs.aws.amazon.com/secretsmanager/latest/userguide/retrieving-secrets_lambda.html>`_.
+
+    Works just like `SecretsManagerSecrets` -- including
+    `SecretsManagerSecrets.secret`'s arguments -- but instead of calling AWS
+    using *boto3*, the secrets are fetched from the extension on localhost
+    which caches them across invocations.  The connection to the extension is
+    kept alive between requests.
+
+    Args:
+        port:
+            The port that the extension listens on.  Defaults to
+            ``PARAMETERS_SECRETS_EXTENSION_HTTP_PORT`` or 2773.
+
+        token:
+            The token to authenticate with.  Defaults to
+            ``AWS_SESSION_TOKEN``.
+
+        timeout: Seconds to wait for the extension.
+
+    Raises:
+        http.client.HTTPException:
+            If the extension doesn't answer with a secret -- for example,
+            because it doesn't exist.
+
+    .. versionadded:: 26.2.0
+    """
+
+    port: int | None = None
+    token: str | None = attrs.field(default=None, repr=False)
+    timeout: float = 5.0
+    _http: _KeepAlive | None = attrs.field(
+        init=False, default=None, repr=False
+    )
+
+    def _get_secret_value(self, secret_name):
+        query = urlencode({"secretId": secret_name})
+        headers = {
+            "X-Aws-Parameters-Secrets-Token": self.token
+            or os.environ.get("AWS_SESSION_TOKEN", "")
+        }
+        with _fetching(self.__class__.__name__):
+            status, body = self._client().request(
+                "GET", f"/secretsmanager/get?{query}", headers
+            )
+            if status != http.client.OK:
+                msg = (
+                    f"Fetching {secret_name!r} failed with {status}: {body!r}."
+                )
+                raise http.client.HTTPException(msg)
+
+        return _load_response(json.loads(body))
+
+    def _client(self) -> _KeepAlive:
+        if self._http is None:
+            port = self.port or int(
+                os.environ.get(
+                    "PARAMETERS_SECRETS_EXTENSION_HTTP_PORT", DEFAULT_PORT
+                )
+            )
+            self._http = _KeepAlive(
+                f"http://localhost:{port}",
+                self.timeout,
+                self.__class__.__name__,
+            )
+
+        return self._http
@@ -20,29 +20,31 @@ Handling of sensitive data stored in AWS Secrets Manager
 
 from __future__ import annotations
 
+import contextvars
 import logging
+import threading
+import time
 
+from collections import deque
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
 from typing import Any
 
 import attrs
 import boto3
 
-from environ._environ_config import CNF_KEY, RAISE, _ConfigEntry
+from environ._environ_config import _DaemonPool
+from environ.metrics import _boto_call, _cache_lookup
 
-from ._utils import _get_default_secret
+from ._diskcache import _DiskCache
+from ._secretsmanager import _SecretsManagerBase, convert_secret
+from ._utils import _boto3_lock
 
 
-log = logging.getLogger(__name__)
-
+__all__ = ["HedgingPolicy", "SecretsManagerSecrets", "convert_secret"]
 
-def convert_secret(key):
-    def converter(value):
-        if isinstance(value, str):
-            return value
-        return value[key]
-
-    return converter
+log = logging.getLogger(__name__)
 
 
 def _build_secretsmanager_client():
@@ -51,8 +53,112 @@ def _build_secretsmanager_client():
     return client
 
 
+# Runs the requests of all hedging policies.
+_hedge_pool = _DaemonPool(32, "environ-hedge")
+
+
+@attrs.define
+class HedgingPolicy:
+    """
+    Hedge slow requests to AWS Secrets Manager: if a request didn't return
+    after a delay, issue a duplicate one and take whichever completes first.
+
+    The delay is the *percentile* of the latencies of the last *window*
+    requests.  Until *min_samples* latencies have been observed,
+    *initial_delay* is used.
+
+    Args:
+        percentile: Between 0 and 1.
+
+        initial_delay: Seconds to wait until enough latencies are known.
+
+        min_samples: How many latencies are needed to compute the delay.
+
+        window: How many latencies are remembered.
+
+    Attributes:
+        hedges_issued: How many duplicate requests have been issued.
+
+        hedges_won: How many duplicate requests completed first.
+
+    .. versionadded:: 26.2.0
+    """
+
+    percentile: float = 0.95
+    initial_delay: float = 0.1
+    min_samples: int = 20
+    window: int = 100
+    hedges_issued: int = attrs.field(default=0, init=False)
+    hedges_won: int = attrs.field(default=0, init=False)
+    _latencies: deque = attrs.field(init=False, repr=False)
+    _lock: threading.Lock = attrs.field(
+        init=False, factory=threading.Lock, repr=False
+    )
+
+    @_latencies.default
+    def _latencies_default(self):
+        return deque(maxlen=self.window)
+
+    def delay(self) -> float:
+        """
+        Return the number of seconds to wait before hedging.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            latencies = sorted(self._latencies)
+
+        return latencies[int(self.percentile * (len(latencies) - 1))]
+
+    def _submit(self, fnc):
+        fut = Future()
+        start = time.monotonic()
+
+        def run():
+            try:
+                fut.set_result(fnc())
+            except BaseException as e:  # noqa: BLE001
+                fut.set_exception(e)
+
+            with self._lock:
+                self._latencies.append(time.monotonic() - start)
+
+        # Requests are recorded in the context of the load.
+        _hedge_pool.submit(contextvars.copy_context().run, run)
+
+        return fut
+
+    def call(self, fnc: Callable[[], Any]) -> Any:
+        """
+        Call *fnc* and hedge it if it's slow.
+        """
+        first = self._submit(fnc)
+        done, _ = wait([first], timeout=self.delay())
+        if done:
+            return first.result()
+
+        with self._lock:
+            self.hedges_issued += 1
+        hedge = self._submit(fnc)
+
+        futs = (first, hedge)
+        done, pending = wait(futs, return_when=FIRST_COMPLETED)
+        # If everything that completed failed, give the other one a chance.
+        if pending and all(f.exception() is not None for f in done):
+            wait(pending)
+
+        winner = next(
+            (f for f in futs if f.done() and f.exception() is None), first
+        )
+        if winner is hedge:
+            with self._lock:
+                self.hedges_won += 1
+
+        return winner.result()
+
+
 @attrs.define
-class SecretsManagerSecrets:
+class SecretsManagerSecrets(_SecretsManagerBase):
     """
     Load secrets from the AWS Secrets Manager.
 
@@ -75,6 +181,24 @@ class SecretsManagerSecrets:
     Then the secrets will be looked up in AWS Secrets Manager with the Secret
     IDs ``prod/db_password`` and ``prod/api_key``, respectively.
 
+    Pass a `HedgingPolicy` as *hedging* to cut the tail latency of slow
+    requests.
+
+    If *cache* is true, fetched secrets are cached.  On subsequent loads,
+    only their metadata is fetched using ``DescribeSecret`` and the secret
+    value is only downloaded again if its current version changed -- for
+    example, because it has been rotated.
+
+    To speed up cold starts, pass a *cache_dir* and the name of an environment
+    variable that contains a `Fernet
+    <https://cryptography.io/en/latest/fernet/>`_ key as *cache_key_env*.
+    Fetched secrets are then stored encrypted in *cache_dir* and on the next
+    start, they're used immediately while their current version is checked
+    in the background.  If it changed, the secret is downloaded and stored for
+    the next start.  Entries older than *cache_ttl* seconds are ignored.  If
+    the key is not set, secrets are not cached on disk.  Requires
+    *cryptography*.
+
     .. warning::
 
        Requires `boto3 <https://pypi.org/project/boto3/>`_! Please install
@@ -82,71 +206,135 @@ class SecretsManagerSecrets:
        environ-config[aws]``
 
     .. versionadded:: 21.4.0
+    .. versionadded:: 26.2.0 *hedging*
+    .. versionadded:: 26.2.0 *cache*
+    .. versionadded:: 26.2.0 *cache_dir*, *cache_key_env*, and *cache_ttl*
     """
 
     _client: boto3.client | None = None
+    hedging: HedgingPolicy | None = None
+    cache: bool = False
+    cache_dir: str | Path | None = None
+    cache_key_env: str | None = None
+    cache_ttl: int = 3600
+    _cached: dict[str, Any] = attrs.field(init=False, factory=dict, repr=False)
+    _disk: _DiskCache | None = attrs.field(
+        init=False, default=None, repr=False
+    )
+
+    def __attrs_post_init__(self):
+        if self.cache_dir is None:
+            return
+
+        if self.cache_key_env is None:
+            msg = "cache_dir requires cache_key_env."
+            raise TypeError(msg)
+
+        self._disk = _DiskCache(
+            self.cache_dir, self.cache_key_env, self.cache_ttl
+        )
 
     @property
     def client(self) -> boto3.client:
         if self._client is None:
-            self._client = _build_secretsmanager_client()
+            with _boto3_lock:
+                if self._client is None:
+                    self._client = _build_secretsmanager_client()
 
         return self._client
 
-    def secret(
-        self,
-        default: Any = RAISE,
-        converter: Callable = convert_secret("SecretString"),  # noqa: B008
-        name: str | None = None,
-        help: str | None = None,
-    ):
-        """
-        Declare a secrets manager secret on an `environ.config`-decorated class
+    def _get_secret_value(self, secret_name):
+        if not self.cache:
+            return self._load(secret_name)
+
+        backend = self.__class__.__name__
+        cached = self._cached.get(secret_name)
+        if cached is None:
+            _cache_lookup(backend, "memory", hit=False)
+            rv = self._load(secret_name)
+        elif self._current_version(secret_name) == cached["VersionId"]:
+            log.debug("secret %s hasn't changed, using cache", secret_name)
+            _cache_lookup(backend, "memory", hit=True)
+            return cached
+        else:
+            _cache_lookup(backend, "memory", hit=False)
+            rv = self._download(secret_name)
 
-        All parameters work just like in `environ.var`.
+        self._cached[secret_name] = rv
 
-        .. note::
+        return rv
 
-            By default, a converter is set that will extract the
-            ``SecretString`` field from the
-            ``SecretsManager.Client.get_secret_value()`` response for you. If
-            you wish you convert the value yourself and therefore overwrite the
-            converter, you must take this into account and grab
-            ``SecretString`` (or ``SecretBinary``) yourself.
+    def _load(self, secret_name):
+        """
+        Use the disk cache if possible, otherwise fetch *secret_name*.
+        """
+        if self._disk is not None:
+            rv = self._disk.load(secret_name)
+            _cache_lookup(self.__class__.__name__, "disk", hit=rv is not None)
+            if rv is not None:
+                log.debug("using secret %s from disk", secret_name)
+                threading.Thread(
+                    target=self._refresh,
+                    args=(secret_name, rv),
+                    name="environ-refresh",
+                    daemon=True,
+                ).start()
+                return rv
+
+        return self._download(secret_name)
+
+    def _download(self, secret_name):
+        rv = self._fetch(secret_name)
+        if self._disk is not None:
+            try:
+                self._disk.store(secret_name, rv)
+            except OSError:
+                log.warning(
+                    "caching secret %s on disk failed",
+                    secret_name,
+                    exc_info=True,
+                )
+
+        return rv
+
+    def _refresh(self, secret_name, cached):
+        """
+        Download *secret_name* if the *cached* version isn't current anymore,
+        otherwise renew its disk cache entry.
         """
-        return attrs.field(
-            default=default,
-            metadata={
-                CNF_KEY: _ConfigEntry(name, default, None, self._get, help)
-            },
-            converter=converter,
-        )
-
-    def _get(self, environ, metadata, prefix, name):
-        ce = metadata[CNF_KEY]
-        if ce.name:
-            secret_name_envvar = ce.name
-            log.debug(
-                "override env variable with explicit name %s",
-                secret_name_envvar,
-            )
-        else:
-            parts = (*prefix, name)
-            secret_name_envvar = "_".join(parts).upper()
-            log.debug(
-                "secret name environment variable %s", secret_name_envvar
-            )
-
         try:
-            secret_name = environ[secret_name_envvar]
-        except KeyError:
-            # missing the environment; let's try to get the default
-            log.debug(
-                "no key %s in environment, using default=%s",
-                secret_name_envvar,
-                ce.default,
+            if self._current_version(secret_name) == cached["VersionId"]:
+                self._disk.store(secret_name, cached)
+            else:
+                log.info("secret %s changed, downloading", secret_name)
+                self._download(secret_name)
+        except Exception:
+            log.exception("refreshing secret %s failed", secret_name)
+
+    def _fetch(self, secret_name):
+        # Each attempt -- including hedges -- is a request of its own.
+        def fetch():
+            return _boto_call(
+                self.__class__.__name__,
+                lambda: self.client.get_secret_value(SecretId=secret_name),
             )
-            return _get_default_secret(secret_name_envvar, ce.default)
-        log.debug("secret name: %s", secret_name)
 
-        return self.client.get_secret_value(SecretId=secret_name)
+        if self.hedging is not None:
+            return self.hedging.call(fetch)
+
+        return fetch()
+
+    def _current_version(self, secret_name):
+        """
+        Return the ID of the current version of *secret_name* without
+        fetching its value.
+        """
+        meta = _boto_call(
+            self.__class__.__name__,
+            lambda: self.client.describe_secret(SecretId=secret_name),
+        )
+        for version, stages in meta.get("VersionIdsToStages", {}).items():
+            if "AWSCURRENT" in stages:
+                return version
+
+        return None
@@ -0,0 +1,224 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Handling of settings and sensitive data stored in AWS Systems Manager
+Parameter Store.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from collections.abc import Callable
+from typing import Any
+
+import attrs
+import boto3
+
+from environ._environ_config import (
+    CNF_KEY,
+    RAISE,
+    _ConfigEntry,
+    _group_path,
+    _per_load,
+)
+from environ._instrument import _note_var
+from environ.metrics import _boto_call, _cache_lookup
+
+from ._utils import _boto3_lock, _get_default_secret, _SecretStr
+
+
+log = logging.getLogger(__name__)
+
+# GetParameters accepts at most 10 names per call.
+_MAX_NAMES = 10
+
+
+def _build_ssm_client():
+    client = boto3.client("ssm")
+    log.debug("Created a ssm client %s", client)
+    return client
+
+
+@attrs.define
+class SSMParameters:
+    """
+    Load settings from the AWS Systems Manager Parameter Store.
+
+    The config tree is mapped onto the parameter hierarchy below *root*:
+
+    Given these parameters::
+
+        /myapp/prod/workers
+        /myapp/prod/db/password
+        /shared/api_key
+
+    And this app::
+
+        ssm = SSMParameters("/myapp/prod")
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                password = ssm.secret()
+
+            workers = ssm.secret(converter=int)
+            api_key = ssm.secret(name="/shared/api_key")
+            db = environ.group(DB)
+
+    Then all parameters below ``/myapp/prod`` are loaded using paginated
+    ``GetParametersByPath`` calls and the parameters with explicit names using
+    ``GetParameters`` -- 10 at a time.  Each of them happens only once per
+    load, no matter how many attributes there are.
+
+    Values of ``SecureString`` parameters are decrypted unless *decrypt* is
+    false and are censored in the ``repr`` of the config.
+
+    If *cache_ttl* is set, the parameters are cached for that many seconds
+    across loads.
+
+    .. warning::
+
+       Requires `boto3 <https://pypi.org/project/boto3/>`_! Please install
+       *environ-config* with the ``aws`` extra: ``python -Im pip install
+       environ-config[aws]``
+
+    .. versionadded:: 26.2.0
+    """
+
+    root: str = attrs.field(converter=lambda root: "/" + root.strip("/"))
+    _client: boto3.client | None = None
+    decrypt: bool = True
+    cache_ttl: float | None = None
+    _names: set[str] = attrs.field(init=False, factory=set, repr=False)
+    _cached: tuple[float, dict[str, Any]] | None = attrs.field(
+        init=False, default=None, repr=False
+    )
+
+    @property
+    def client(self) -> boto3.client:
+        if self._client is None:
+            with _boto3_lock:
+                if self._client is None:
+                    self._client = _build_ssm_client()
+
+        return self._client
+
+    def secret(
+        self,
+        default: Any = RAISE,
+        converter: Callable | None = None,
+        name: str | None = None,
+        help: str | None = None,
+    ) -> Any:
+        """
+        Declare a Parameter Store parameter on an `environ.config`-decorated
+        class.
+
+        If *name* is passed, it's the full name of the parameter.  Otherwise,
+        it's derived from *root*, the groups, and the name of the attribute.
+
+        Other parameters work just like in `environ.var`.
+        """
+        if name is not None:
+            self._names.add(name)
+
+        return attrs.field(
+            default=default,
+            metadata={
+                CNF_KEY: _ConfigEntry(name, default, None, self._get, help)
+            },
+            converter=converter,
+        )
+
+    def _get(self, environ, metadata, prefix, name):
+        ce = metadata[CNF_KEY]
+        if ce.name is not None:
+            param = ce.name
+        else:
+            param = "/".join(
+                (self.root.rstrip("/"), *_group_path(prefix), name)
+            )
+
+        _note_var(param)
+        params = _per_load(id(self), self._get_parameters)
+        try:
+            return params[param]
+        except KeyError:
+            return _get_default_secret(param, ce.default)
+
+    def _get_parameters(self):
+        if self.cache_ttl is not None:
+            hit = (
+                self._cached is not None
+                and time.monotonic() - self._cached[0] < self.cache_ttl
+            )
+            _cache_lookup(self.__class__.__name__, "memory", hit=hit)
+            if hit:
+                log.debug("using cached parameters below %s", self.root)
+                return self._cached[1]
+
+        fetched_at = time.monotonic()
+        params = self._fetch_path()
+        params.update(self._fetch_names(self._names - params.keys()))
+
+        if self.cache_ttl is not None:
+            self._cached = (fetched_at, params)
+
+        return params
+
+    def _fetch_path(self):
+        # Paginate by hand to record each page's request.
+        kw = {"Path": self.root, "Recursive": True}
+        params = {}
+        while True:
+            resp = _boto_call(
+                self.__class__.__name__,
+                lambda: self.client.get_parameters_by_path(
+                    **kw, WithDecryption=self.decrypt
+                ),
+            )
+            params.update((p["Name"], _value(p)) for p in resp["Parameters"])
+            if "NextToken" not in resp:
+                return params
+
+            kw["NextToken"] = resp["NextToken"]
+
+    def _fetch_names(self, names):
+        names = sorted(names)
+        params = {}
+        for i in range(0, len(names), _MAX_NAMES):
+            resp = _boto_call(
+                self.__class__.__name__,
+                lambda chunk=names[i : i + _MAX_NAMES]: (
+                    self.client.get_parameters(
+                        Names=chunk, WithDecryption=self.decrypt
+                    )
+                ),
+            )
+            params.update((p["Name"], _value(p)) for p in resp["Parameters"])
+
+        return params
+
+
+def _value(param):
+    if param["Type"] == "SecureString":
+        return _SecretStr(param["Value"])
+
+    return param["Value"]
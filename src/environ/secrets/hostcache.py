@@ -0,0 +1,396 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Share fetched AWS Secrets Manager secrets between all processes on a host
+using a small cache daemon that listens on a Unix domain socket.
+
+Run the daemon using::
+
+    $ python -Im environ.secrets.hostcache /run/environ/secrets.sock
+
+and use `HostCacheSecrets` in your processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import threading
+import time
+
+from pathlib import Path
+from typing import Any
+
+import attrs
+
+from environ.exceptions import ConfigError
+from environ.metrics import _cache_lookup, _fetching, _retried
+
+from ._secretsmanager import (
+    _dump_response,
+    _load_response,
+    _SecretsManagerBase,
+)
+
+
+log = logging.getLogger(__name__)
+
+
+@attrs.define
+class HostCacheSecrets(_SecretsManagerBase):
+    """
+    Load AWS Secrets Manager secrets through a `SecretCacheDaemon` that
+    listens on *path*, so that all processes on a host share one fetch and
+    one cache.
+
+    Works just like `SecretsManagerSecrets` -- including
+    `SecretsManagerSecrets.secret`'s arguments -- and doesn't require
+    *boto3*.
+
+    The socket must belong to the current user (or root) and must not be
+    accessible by anyone else.
+
+    Args:
+        path: The path of the daemon's socket.
+
+        fallback:
+            If the daemon isn't running, fetch secrets using this instead --
+            for example, a `SecretsManagerSecrets`.  If None, the error is
+            raised.
+
+        timeout: Seconds to wait for the daemon.
+
+    Raises:
+        environ.exceptions.ConfigError:
+            If the socket is insecure or the daemon couldn't fetch a secret.
+
+    .. versionadded:: 26.2.0
+    """
+
+    path: str
+    fallback: _SecretsManagerBase | None = None
+    timeout: float = 10.0
+    _local: threading.local = attrs.field(
+        init=False, factory=threading.local, repr=False
+    )
+
+    def _get_secret_value(self, secret_name):
+        try:
+            with _fetching(self.__class__.__name__):
+                resp = self._request({"secret_id": secret_name})
+                if "error" in resp:
+                    msg = f"Fetching {secret_name!r} failed: {resp['error']}"
+                    raise ConfigError(msg)
+        except OSError:
+            if self.fallback is None:
+                raise
+
+            log.warning(
+                "secret cache daemon at %s unavailable, falling back",
+                self.path,
+                exc_info=True,
+            )
+            return self.fallback._get_secret_value(secret_name)
+
+        return _load_response(resp["secret"])
+
+    def close(self) -> None:
+        """
+        Close the connection of the current thread.
+        """
+        f = self._local.__dict__.pop("f", None)
+        if f is not None:
+            # Flushing a broken connection fails.
+            with contextlib.suppress(OSError):
+                f.close()
+
+    def _request(self, req):
+        line = json.dumps(req).encode() + b"\n"
+        try:
+            return self._send(line)
+        except OSError:
+            # The daemon might have been restarted.
+            log.debug("connection to %s lost, reconnecting", self.path)
+            _retried(self.__class__.__name__)
+
+        return self._send(line)
+
+    def _send(self, line):
+        f = self._connect()
+        try:
+            f.write(line)
+            f.flush()
+            return json.loads(_readline(f))
+        except BaseException:
+            self.close()
+            raise
+
+    def _connect(self):
+        f = getattr(self._local, "f", None)
+        if f is None:
+            _check_socket(self.path)
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+
+            f = self._local.f = sock.makefile("rwb")
+            sock.close()  # the file keeps the socket open
+
+        return f
+
+
+class SecretCacheDaemon:
+    """
+    Serve secrets fetched by *upstream* to `HostCacheSecrets` over a Unix
+    domain socket at *path*.
+
+    Secrets are cached for *ttl* seconds.  Concurrent requests for the same
+    secret cause only one fetch.
+
+    Only processes of the same user (or root) may connect: the socket is
+    created with the mode 0600 and where the platform supports it, the
+    credentials of the peers are checked, too.
+
+    Args:
+        path: Where to create the socket.
+
+        upstream:
+            Where the secrets are fetched from.  Defaults to
+            `SecretsManagerSecrets` which requires *boto3*.
+
+        ttl: Seconds to cache secrets for.
+
+    .. versionadded:: 26.2.0
+    """
+
+    def __init__(
+        self,
+        path: str,
+        upstream: _SecretsManagerBase | None = None,
+        ttl: float = 300.0,
+    ):
+        if upstream is None:
+            from .awssm import SecretsManagerSecrets
+
+            upstream = SecretsManagerSecrets()
+
+        self.path = path
+        self.upstream = upstream
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # secret_id -> [lock, expires at, response]
+        self._cache: dict[str, list[Any]] = {}
+        self._closed = threading.Event()
+        self._server = _Server(path, _Handler, self)
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """
+        Serve requests until `shutdown` is called and remove the socket
+        afterwards.
+
+        Args:
+            poll_interval:
+                Seconds between checks whether `shutdown` has been called.
+        """
+        log.info("serving secrets on %s", self.path)
+        try:
+            self._server.serve_forever(poll_interval)
+        finally:
+            self._server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                Path(self.path).unlink()
+            self._closed.set()
+
+    def shutdown(self) -> None:
+        """
+        Make `serve_forever` return and wait until it did.
+
+        Must be called from a different thread.
+        """
+        self._server.shutdown()
+        self._closed.wait()
+
+    def get(self, secret_id: str) -> dict[str, Any]:
+        """
+        Return the cached ``GetSecretValue`` response for *secret_id* or
+        fetch it.
+        """
+        with self._lock:
+            entry = self._cache.get(secret_id)
+            if entry is None:
+                entry = self._cache[secret_id] = [threading.Lock(), 0.0, None]
+
+        with entry[0]:
+            hit = time.monotonic() < entry[1]
+            _cache_lookup(self.__class__.__name__, "memory", hit=hit)
+            if not hit:
+                log.debug("fetching secret %s", secret_id)
+                entry[2] = self.upstream._get_secret_value(secret_id)
+                entry[1] = time.monotonic() + self.ttl
+
+            return entry[2]
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, handler, cache_daemon):
+        self.cache_daemon = cache_daemon
+        self.uid = os.getuid()
+        self.connections = set()
+
+        _remove_stale(path)
+
+        old = os.umask(0o177)
+        try:
+            super().__init__(path, handler)
+        finally:
+            os.umask(old)
+        Path(path).chmod(0o600)
+
+    def verify_request(self, request, client_address):
+        uid = _peer_uid(request)
+        if uid is not None and uid not in (self.uid, 0):
+            log.warning("rejected connection from uid %d", uid)
+            return False
+
+        return True
+
+    def server_close(self):
+        super().server_close()
+
+        # Clients keep their connections open, so hang up on them.
+        for conn in list(self.connections):
+            with contextlib.suppress(OSError):
+                conn.shutdown(socket.SHUT_RDWR)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.server.connections.add(self.connection)
+
+    def finish(self):
+        self.server.connections.discard(self.connection)
+        super().finish()
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                secret_id = json.loads(line)["secret_id"]
+                resp = {
+                    "secret": _dump_response(
+                        self.server.cache_daemon.get(secret_id)
+                    )
+                }
+            except Exception as e:
+                log.warning("request %r failed", line, exc_info=True)
+                resp = {"error": f"{e.__class__.__name__}: {e}"}
+
+            self.wfile.write(json.dumps(resp).encode() + b"\n")
+
+
+def _readline(f):
+    line = f.readline()
+    if not line:
+        raise ConnectionResetError
+
+    return line
+
+
+def _peer_uid(sock):
+    """
+    Return the uid of the process on the other side of *sock* or None if the
+    platform can't tell.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):  # pragma: no cover
+        return None
+
+    creds = sock.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _, uid, _ = struct.unpack("3i", creds)
+
+    return uid
+
+
+def _check_socket(path):
+    """
+    Make sure that the socket at *path* is controlled by us or root.
+    """
+    st = Path(path).stat()
+    if st.st_uid not in (os.getuid(), 0) or st.st_mode & (
+        stat.S_IRWXG | stat.S_IRWXO
+    ):
+        msg = f"Refusing to use insecure secret cache socket {path!r}."
+        raise ConfigError(msg)
+
+
+def _remove_stale(path):
+    """
+    Remove the socket at *path* if nobody is listening on it anymore.
+    """
+    if not Path(path).exists():
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            Path(path).unlink()
+            return
+
+    msg = f"Another daemon is already listening on {path!r}."
+    raise OSError(msg)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run a `SecretCacheDaemon` that fetches from AWS Secrets Manager.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m environ.secrets.hostcache",
+        description="Share AWS Secrets Manager secrets between processes.",
+    )
+    parser.add_argument("path", help="where to create the socket")
+    parser.add_argument(
+        "--ttl", type=float, default=300.0, help="seconds to cache secrets"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    daemon = SecretCacheDaemon(args.path, ttl=args.ttl)
+    with contextlib.suppress(KeyboardInterrupt):
+        daemon.serve_forever()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
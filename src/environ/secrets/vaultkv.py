@@ -0,0 +1,342 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Handling of sensitive data stored in the KV version 2 secrets engine of
+HashiCorp Vault.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import os
+import threading
+import time
+
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import quote
+
+import attrs
+
+from environ._environ_config import (
+    CNF_KEY,
+    RAISE,
+    _ConfigEntry,
+    _group_path,
+    _per_load,
+    _secret_repr,
+)
+from environ._instrument import _note_var
+from environ.exceptions import MissingEnvValueError
+from environ.metrics import _cache_lookup, _fetching
+
+from ._http import _KeepAlive
+from ._utils import _get_default_secret, _SecretStr
+
+
+log = logging.getLogger(__name__)
+
+
+@attrs.define
+class VaultKVSecrets:
+    """
+    Load secrets from the `KV version 2
+    <https://developer.hashicorp.com/vault/docs/secrets/kv/kv-v2>`_ secrets
+    engine of HashiCorp Vault.
+
+    The config tree is mapped onto the secrets below *path*: the attributes
+    of the top-level class are keys of the secret at *path* itself, and the
+    attributes of groups are keys of the secrets below it.
+
+    Given these secrets in the ``secret`` mount::
+
+        myapp/prod     {"api_key": "..."}
+        myapp/prod/db  {"password": "..."}
+
+    And this app::
+
+        vault = VaultKVSecrets("myapp/prod")
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                password = vault.secret()
+
+            api_key = vault.secret()
+            db = environ.group(DB)
+
+    Then on each load, the secrets below ``myapp/prod`` are listed and read
+    in one pass over a kept-alive connection -- no matter how many attributes
+    there are.
+
+    Args:
+        path: The path of the secrets within *mount*.
+
+        url: The address of Vault.  Defaults to ``VAULT_ADDR``.
+
+        mount: Where the KV secrets engine is mounted.
+
+        token: The token to use.  Defaults to ``VAULT_TOKEN``.
+
+        role_id:
+            Together with *secret_id*, log in using AppRole instead of using
+            a token.  The resulting token is cached until it expires.
+
+        secret_id: See *role_id*.
+
+        renew:
+            Renew the token that was obtained using AppRole on a background
+            thread before it expires.
+
+        timeout: Seconds to wait for Vault.
+
+    Raises:
+        http.client.HTTPException: If Vault answers with an error.
+
+    Secrets that come with a lease are cached until the shortest lease
+    expires.
+
+    .. versionadded:: 26.2.0
+    """
+
+    path: str = attrs.field(converter=lambda path: path.strip("/"))
+    url: str | None = None
+    mount: str = "secret"
+    token: str | None = attrs.field(default=None, repr=False)
+    role_id: str | None = None
+    secret_id: str | None = attrs.field(default=None, repr=False)
+    renew: bool = False
+    timeout: float = 5.0
+    _http: _KeepAlive | None = attrs.field(
+        init=False, default=None, repr=False
+    )
+    _lock: threading.Lock = attrs.field(
+        init=False, factory=threading.Lock, repr=False
+    )
+    # (token, expires at)
+    _auth: tuple[str, float] | None = attrs.field(
+        init=False, default=None, repr=False
+    )
+    _renewer: threading.Thread | None = attrs.field(
+        init=False, default=None, repr=False
+    )
+    _closed: threading.Event = attrs.field(
+        init=False, factory=threading.Event, repr=False
+    )
+    # (secrets, expire at)
+    _cached: tuple[dict[str, dict[str, Any]], float] | None = attrs.field(
+        init=False, default=None, repr=False
+    )
+
+    def secret(
+        self,
+        default: Any = RAISE,
+        converter: Callable | None = None,
+        name: str | None = None,
+        help: str | None = None,
+    ) -> Any:
+        """
+        Declare a Vault secret on an `environ.config`-decorated class.
+
+        If *name* is passed, it's used as the key within the secret instead
+        of the name of the attribute.
+
+        Other parameters work just like in `environ.var`.
+        """
+        return attrs.field(
+            default=default,
+            metadata={
+                CNF_KEY: _ConfigEntry(name, default, None, self._get, help)
+            },
+            converter=converter,
+            # KV values aren't necessarily strings.
+            repr=_secret_repr,
+        )
+
+    def _get(self, environ, metadata, prefix, name):
+        ce = metadata[CNF_KEY]
+        secret = "/".join(_group_path(prefix))
+        key = ce.name or name
+
+        label = f"{'/'.join(filter(None, (self.path, secret)))}:{key}"
+        _note_var(label)
+        secrets = _per_load(id(self), self._read_all)
+        try:
+            val = secrets[secret][key]
+        except KeyError:
+            return _get_default_secret(label, ce.default)
+
+        return _SecretStr(val) if isinstance(val, str) else val
+
+    def _read_all(self):
+        """
+        List and read all secrets below *path*.
+
+        Returns:
+            A dict of paths relative to *path* to the data of the secrets.
+        """
+        cached = self._cached
+        hit = cached is not None and time.monotonic() < cached[1]
+        _cache_lookup(self.__class__.__name__, "lease", hit=hit)
+        if hit:
+            log.debug("using cached secrets below %s", self.path)
+            return cached[0]
+
+        secrets = {}
+        leases = []
+        for secret in ("", *self._list("")):
+            resp = self._call("GET", "data", secret)
+            if resp is not None:
+                secrets[secret] = resp["data"]["data"]
+                leases.append(resp.get("lease_duration", 0))
+
+        if leases and min(leases) > 0:
+            self._cached = (secrets, time.monotonic() + min(leases))
+
+        return secrets
+
+    def _list(self, folder):
+        resp = self._call("LIST", "metadata", folder)
+        if resp is None:
+            return
+
+        for key in resp["data"]["keys"]:
+            if key.endswith("/"):
+                yield from self._list(folder + key)
+            else:
+                yield folder + key
+
+    def _call(self, method, kind, secret):
+        """
+        Call the KV API for *secret* and return the parsed response or None if
+        there's nothing at *secret*.
+        """
+        path = "/".join(filter(None, (self.path, secret.rstrip("/"))))
+        token = self._token()
+        with _fetching(self.__class__.__name__):
+            status, body = self._client().request(
+                method,
+                f"/v1/{self.mount}/{kind}/{quote(path)}",
+                {"X-Vault-Token": token},
+            )
+            if status == http.client.NOT_FOUND:
+                return None
+
+            return _check(status, body)
+
+    def _token(self) -> str:
+        if self.token is not None:
+            return self.token
+
+        if self.role_id is None:
+            return _from_env("VAULT_TOKEN")
+
+        with self._lock:
+            if self._auth is None or time.monotonic() >= self._auth[1]:
+                self._login()
+
+            return self._auth[0]
+
+    def _login(self):
+        with _fetching(self.__class__.__name__):
+            status, body = self._client().request(
+                "POST",
+                "/v1/auth/approle/login",
+                {"Content-Type": "application/json"},
+                json.dumps(
+                    {"role_id": self.role_id, "secret_id": self.secret_id}
+                ),
+            )
+            auth = _check(status, body)["auth"]
+        log.debug("logged into vault using approle")
+        self._auth = (
+            auth["client_token"],
+            time.monotonic() + auth["lease_duration"],
+        )
+
+        if self.renew and auth.get("renewable") and self._renewer is None:
+            self._renewer = threading.Thread(
+                target=self._renew,
+                args=(auth["lease_duration"],),
+                name="environ-vault-renew",
+                daemon=True,
+            )
+            self._renewer.start()
+
+    def close(self) -> None:
+        """
+        Stop renewing the token and close the connection of the current
+        thread.
+        """
+        self._closed.set()
+        renewer = self._renewer
+        if renewer is not None:
+            renewer.join()
+
+        if self._http is not None:
+            self._http.close()
+
+    def _renew(self, ttl):
+        # Renew after two thirds of the TTL, like Vault Agent does.
+        while ttl > 0 and not self._closed.wait(ttl * 2 / 3):
+            with self._lock:
+                token = self._auth[0]
+                try:
+                    with _fetching(self.__class__.__name__):
+                        status, body = self._client().request(
+                            "POST",
+                            "/v1/auth/token/renew-self",
+                            {"X-Vault-Token": token},
+                        )
+                        ttl = _check(status, body)["auth"]["lease_duration"]
+                except Exception:
+                    log.exception("renewing vault token failed")
+                    break
+
+                self._auth = (token, time.monotonic() + ttl)
+                log.debug("renewed vault token for %d seconds", ttl)
+
+        self._client().close()
+        self._renewer = None
+
+    def _client(self) -> _KeepAlive:
+        if self._http is None:
+            self._http = _KeepAlive(
+                self.url or _from_env("VAULT_ADDR"),
+                self.timeout,
+                self.__class__.__name__,
+            )
+
+        return self._http
+
+
+def _from_env(var):
+    try:
+        return os.environ[var]
+    except KeyError:
+        raise MissingEnvValueError(var) from None
+
+
+def _check(status, body):
+    if not 200 <= status < 300:  # noqa: PLR2004
+        msg = f"Vault answered with {status}: {body!r}."
+        raise http.client.HTTPException(msg)
+
+    return json.loads(body)
@@ -0,0 +1,547 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Binary snapshots of loaded configurations.
+
+Loading a configuration can be expensive if it involves reading secret files
+or talking to remote secret stores.  If you have many processes that all need
+the same configuration -- like workers of an application server -- you can
+load it once, `dump` it, and `load` the snapshot in each worker without
+running any getters.
+
+.. warning::
+
+   Snapshots are *pickles*.  Only load snapshots that you've written
+   yourself and keep them where nobody else can write.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import pickle
+import re
+import struct
+import sys
+import tempfile
+
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, TypeVar
+
+import attrs
+
+from ._environ_config import _get_plan, to_config
+from .exceptions import (
+    MissingEnvValueError,
+    MissingSecretImplementationError,
+)
+
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bump if the layout of the snapshot changes.
+FORMAT_VERSION = 1
+
+_MAGIC = b"ENVCFGSNAP"
+# magic, format version, flags, schema hash, length of the config, length of
+# the secrets.
+_HEADER = struct.Struct("!10sBB16sII")
+_FLAG_ENCRYPTED = 1
+# Shared memory segments can be larger than requested, so we prepend the size
+# of the snapshot.
+_SHM_SIZE = struct.Struct("!Q")
+
+
+def schema_hash(config_cls: type) -> bytes:
+    """
+    Compute a hash of the structure of *config_cls*.
+
+    It changes whenever the class -- or one of its groups -- gains or loses
+    attributes, changes names, prefixes, getters, defaults, annotations,
+    converters, or validators.  It also
+    changes with the versions of Python and *attrs*, since the snapshot
+    depends on both.
+
+    Args:
+        config_cls: The configuration class to hash.
+
+    Returns:
+        16 bytes.
+
+    .. versionadded:: 26.2.0
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(
+        repr(
+            (FORMAT_VERSION, sys.version_info[:2], attrs.__version__)
+        ).encode()
+    )
+    _hash_plan(h, _get_plan(config_cls))
+
+    return h.digest()
+
+
+def _hash_plan(h, plan):
+    h.update(
+        repr(
+            (plan.cls.__module__, plan.cls.__qualname__, plan.prefixes)
+        ).encode()
+    )
+    # Include plain attrs attributes, because they're part of the snapshot.
+    # Converters and validators are included, because a snapshot of values
+    # that have been converted differently mustn't be used.
+    h.update(
+        repr(
+            [
+                (
+                    a.name,
+                    _stable_name(a.type),
+                    _stable_name(a.converter),
+                    _stable_name(a.validator),
+                )
+                for a in attrs.fields(plan.cls)
+            ]
+        ).encode()
+    )
+    for fp in plan.fields:
+        if fp.sub is not None:
+            h.update(repr((fp.name, fp.ce.default)).encode())
+            _hash_plan(h, fp.sub)
+            continue
+
+        default = fp.ce.default
+        if isinstance(default, attrs.Factory):
+            default = (_stable_name(default.factory), default.takes_self)
+        elif not isinstance(
+            default, (str, bytes, int, float, bool, type(None))
+        ):
+            # Reprs of arbitrary objects may contain memory addresses.
+            default = type(default).__qualname__
+        h.update(
+            repr(
+                (
+                    fp.name,
+                    fp.ce.name,
+                    default,
+                    getattr(fp.getter, "__qualname__", None),
+                )
+            ).encode()
+        )
+
+
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _stable_name(obj):
+    """
+    Return a name for *obj* -- like a type, a converter, or a validator --
+    that is the same in every process.
+    """
+    if obj is None or isinstance(obj, str):
+        return obj
+
+    qualname = getattr(obj, "__qualname__", None)
+    if qualname is not None:
+        return f"{getattr(obj, '__module__', None)}.{qualname}"
+
+    # Instances like attrs' validators and converters; their reprs contain
+    # their configuration but may also contain memory addresses.
+    return _ADDRESS.sub("", repr(obj))
+
+
+def _secret_ids(inst, plan):
+    """
+    Collect the ids of all values that come from secrets -- in other words:
+    from attributes that use a custom getter.
+    """
+    ids = set()
+    for fp in plan.fields:
+        val = getattr(inst, fp.name)
+        if val is None:
+            continue
+        if fp.sub is not None:
+            ids |= _secret_ids(val, fp.sub)
+        elif fp.ce.callback is not None:
+            ids.add(id(val))
+
+    return ids
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, f, secret_ids):
+        super().__init__(f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._secret_ids = secret_ids
+        self.secrets = []
+
+    def persistent_id(self, obj):
+        if id(obj) not in self._secret_ids:
+            return None
+
+        self.secrets.append(obj)
+
+        return len(self.secrets) - 1
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, f, secrets):
+        super().__init__(f)
+        self._secrets = secrets
+
+    def persistent_load(self, pid):
+        return self._secrets[pid]
+
+
+def _fernet(key_env, environ):
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:  # pragma: no cover
+        msg = "Encrypted snapshots require cryptography"
+        raise MissingSecretImplementationError(msg) from None
+
+    try:
+        return Fernet(environ[key_env])
+    except KeyError:
+        raise MissingEnvValueError(key_env) from None
+
+
+def _decrypt(key_env, environ, data):
+    """
+    Decrypt *data* or return `None` if it's not possible.
+    """
+    from cryptography.fernet import InvalidToken
+
+    try:
+        return _fernet(key_env, environ).decrypt(bytes(data))
+    except (MissingEnvValueError, InvalidToken):
+        return None
+
+
+def dumps(
+    config: Any,
+    *,
+    key_env: str | None = None,
+    environ: dict[str, str] = os.environ,
+) -> bytes:
+    """
+    Like `dump`, but return the snapshot as bytes.
+
+    .. versionadded:: 26.2.0
+    """
+    plan = _get_plan(type(config))
+
+    buf = io.BytesIO()
+    p = _Pickler(buf, _secret_ids(config, plan))
+    p.dump(config)
+    cfg_data = buf.getvalue()
+
+    secrets_data = pickle.dumps(p.secrets, protocol=pickle.HIGHEST_PROTOCOL)
+    flags = 0
+    if key_env is not None:
+        secrets_data = _fernet(key_env, environ).encrypt(secrets_data)
+        flags |= _FLAG_ENCRYPTED
+
+    return (
+        _HEADER.pack(
+            _MAGIC,
+            FORMAT_VERSION,
+            flags,
+            schema_hash(type(config)),
+            len(cfg_data),
+            len(secrets_data),
+        )
+        + cfg_data
+        + secrets_data
+    )
+
+
+def dump(
+    config: Any,
+    path: str | Path,
+    *,
+    key_env: str | None = None,
+    environ: dict[str, str] = os.environ,
+) -> None:
+    """
+    Write a binary snapshot of *config* -- an instance of an
+    `environ.config`-decorated class -- to *path*.
+
+    The file is replaced atomically and only readable by the current user.
+
+    The config class must be importable.
+
+    Args:
+        config: The loaded configuration.
+
+        path: Where to write the snapshot to.
+
+        key_env:
+            If set, the values of all secrets are encrypted using the
+            `Fernet <https://cryptography.io/en/latest/fernet/>`_ key in the
+            environment variable of this name.  Requires *cryptography*.
+
+            Without it, secrets are stored in **plain text**.
+
+        environ: Where to look up *key_env*.
+
+    Raises:
+        environ.MissingEnvValueError: If *key_env* is not set.
+
+    .. versionadded:: 26.2.0
+    """
+    data = dumps(config, key_env=key_env, environ=environ)
+
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        try:
+            f = os.fdopen(fd, "wb")
+        except BaseException:
+            os.close(fd)
+            raise
+        with f:
+            f.write(data)
+        Path(tmp).replace(path)
+    except BaseException:
+        Path(tmp).unlink()
+        raise
+
+
+def _loads(config_cls, data, key_env, environ):
+    """
+    Rehydrate *data* or return `None` if it's not usable.
+    """
+    if len(data) < _HEADER.size or data[: len(_MAGIC)] != _MAGIC:
+        log.debug("not a snapshot.")
+        return None
+
+    _, version, flags, schema, cfg_len, secrets_len = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION or schema != schema_hash(config_cls):
+        log.debug("snapshot for '%s' is outdated.", config_cls.__name__)
+        return None
+
+    start = _HEADER.size
+    cfg_data = data[start : start + cfg_len]
+    secrets_data = data[start + cfg_len : start + cfg_len + secrets_len]
+
+    if flags & _FLAG_ENCRYPTED:
+        if key_env is None:
+            log.debug("snapshot is encrypted, but no key_env passed.")
+            return None
+
+        secrets_data = _decrypt(key_env, environ, secrets_data)
+        if secrets_data is None:
+            log.debug("can't decrypt snapshot secrets.")
+            return None
+
+    secrets = pickle.loads(secrets_data)  # noqa: S301
+    config = _Unpickler(io.BytesIO(cfg_data), secrets).load()
+    if type(config) is not config_cls:
+        log.debug("snapshot contains a different class.")
+        return None
+
+    return config
+
+
+def loads(
+    config_cls: type[T],
+    data: bytes,
+    *,
+    key_env: str | None = None,
+    environ: dict[str, str] = os.environ,
+) -> T:
+    """
+    Like `load`, but take the snapshot from *data*.
+
+    .. versionadded:: 26.2.0
+    """
+    config = _loads(config_cls, data, key_env, environ)
+    if config is None:
+        return to_config(config_cls, environ)
+
+    return config
+
+
+def load(
+    config_cls: type[T],
+    path: str | Path,
+    *,
+    key_env: str | None = None,
+    environ: dict[str, str] = os.environ,
+) -> T:
+    """
+    Load an instance of *config_cls* from the snapshot at *path* without
+    running any getters, converters, or validators.
+
+    If the snapshot can't be used -- because it's missing, has been written
+    for a different version of the class (as determined by `schema_hash`), or
+    the secrets can't be decrypted -- fall back to loading the configuration
+    from *environ* using `environ.to_config`.
+
+    Args:
+        config_cls: The configuration class of the snapshot.
+
+        path: Where to read the snapshot from.
+
+        key_env:
+            The environment variable containing the key that has been passed
+            to `dump`.
+
+        environ:
+            Where to look up *key_env* and source of the configuration if the
+            snapshot can't be used.
+
+    Returns:
+        An instance of *config_cls*.
+
+    .. versionadded:: 26.2.0
+    """
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        log.debug("can't read snapshot '%s'.", path)
+        return to_config(config_cls, environ)
+
+    return loads(config_cls, data, key_env=key_env, environ=environ)
+
+
+def _is_frozen(plan):
+    return plan.cls._frozen and all(
+        _is_frozen(fp.sub) for fp in plan.fields if fp.sub is not None
+    )
+
+
+def publish(
+    config_cls: type[T],
+    environ: dict[str, str] = os.environ,
+    *,
+    name: str | None = None,
+    key_env: str | None = None,
+) -> tuple[T, SharedMemory]:
+    """
+    Load *config_cls* from *environ* and publish a snapshot of it into a new
+    `multiprocessing.shared_memory.SharedMemory` segment, so workers can
+    `attach` to it.
+
+    Do this once in the master process of a pre-forking server, pass the
+    segment's name to the workers -- for example, using an environment
+    variable -- and `close <multiprocessing.shared_memory.SharedMemory.close>`
+    and `unlink <multiprocessing.shared_memory.SharedMemory.unlink>` it on
+    shutdown.
+
+    Since all workers share the configuration, *config_cls* and all of its
+    groups must be frozen (``@environ.config(frozen=True)``).
+
+    Args:
+        config_cls: The configuration class to load.
+
+        environ: Source of the configuration.
+
+        name:
+            The name of the shared memory segment.  A random one is chosen by
+            default.
+
+        key_env: See `dump`.
+
+    Returns:
+        The loaded configuration and the shared memory segment.
+
+    Raises:
+        TypeError: If *config_cls* or one of its groups is not frozen.
+
+    .. versionadded:: 26.2.0
+    """
+    if not _is_frozen(_get_plan(config_cls)):
+        msg = f"{config_cls.__name__} and all its groups must be frozen."
+        raise TypeError(msg)
+
+    config = to_config(config_cls, environ)
+    data = dumps(config, key_env=key_env, environ=environ)
+
+    shm = SharedMemory(name=name, create=True, size=_SHM_SIZE.size + len(data))
+    _SHM_SIZE.pack_into(shm.buf, 0, len(data))
+    shm.buf[_SHM_SIZE.size : _SHM_SIZE.size + len(data)] = data
+
+    return config, shm
+
+
+def _open_shm(name):
+    """
+    Open an existing shared memory segment without taking ownership of it.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    # Before 3.13, attaching registers the segment with the resource tracker.
+    # That's harmless as long as it's shared with the master -- which is the
+    # case if the worker has been forked or started by multiprocessing.
+    return SharedMemory(name=name)
+
+
+def attach(
+    config_cls: type[T],
+    name: str,
+    *,
+    key_env: str | None = None,
+    environ: dict[str, str] = os.environ,
+) -> T:
+    """
+    Load an instance of *config_cls* from the shared memory segment *name*
+    that has been created using `publish`.
+
+    The segment is only read and never modified or unlinked.  If it can't be
+    used, the configuration is loaded from *environ* like in `load`.
+
+    .. note::
+
+       Before Python 3.13, the worker must be forked from the master or
+       started using `multiprocessing`.  Otherwise, Python's resource tracker
+       unlinks the segment once the worker exits.
+
+    Args:
+        config_cls: The configuration class of the snapshot.
+
+        name: The name of the shared memory segment.
+
+        key_env: See `load`.
+
+        environ: See `load`.
+
+    Returns:
+        An instance of *config_cls*.
+
+    .. versionadded:: 26.2.0
+    """
+    try:
+        shm = _open_shm(name)
+    except OSError:
+        log.debug("can't open shared memory '%s'.", name)
+        return to_config(config_cls, environ)
+
+    try:
+        buf = shm.buf.toreadonly()
+        (size,) = _SHM_SIZE.unpack_from(buf)
+        data = bytes(buf[_SHM_SIZE.size : _SHM_SIZE.size + size])
+        buf.release()
+    finally:
+        shm.close()
+
+    return loads(config_cls, data, key_env=key_env, environ=environ)
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generate config classes of arbitrary size and shape together with matching
+environments for benchmarks and tests.
+"""
+
+from __future__ import annotations
+
+import random
+
+from typing import Any
+
+import attrs
+
+from environ import config, group, var
+from environ.secrets import VaultEnvSecrets
+
+
+_VAULT = VaultEnvSecrets(vault_prefix="SECRET")
+
+
+@attrs.frozen
+class Synthetic:
+    """
+    A generated config class and what loading it must result in.
+
+    Attributes:
+        cls: The config class.
+
+        environ: An environment to load *cls* from.
+
+        expected: The config that loading *cls* from *environ* results in.
+
+        help_vars:
+            The variables that `environ.generate_help` lists for *cls*, in
+            order.
+    """
+
+    cls: type
+    environ: dict[str, str]
+    expected: Any
+    help_vars: list[str]
+
+
+def generate(
+    fields: int = 10,
+    *,
+    depth: int = 1,
+    optional: float = 0.0,
+    secrets: float = 0.0,
+    converters: float = 0.0,
+    seed: int = 0,
+) -> Synthetic:
+    """
+    Generate a config class with *fields* attributes that are spread evenly
+    over *depth* classes nested into each other.
+
+    Args:
+        fields: The total number of attributes.
+
+        depth: How many classes are nested into each other.
+
+        optional:
+            The fraction of classes whose attributes are moved into an
+            optional group.  Half of those groups are left out of the
+            environment.
+
+        secrets:
+            The fraction of attributes that are secrets from the environment
+            instead of variables.
+
+        converters: The fraction of attributes that are converted to `int`.
+
+        seed: Seed for the choices above, so generating is repeatable.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    environ: dict[str, str] = {}
+    help_vars = []
+    levels = []
+    for level in range(depth):
+        n = fields // depth + (level < fields % depth)
+        in_optional = n > 0 and rng.random() < optional
+        left_out = in_optional and bool(rng.getrandbits(1))
+        path = "_G" * level + ("_O" if in_optional else "")
+        attributes = []
+        for i in range(n):
+            name = f"f{i}"
+            is_secret = rng.random() < secrets
+            is_converted = rng.random() < converters
+            value = str(len(help_vars)) if is_converted else f"v{path}{name}"
+            help_vars.append(f"APP{path}_{name}".upper())
+            if not left_out:
+                prefix = "SECRET" if is_secret else "APP"
+                environ[f"{prefix}{path}_{name}".upper()] = value
+
+            attributes.append((name, is_secret, is_converted, value))
+
+        levels.append((attributes, in_optional, left_out))
+
+    # The classes are built bottom-up, since groups need their classes.
+    cls = expected = None
+    for level, (attributes, in_optional, left_out) in reversed(
+        list(enumerate(levels))
+    ):
+        body: dict[str, Any] = {}
+        values: dict[str, Any] = {}
+        for name, is_secret, is_converted, value in attributes:
+            kw = {"converter": int} if is_converted else {}
+            body[name] = _VAULT.secret(**kw) if is_secret else var(**kw)
+            values[name] = int(value) if is_converted else value
+
+        if in_optional:
+            opt = config(type(f"Optional{level}", (), body))
+            body = {"o": group(opt, optional=True)}
+            values = {"o": None if left_out else opt(**values)}
+
+        if cls is not None:
+            body["g"] = group(cls)
+            values["g"] = expected
+
+        cls = type(f"Level{level}", (), body)
+        cls = config(prefix="APP")(cls) if level == 0 else config(cls)
+        expected = cls(**values)
+
+    return Synthetic(cls, environ, expected, help_vars)
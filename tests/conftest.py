@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import environ
+
+
+@pytest.fixture(name="registry")
+def _registry():
+    """
+    Report metrics into a fresh registry for the duration of the test.
+    """
+    yield environ.metrics.enable()
+
+    environ.metrics.disable()
+
+
+@pytest.fixture(name="serve_in_thread")
+def _serve_in_thread():
+    """
+    Return a function that runs the ``serve_forever()`` of a server on a
+    daemon thread and returns the server.
+    """
+
+    def serve_in_thread(server):
+        # A short poll interval keeps shutdown() from waiting half a second.
+        threading.Thread(
+            target=server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        ).start()
+
+        return server
+
+    return serve_in_thread
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # Join handler threads on close, so their sockets are closed, too.
+    daemon_threads = False
+
+
+@pytest.fixture(name="http_server")
+def _http_server(serve_in_thread):
+    """
+    Return a function that serves a request handler class on a free local
+    port and returns the server.
+
+    Handlers can record client addresses in the server's *connections*.  The
+    servers are shut down after the test.
+    """
+    servers = []
+
+    def http_server(handler):
+        server = _HTTPServer(("localhost", 0), handler)
+        server.connections = set()
+        servers.append(server)
+
+        return serve_in_thread(server)
+
+    yield http_server
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
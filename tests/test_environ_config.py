@@ -14,6 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 import attrs
 import pytest
 
@@ -21,6 +26,31 @@ from attrs.exceptions import FrozenInstanceError
 
 import environ
 
+from environ._environ_config import CNF_KEY, _ConfigEntry
+from environ.secrets._utils import _SecretStr
+
+from ._synthetic import generate
+
+
+@environ.config(prefix="APP")
+class OptionalTree:
+    @environ.config
+    class Outer:
+        @environ.config
+        class Inner:
+            y = environ.var()
+
+        x = environ.var()
+        inner = environ.group(Inner, optional=True)
+
+    @environ.config
+    class Leaf:
+        z = environ.var()
+        d = environ.var("d")
+
+    outer = environ.group(Outer, optional=True)
+    leaf = environ.group(Leaf, optional=True)
+
 
 @environ.config(prefix="XYZ")
 class Nested:
@@ -36,6 +66,11 @@ class Nested:
     sub = environ.group(Sub)
 
 
+@environ.config(prefix="APP")
+class Flat:
+    x = environ.var()
+
+
 @environ.config(prefix="FOO")
 class Parent:
     not_a_var = (
@@ -490,3 +525,645 @@ _START_WITH_UNDERSCORE (Required): this starts with an underscore"""
             WithOptionalGrandChild, {"PARENT_CHILD_GRANDCHILD_FOO": "BAR"}
         )
         assert cfg.child.grandchild.foo == "BAR"
+
+    @pytest.mark.parametrize(
+        ("env", "expected"),
+        [
+            # The defaulted inner group counts as a value of outer.
+            ({}, environ.MissingEnvValueError("APP_OUTER_X")),
+            (
+                {"APP_OUTER_INNER_Y": "y"},
+                environ.MissingEnvValueError("APP_OUTER_X"),
+            ),
+            (
+                {"APP_OUTER_X": "x"},
+                OptionalTree(OptionalTree.Outer("x", None), None),
+            ),
+            (
+                {"APP_OUTER_X": "x", "APP_OUTER_INNER_Y": "y"},
+                OptionalTree(
+                    OptionalTree.Outer("x", OptionalTree.Outer.Inner("y")),
+                    None,
+                ),
+            ),
+            (
+                {"APP_OUTER_X": "x", "APP_LEAF_Z": "z"},
+                OptionalTree(
+                    OptionalTree.Outer("x", None),
+                    OptionalTree.Leaf("z", "d"),
+                ),
+            ),
+            # Defaults don't count as values, but present ones do.
+            (
+                {"APP_OUTER_X": "x", "APP_LEAF_D": "e"},
+                environ.MissingEnvValueError("APP_LEAF_Z"),
+            ),
+        ],
+    )
+    def test_optional_tree(self, env, expected):
+        """
+        Nested optional groups are loaded depth-first: a group is done once
+        all its attributes are, and only then its parent decides whether it
+        got any values.
+        """
+        if isinstance(expected, Exception):
+            with pytest.raises(type(expected)) as ei:
+                environ.to_config(OptionalTree, env)
+
+            assert expected.args == ei.value.args
+        else:
+            assert expected == environ.to_config(OptionalTree, env)
+
+    def test_deep_nesting(self):
+        """
+        Nesting depth isn't limited by the recursion limit.
+        """
+        syn = generate(2000, depth=2000, optional=0.1, seed=1)
+
+        cfg = environ.to_config(syn.cls, syn.environ)
+        expected = syn.expected
+
+        def shallow(inst):
+            return attrs.asdict(
+                inst, recurse=False, filter=lambda a, _: a.name != "g"
+            )
+
+        # Compare level by level since the generated __eq__ recurses.
+        while expected is not None:
+            assert type(expected) is type(cfg)
+            assert shallow(expected) == shallow(cfg)
+            expected, cfg = (
+                getattr(expected, "g", None),
+                getattr(cfg, "g", None),
+            )
+
+        assert cfg is None
+        assert syn.help_vars == [
+            line.split(" ", 1)[0]
+            for line in environ.generate_help(syn.cls).splitlines()
+        ]
+
+
+@environ.config(prefix="TENANT")
+class Tenant:
+    @environ.config
+    class DB:
+        host = environ.var("localhost")
+
+    name = environ.var()
+    db = environ.group(DB)
+
+
+class TestToConfigMany:
+    def test_loads_in_order(self):
+        """
+        One instance per environment is yielded lazily and in order.
+        """
+        rv = environ.to_config_many(
+            Tenant,
+            [
+                {"TENANT_NAME": "a"},
+                {"TENANT_NAME": "b", "TENANT_DB_HOST": "h"},
+            ],
+        )
+
+        assert not isinstance(rv, list)
+        assert [
+            Tenant("a", Tenant.DB("localhost")),
+            Tenant("b", Tenant.DB("h")),
+        ] == list(rv)
+
+    def test_errors_do_not_abort(self):
+        """
+        Failing items yield their exception and the batch goes on.
+        """
+        a, err, b = environ.to_config_many(
+            Tenant, [{"TENANT_NAME": "a"}, {}, {"TENANT_NAME": "b"}]
+        )
+
+        assert "a" == a.name
+        assert isinstance(err, environ.MissingEnvValueError)
+        assert ("TENANT_NAME",) == err.args
+        assert "b" == b.name
+
+    def test_plans_once(self):
+        """
+        The plan is computed once and reused, but not inherited by subclasses.
+        """
+        environ.to_config(Tenant, {"TENANT_NAME": "a"})
+        plan = Tenant._environ_plan
+
+        list(environ.to_config_many(Tenant, [{"TENANT_NAME": "b"}] * 3))
+
+        assert plan is Tenant._environ_plan
+
+        @environ.config(prefix="SUB")
+        class SubTenant(Tenant):
+            pass
+
+        assert environ.to_config(SubTenant, {"SUB_NAME": "c"}).name == "c"
+        assert plan is not SubTenant._environ_plan
+
+    def test_executor(self):
+        """
+        If an executor is passed, it's used for loading.
+        """
+        with ThreadPoolExecutor(2) as ex:
+            rv = list(
+                environ.to_config_many(
+                    Tenant,
+                    [{"TENANT_NAME": str(i)} for i in range(5)] + [{}],
+                    executor=ex,
+                )
+            )
+
+        assert ["0", "1", "2", "3", "4"] == [c.name for c in rv[:-1]]
+        assert isinstance(rv[-1], environ.MissingEnvValueError)
+
+
+@environ.config(prefix="TENANT", frozen=True)
+class FrozenTenant:
+    @environ.config(frozen=True)
+    class Logging:
+        level = environ.var("INFO")
+        fmt = environ.var("json")
+
+    @environ.config(frozen=True)
+    class Pool:
+        size = environ.var("10", converter=int)
+        timeout = environ.var("30", converter=float)
+
+    name = environ.var()
+    logging = environ.group(Logging)
+    pool = environ.group(Pool)
+
+
+def _tenant_envs(n):
+    for i in range(n):
+        yield {
+            "TENANT_NAME": f"tenant-{i}",
+            "TENANT_LOGGING_LEVEL": "".join(list("DEBUG")),
+            "TENANT_POOL_SIZE": "20",
+        }
+
+
+class TestInterning:
+    def test_shares_groups_and_strings(self):
+        """
+        Equal frozen groups and equal strings are the same objects.
+        """
+        a, b = environ.to_config_many(
+            FrozenTenant, _tenant_envs(2), intern=True
+        )
+
+        assert a.logging is b.logging
+        assert a.pool is b.pool
+        assert a.name != b.name
+
+        c, d = environ.to_config_many(FrozenTenant, _tenant_envs(2))
+
+        assert c.logging == d.logging
+        assert c.logging is not d.logging
+        assert c.logging.level is not d.logging.level
+
+    def test_mutable_groups_are_not_shared(self):
+        """
+        Unhashable groups are not shared, but their strings are.
+        """
+        a, b = environ.to_config_many(
+            Tenant,
+            [{"TENANT_NAME": "".join(list("xy"))} for _ in range(2)],
+            intern=True,
+        )
+
+        assert a.db == b.db
+        assert a.db is not b.db
+        assert a.name is b.name
+
+    def test_secret_strs(self):
+        """
+        Secret strings are shared without losing their type.
+        """
+        vault = environ.secrets.VaultEnvSecrets("V")
+
+        @environ.config
+        class Cfg:
+            pw = vault.secret()
+            user = environ.var()
+
+        a, b = environ.to_config_many(
+            Cfg,
+            [
+                {"V_PW": "".join(list("pw")), "APP_USER": "pw"}
+                for _ in range(2)
+            ],
+            intern=True,
+        )
+
+        assert a.pw is b.pw
+        assert isinstance(a.pw, _SecretStr)
+        assert type(a.user) is str
+
+    def test_non_strings(self):
+        """
+        Values that aren't strings are left alone.
+        """
+        sentinel = object()
+
+        @environ.config
+        class Cfg:
+            x = environ.var()
+
+        (cfg,) = environ.to_config_many(
+            Cfg, [{"APP_X": sentinel}], intern=True
+        )
+
+        assert sentinel is cfg.x
+
+
+@environ.config(frozen=True, cache_hash=True)
+class CachedHash:
+    @environ.config(frozen=True, cache_hash=True)
+    class Sub:
+        y = environ.var()
+
+    x = environ.var()
+    sub = environ.group(Sub)
+
+
+class TestCacheHash:
+    def test_hash_is_cached(self):
+        """
+        The hash is computed only once, even for nested groups.
+        """
+        cfg = environ.to_config(CachedHash, {"APP_X": "x", "APP_SUB_Y": "y"})
+        h = hash(cfg)
+
+        with patch.object(
+            CachedHash.Sub, "__hash__", side_effect=AssertionError
+        ):
+            assert h == hash(cfg)
+
+        assert {cfg: 42}[
+            environ.to_config(CachedHash, {"APP_X": "x", "APP_SUB_Y": "y"})
+        ] == 42
+
+    def test_eq(self):
+        """
+        Equality works as before.
+        """
+        env = {"APP_X": "x", "APP_SUB_Y": "y"}
+        a = environ.to_config(CachedHash, env)
+        b = environ.to_config(CachedHash, env)
+        c = environ.to_config(CachedHash, {**env, "APP_SUB_Y": "z"})
+
+        same = a
+
+        assert a == same
+        assert a == b
+        assert a != c
+        assert a != object()
+
+    def test_eq_identity_fast_path(self):
+        """
+        Identical objects are equal without comparing fields and objects with
+        different hashes are unequal without comparing fields.
+        """
+
+        class Exploding(str):
+            __slots__ = ()
+
+            def __eq__(self, other):
+                raise AssertionError
+
+            __hash__ = str.__hash__
+
+        a = CachedHash(Exploding("x"), CachedHash.Sub("y"))
+        same = a
+
+        assert a == same
+        assert a != CachedHash(Exploding("x2"), a.sub)
+
+    def test_unhashable_values_fall_back(self):
+        """
+        If a frozen config contains unhashable values, comparison still works.
+        """
+
+        @environ.config(frozen=True, cache_hash=True)
+        class Cfg:
+            x = environ.var(attrs.Factory(list))
+
+        assert Cfg() == Cfg()
+        assert Cfg([1]) != Cfg([2])
+
+    def test_needs_frozen(self):
+        """
+        cache_hash requires a hashable -- in practice frozen -- class.
+        """
+        with pytest.raises(TypeError):
+
+            @environ.config(cache_hash=True)
+            class Cfg:
+                x = environ.var()
+
+
+class TestPrefetch:
+    def test_consumed_once(self):
+        """
+        Prefetched values are used once by from_environ, on the next load the
+        getters run again.
+        """
+        calls = []
+
+        def getter(environ, metadata, prefix, name):
+            calls.append(threading.current_thread().name)
+            return environ["X"]
+
+        @environ.config
+        class Cfg:
+            x = attrs.field(
+                metadata={CNF_KEY: _ConfigEntry(callback=getter)},
+                converter=int,
+            )
+
+        env = {"X": "42"}
+        fut = environ.prefetch(Cfg, env)
+
+        assert fut.result(timeout=5) is None
+        assert ["environ-prefetch-Cfg"] == calls
+
+        env["X"] = "23"
+
+        assert 42 == Cfg.from_environ(env).x
+        assert 1 == len(calls)
+        assert 23 == Cfg.from_environ(env).x
+        assert 2 == len(calls)
+
+    def test_different_environ(self):
+        """
+        Prefetched values for a different environment are discarded.
+        """
+        env = {"APP_X": "prefetched"}
+        environ.prefetch(Flat, env).result(timeout=5)
+
+        assert "other" == Flat.from_environ({"APP_X": "other"}).x
+
+        env["APP_X"] = "changed"
+
+        assert "changed" == environ.to_config(Flat, env).x
+
+    def test_missing(self):
+        """
+        Missing values are raised or defaulted at load time.
+        """
+        env = {}
+        environ.prefetch(Parent, env)
+
+        with pytest.raises(environ.MissingEnvValueError) as ei:
+            environ.to_config(Parent, env)
+
+        with pytest.raises(environ.MissingEnvValueError) as ei_normal:
+            environ.to_config(Parent, env)
+
+        assert ei_normal.value.args
+        assert set(ei_normal.value.args) == set(ei.value.args)
+
+    def test_optional_group_and_defaults(self):
+        """
+        Prefetched loads handle defaults and optional groups like normal ones.
+        """
+
+        @environ.config(prefix="PARENT")
+        class WithOptionalChild:
+            @environ.config(prefix="CHILD")
+            class Child:
+                grandchild_a = environ.var()
+                grandchild_b = environ.var("FOO")
+
+            child = environ.group(Child, optional=True)
+            x = environ.var("x")
+
+        env = {}
+        environ.prefetch(WithOptionalChild, env)
+        cfg = environ.to_config(WithOptionalChild, env)
+
+        assert WithOptionalChild(None, "x") == cfg
+
+    def test_getter_exceptions(self):
+        """
+        Arbitrary exceptions from getters are raised at load time.
+        """
+
+        def getter(environ, metadata, prefix, name):
+            raise ValueError("boom")
+
+        @environ.config
+        class Cfg:
+            x = attrs.field(metadata={CNF_KEY: _ConfigEntry(callback=getter)})
+
+        env = {}
+        environ.prefetch(Cfg, env).result(timeout=5)
+
+        with pytest.raises(ValueError, match="boom"):
+            Cfg.from_environ(env)
+
+
+def _custom(getter):
+    """
+    Return a config attribute that uses *getter*.
+    """
+    return attrs.field(
+        default=environ._environ_config.RAISE,
+        metadata={CNF_KEY: _ConfigEntry(callback=getter)},
+    )
+
+
+def _blocking_secret(event, value):
+    """
+    Return a config attribute whose getter blocks until *event* is set.
+    """
+
+    def getter(environ, metadata, prefix, name):
+        event.wait()
+        return value
+
+    return _custom(getter)
+
+
+class TestTimeout:
+    def test_within_timeout(self):
+        """
+        If all getters finish in time, the config is loaded like without a
+        timeout.
+        """
+        env = {"XYZ_X": "foo", "XYZ_SUB_Y": "bar"}
+
+        assert Nested(x="foo", sub=Nested.Sub(y="bar")) == environ.to_config(
+            Nested, env, timeout=5
+        )
+
+    def test_getters_run_concurrently(self):
+        """
+        Getters don't wait for each other.
+        """
+        barrier = threading.Barrier(3, timeout=5)
+
+        def getter(environ, metadata, prefix, name):
+            barrier.wait()
+            return name
+
+        @environ.config
+        class Cfg:
+            x = _custom(getter)
+            y = _custom(getter)
+            z = _custom(getter)
+
+        assert Cfg("x", "y", "z") == Cfg.from_environ({}, timeout=5)
+
+    def test_timeout(self):
+        """
+        Getters that don't finish in time cause a LoadTimeoutError naming
+        their attributes.
+        """
+        event = threading.Event()
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                password = _blocking_secret(event, "pw")
+
+            x = environ.var()
+            db = environ.group(DB)
+
+        try:
+            with pytest.raises(environ.LoadTimeoutError) as ei:
+                environ.to_config(Cfg, {"APP_X": "x"}, timeout=0.05)
+        finally:
+            event.set()
+
+        assert ("db.password",) == ei.value.args
+
+    def test_missing(self):
+        """
+        Missing values are still reported as such.
+        """
+        with pytest.raises(environ.MissingEnvValueError) as ei:
+            environ.to_config(Flat, {}, timeout=5)
+
+        assert ("APP_X",) == ei.value.args
+
+    def test_fallback(self):
+        """
+        If fallback is True, the last known good values are used for getters
+        that time out.
+        """
+        event = threading.Event()
+        value = ["first"]
+
+        def getter(environ, metadata, prefix, name):
+            if value[0] != "first":
+                event.wait()
+            return value[0]
+
+        def make():
+            @environ.config
+            class Cfg:
+                x = environ.var()
+                pw = _custom(getter)
+
+            return Cfg
+
+        cfg_cls = make()
+        try:
+            assert cfg_cls("x", "first") == environ.to_config(
+                cfg_cls, {"APP_X": "x"}, timeout=5
+            )
+
+            value[0] = "second"
+
+            # No known good values yet.
+            with pytest.raises(environ.LoadTimeoutError):
+                environ.to_config(
+                    make(), {"APP_X": "x"}, timeout=0.05, fallback=True
+                )
+
+            assert cfg_cls("y", "first") == environ.to_config(
+                cfg_cls, {"APP_X": "y"}, timeout=0.05, fallback=True
+            )
+
+            with pytest.raises(environ.LoadTimeoutError):
+                environ.to_config(cfg_cls, {"APP_X": "y"}, timeout=0.05)
+        finally:
+            event.set()
+
+    def test_hanging_getters_skipped(self):
+        """
+        Getters that still hang since an earlier load aren't called again,
+        but other getters are.
+        """
+        event = threading.Event()
+        calls = []
+
+        def getter(environ, metadata, prefix, name):
+            calls.append(name)
+            event.wait()
+            return name
+
+        @environ.config
+        class Cfg:
+            x = environ.var()
+            pw = _custom(getter)
+
+        try:
+            for x in ("x", "y"):
+                with pytest.raises(environ.LoadTimeoutError):
+                    environ.to_config(Cfg, {"APP_X": x}, timeout=0.05)
+        finally:
+            event.set()
+
+        assert ["pw"] == calls
+
+    def test_threads_reused(self):
+        """
+        Getters run on a bounded pool of threads that are reused across
+        loads.
+        """
+
+        def threads():
+            return sum(
+                t.name == "environ-getter" for t in threading.enumerate()
+            )
+
+        environ.to_config(Nested, {"XYZ_X": "x", "XYZ_SUB_Y": "y"}, timeout=5)
+        before = threads()
+        for _ in range(10):
+            environ.to_config(
+                Nested, {"XYZ_X": "x", "XYZ_SUB_Y": "y"}, timeout=5
+            )
+
+        assert before == threads()
+        assert before <= environ._environ_config._MAX_WORKERS
+
+    def test_prefetch(self):
+        """
+        Waiting for a prefetch respects the timeout, but uses the values that
+        have been prefetched so far.
+        """
+        event = threading.Event()
+
+        @environ.config
+        class Cfg:
+            x = environ.var()
+            pw = _blocking_secret(event, "pw")
+
+        env = {"APP_X": "x"}
+        environ.prefetch(Cfg, env)
+
+        try:
+            with pytest.raises(environ.LoadTimeoutError) as ei:
+                environ.to_config(Cfg, env, timeout=0.05)
+        finally:
+            event.set()
+
+        assert ("pw",) == ei.value.args
@@ -0,0 +1,304 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from unittest.mock import patch
+
+import attrs
+import pytest
+
+import environ
+
+from environ import _instrument
+from environ._environ_config import CNF_KEY, _ConfigEntry, _per_load
+from environ._instrument import _backend
+from environ.exceptions import MissingSecretError
+from environ.secrets import VaultEnvSecrets
+
+
+vault = VaultEnvSecrets(vault_prefix=lambda env: env["VP"])
+
+
+@environ.config(prefix="APP")
+class Cfg:
+    @environ.config
+    class DB:
+        host = environ.var("localhost")
+        pw = vault.secret()
+
+    @environ.config
+    class Opt:
+        x = environ.var()
+
+    name = environ.var()
+    db = environ.group(DB)
+    opt = environ.group(Opt, optional=True)
+    token = vault.secret()
+
+
+ENV = {"VP": "S", "APP_NAME": "n", "S_DB_PW": "pw", "S_TOKEN": "t"}
+
+
+@pytest.fixture(name="events")
+def _events():
+    events = {"field": [], "group": [], "load": []}
+    remove = environ.instrument(
+        on_field=events["field"].append,
+        on_group=events["group"].append,
+        on_load=events["load"].append,
+    )
+
+    yield events
+
+    remove()
+
+
+class TestInstrument:
+    def test_fields(self, events):
+        """
+        Each attribute causes a FieldEvent with what has been looked up where
+        and how.
+        """
+        environ.to_config(Cfg, ENV)
+
+        fields = {e.path: e for e in events["field"]}
+
+        assert ["name", "db.host", "db.pw", "opt.x", "token"] == list(fields)
+        assert ("APP_NAME", "env", None, False) == (
+            fields["name"].var,
+            fields["name"].backend,
+            fields["name"].cache_hit,
+            fields["name"].defaulted,
+        )
+        assert fields["db.host"].defaulted
+        assert ("S_DB_PW", "VaultEnvSecrets", None) == (
+            fields["db.pw"].var,
+            fields["db.pw"].backend,
+            fields["db.pw"].cache_hit,
+        )
+        # Sharing the resolved vault prefix doesn't make the value cached.
+        assert fields["token"].cache_hit is None
+        assert all(e.duration >= 0 for e in events["field"])
+
+    def test_timeout(self, events):
+        """
+        Values that are resolved concurrently because of a timeout are
+        reported like values that are looked up while loading.
+        """
+        environ.to_config(Cfg, ENV, timeout=5)
+
+        fields = {e.path: e for e in events["field"]}
+
+        assert ("S_DB_PW", None) == (
+            fields["db.pw"].var,
+            fields["db.pw"].cache_hit,
+        )
+        assert fields["token"].cache_hit is None
+        assert all(e.duration >= 0 for e in events["field"])
+
+    def test_groups(self, events):
+        """
+        Each config class causes a GroupEvent -- including the top-level one
+        and defaulted ones.
+        """
+        environ.to_config(Cfg, ENV)
+
+        groups = {e.path: e for e in events["group"]}
+
+        assert [("db", Cfg.DB), ("opt", Cfg.Opt), ("", Cfg)] == [
+            (e.path, e.cls) for e in events["group"]
+        ]
+        assert groups["opt"].defaulted
+        assert 0.0 == groups["opt"].init_duration
+        assert not groups[""].defaulted
+        assert groups[""].duration >= groups["db"].duration
+        assert groups[""].duration >= groups[""].init_duration >= 0
+
+    def test_shared_lookup(self, events):
+        """
+        Getters that share a value using _per_load() are cache hits after the
+        first one, unless they tell not to note it.
+        """
+
+        def getter(environ, metadata, prefix, name):
+            _per_load("k", dict)
+            _per_load("helper", dict, note=False)
+
+        def helper_only(environ, metadata, prefix, name):
+            _per_load("helper", dict, note=False)
+
+        @environ.config
+        class Shared:
+            a = attrs.field(metadata={CNF_KEY: _ConfigEntry(callback=getter)})
+            b = attrs.field(metadata={CNF_KEY: _ConfigEntry(callback=getter)})
+            c = attrs.field(
+                metadata={CNF_KEY: _ConfigEntry(callback=helper_only)}
+            )
+
+        environ.to_config(Shared, {})
+
+        assert [False, True, None] == [e.cache_hit for e in events["field"]]
+
+    def test_load(self, events):
+        """
+        Each load causes a LoadEvent -- also if it fails.
+        """
+        environ.to_config(Cfg, ENV)
+
+        env = dict(ENV)
+        del env["APP_NAME"]
+
+        with pytest.raises(environ.MissingEnvValueError):
+            Cfg.from_environ(env)
+
+        ok, failed = events["load"]
+
+        assert (Cfg, None) == (ok.cls, ok.exception)
+        assert isinstance(failed.exception, environ.MissingEnvValueError)
+        assert ok.duration >= 0
+
+    def test_many(self, events):
+        """
+        to_config_many() is instrumented, too.
+        """
+        env = dict(ENV)
+        del env["S_TOKEN"]
+
+        _, failed = environ.to_config_many(Cfg, [ENV, env])
+
+        assert isinstance(failed, MissingSecretError)
+        assert [None, failed] == [e.exception for e in events["load"]]
+
+    def test_prefetched(self, events):
+        """
+        Prefetched values are cache hits without a duration -- also if the
+        load has a timeout.
+        """
+        environ.prefetch(Cfg, ENV).result()
+        environ.to_config(Cfg, ENV)
+        environ.prefetch(Cfg, ENV).result()
+        environ.to_config(Cfg, ENV, timeout=5)
+
+        assert 10 == len(events["field"])
+        assert all(
+            e.cache_hit and e.duration is None and e.var is None
+            for e in events["field"]
+        )
+
+    def test_only_some_hooks(self):
+        """
+        Hooks that aren't passed are skipped.
+        """
+        loads = []
+        remove = environ.instrument(on_load=loads.append)
+
+        environ.to_config(Cfg, ENV)
+        remove()
+
+        assert 1 == len(loads)
+
+    def test_remove(self, events):
+        """
+        Removed hooks aren't called anymore and other hooks stay.
+        """
+        loads = []
+        environ.instrument(on_load=loads.append)()
+
+        environ.to_config(Cfg, ENV)
+
+        assert [] == loads
+        assert 1 == len(events["load"])
+        assert 1 == len(_instrument._hooks)
+
+    def test_hook_errors_propagate(self):
+        """
+        Exceptions from hooks are not caught.
+        """
+
+        def boom(event):
+            raise ValueError(event.path)
+
+        remove = environ.instrument(on_field=boom)
+        try:
+            with pytest.raises(ValueError, match="name"):
+                environ.to_config(Cfg, ENV)
+        finally:
+            remove()
+
+
+class TestTrace:
+    def test_trace(self, caplog):
+        """
+        If the environ_config logger logs debug messages, loads are traced.
+        """
+        caplog.set_level(logging.DEBUG, logger="environ_config")
+
+        environ.to_config(Cfg, ENV)
+
+        assert "db.pw: looked up S_DB_PW using VaultEnvSecrets in " in (
+            caplog.text
+        )
+        assert "db.host: looked up APP_DB_HOST using env in " in caplog.text
+        assert "; missing, using the default." in caplog.text
+        assert "opt: all values missing, using the default." in caplog.text
+        assert "loaded Cfg in " in caplog.text
+
+    def test_trace_failed(self, caplog):
+        """
+        Failed loads are traced.
+        """
+        caplog.set_level(logging.DEBUG, logger="environ_config")
+
+        with pytest.raises(MissingSecretError):
+            environ.to_config(Cfg, {"VP": "S"})
+
+        assert "loading Cfg failed after " in caplog.text
+        assert "MissingSecretError('S_DB_PW'" in caplog.text
+
+    def test_trace_prefetched(self, caplog):
+        """
+        Prefetched values are traced without variable and duration.
+        """
+        environ.prefetch(Cfg, ENV).result()
+        caplog.set_level(logging.DEBUG, logger="environ_config")
+
+        environ.to_config(Cfg, ENV)
+
+        assert "name: looked up a value using env." in caplog.text
+
+    def test_no_logging(self):
+        """
+        If debug logging is disabled, loading doesn't log at all.
+        """
+        with patch.object(logging.Logger, "_log") as log:
+            environ.to_config(Cfg, ENV)
+            with pytest.raises(MissingSecretError):
+                environ.to_config(Cfg, {"VP": "S"})
+
+        log.assert_not_called()
+
+
+class TestBackend:
+    def test_function(self):
+        """
+        Getters that are plain functions are named by their qualified name.
+        """
+
+        def getter(environ, metadata, prefix, name):
+            pass
+
+        assert getter.__qualname__ == _backend(getter)
@@ -0,0 +1,269 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from botocore.exceptions import ClientError
+
+import environ
+
+from environ import _instrument, metrics
+from environ.exceptions import MissingSecretError
+from environ.metrics import Counter, Histogram, Registry
+from environ.secrets import VaultEnvSecrets
+
+
+vault = VaultEnvSecrets(vault_prefix=lambda env: env["VP"])
+
+
+@environ.config
+class Cfg:
+    name = environ.var()
+    pw = vault.secret()
+    token = vault.secret()
+
+
+ENV = {"VP": "S", "APP_NAME": "n", "S_PW": "pw", "S_TOKEN": "t"}
+CFG = f"{__name__}.Cfg"
+
+
+class TestCounter:
+    def test_inc(self):
+        """
+        Counters count per label set.
+        """
+        c = Counter("c_total", "Help.", ("a",))
+
+        c.inc(a="x")
+        c.inc(2, a="x")
+        c.inc(a="y")
+
+        assert 3.0 == c.value(a="x")
+        assert 1.0 == c.value(a="y")
+        assert 0.0 == c.value(a="z")
+
+    def test_missing_label(self):
+        """
+        All label names must be passed.
+        """
+        c = Counter("c_total", "Help.", ("a",))
+
+        with pytest.raises(ValueError, match="c_total requires the label 'a'"):
+            c.inc()
+
+    def test_render(self):
+        """
+        Counters are rendered with escaped help and label values.
+        """
+        c = Counter("c_total", "Back\\slash\nnewline.", ("a",))
+        c.inc(a='q"\\\n')
+
+        assert [
+            "# HELP c_total Back\\\\slash\\nnewline.",
+            "# TYPE c_total counter",
+            'c_total{a="q\\"\\\\\\n"} 1.0',
+        ] == list(c.render())
+
+    def test_render_no_labels(self):
+        """
+        Metrics without labels have no braces.
+        """
+        c = Counter("c_total", "Help.")
+        c.inc()
+
+        assert "c_total 1.0" == list(c.render())[-1]
+
+
+class TestHistogram:
+    def test_render(self):
+        """
+        Observations are counted into cumulative buckets, summed, and counted.
+        """
+        h = Histogram("h_seconds", "Help.", ("a",), buckets=(1, 0.5))
+
+        h.observe(0.5, a="x")
+        h.observe(0.7, a="x")
+        h.observe(3, a="x")
+
+        assert 3 == h.count(a="x")
+        assert 0 == h.count(a="y")
+        assert [
+            "# HELP h_seconds Help.",
+            "# TYPE h_seconds histogram",
+            'h_seconds_bucket{a="x",le="0.5"} 1',
+            'h_seconds_bucket{a="x",le="1.0"} 2',
+            'h_seconds_bucket{a="x",le="+Inf"} 3',
+            'h_seconds_sum{a="x"} 4.2',
+            'h_seconds_count{a="x"} 3',
+        ] == list(h.render())
+
+
+class TestRegistry:
+    def test_get_or_create(self):
+        """
+        Metrics are created once and rendered sorted by name.
+        """
+        r = Registry()
+
+        c = r.counter("b_total", "B.")
+        h = r.histogram("a_seconds", "A.", buckets=())
+        c.inc()
+
+        assert c is r.counter("b_total", "B.")
+        assert h is r.get("a_seconds")
+        assert r.get("nope") is None
+        assert (
+            "# HELP a_seconds A.\n"
+            "# TYPE a_seconds histogram\n"
+            "# HELP b_total B.\n"
+            "# TYPE b_total counter\n"
+            "b_total 1.0\n"
+        ) == r.render()
+
+    def test_type_conflict(self):
+        """
+        A name can't be used for two types of metrics.
+        """
+        r = Registry()
+        r.counter("x", "X.")
+
+        with pytest.raises(ValueError, match="x is already registered"):
+            r.histogram("x", "X.")
+
+
+class TestEnable:
+    def test_loads(self, registry):
+        """
+        Loads, reloads, failures, durations, and cache hits are reported.
+        """
+        environ.to_config(Cfg, ENV)
+        environ.to_config(Cfg, ENV)
+        with pytest.raises(MissingSecretError):
+            environ.to_config(Cfg, {"VP": "S", "APP_NAME": "n"})
+
+        loads = registry.get("environ_loads_total")
+        cache = registry.get("environ_cache_lookups_total")
+
+        assert 2 == loads.value(config=CFG, outcome="ok")
+        assert 1 == loads.value(config=CFG, outcome="error")
+        assert 2 == registry.get("environ_reloads_total").value(config=CFG)
+        assert 3 == registry.get("environ_load_duration_seconds").count(
+            config=CFG
+        )
+        assert 3 == registry.get("environ_getter_duration_seconds").count(
+            backend="env"
+        )
+        # Resolving the vault prefix once per load doesn't count as caching.
+        assert 0 == cache.value(
+            backend="VaultEnvSecrets", cache="load", result="hit"
+        )
+        assert 0 == cache.value(
+            backend="VaultEnvSecrets", cache="load", result="miss"
+        )
+        assert 'environ_loads_total{config="' in registry.render()
+
+    def test_prefetched(self, registry):
+        """
+        Prefetched values are cache hits without getter durations.
+        """
+        environ.prefetch(Cfg, ENV).result()
+        environ.to_config(Cfg, ENV)
+
+        assert 0 == registry.get("environ_getter_duration_seconds").count(
+            backend="env"
+        )
+        assert 1 == registry.get("environ_cache_lookups_total").value(
+            backend="env", cache="load", result="hit"
+        )
+
+    def test_enable_again(self, registry):
+        """
+        Enabling again switches to the new registry.
+        """
+        new = metrics.enable(Registry())
+        environ.to_config(Cfg, ENV)
+
+        assert 1 == len(_instrument._hooks)
+        assert 0 == registry.get("environ_loads_total").value(
+            config=CFG, outcome="ok"
+        )
+        assert 1 == new.get("environ_loads_total").value(
+            config=CFG, outcome="ok"
+        )
+
+    def test_disable(self):
+        """
+        Disabled metrics don't install hooks and backends report nowhere.
+        """
+        registry = metrics.enable()
+        metrics.disable()
+        metrics.disable()
+
+        environ.to_config(Cfg, ENV)
+        with metrics._fetching("x"):
+            metrics._retried("x")
+            metrics._cache_lookup("x", "memory", hit=True)
+
+        assert () == _instrument._hooks
+        assert "environ_loads_total{" not in registry.render()
+
+
+class TestBackendHelpers:
+    def test_fetching(self, registry):
+        """
+        Fetches are counted by outcome and timed.
+        """
+        with metrics._fetching("B"):
+            pass
+        with pytest.raises(OSError), metrics._fetching("B"):
+            raise OSError
+
+        fetches = registry.get("environ_backend_fetches_total")
+
+        assert 1 == fetches.value(backend="B", outcome="ok")
+        assert 1 == fetches.value(backend="B", outcome="error")
+        assert 2 == registry.get(
+            "environ_backend_fetch_duration_seconds"
+        ).count(backend="B")
+
+    def test_boto_retries(self, registry):
+        """
+        Retries that botocore reports are recorded -- also if the request
+        failed in the end.
+        """
+
+        def fail():
+            raise ClientError(
+                {
+                    "Error": {"Code": "ThrottlingException"},
+                    "ResponseMetadata": {"RetryAttempts": 4},
+                },
+                "GetSecretValue",
+            )
+
+        metrics._boto_call("B", dict)
+        metrics._boto_call(
+            "B", lambda: {"ResponseMetadata": {"RetryAttempts": 2}}
+        )
+        with pytest.raises(ClientError):
+            metrics._boto_call("B", fail)
+
+        assert 6 == registry.get("environ_backend_retries_total").value(
+            backend="B"
+        )
+        assert 1 == registry.get("environ_backend_fetches_total").value(
+            backend="B", outcome="error"
+        )
@@ -14,6 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import subprocess
+import sys
+
 from importlib import metadata
 
 import pytest
@@ -61,3 +64,65 @@ class TestLegacyMetadataHack:
             AttributeError, match="module environ has no attribute __yolo__"
         ):
             environ.__yolo__
+
+
+def _imported_after(code):
+    """
+    Return the names of the modules that are imported after running *code*
+    in a fresh interpreter.
+    """
+    return set(
+        subprocess.run(  # noqa: S603
+            [
+                sys.executable,
+                "-c",
+                f"import sys; {code}; print(' '.join(sys.modules))",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+    )
+
+
+class TestLazyImports:
+    def test_environ(self):
+        """
+        Importing environ doesn't import secrets backends, snapshots, or
+        metrics.
+        """
+        mods = _imported_after("import environ")
+
+        assert not mods & {
+            "boto3",
+            "environ.metrics",
+            "environ.secrets",
+            "environ.snapshot",
+            "http.client",
+            "multiprocessing.shared_memory",
+        }
+
+    def test_submodules(self):
+        """
+        Submodules are imported on first access.
+        """
+        assert environ.snapshot.load is not None
+        assert environ.metrics.enable is not None
+
+    def test_backends(self):
+        """
+        Backends are imported on first access.
+        """
+        from environ.secrets.awssm import SecretsManagerSecrets
+
+        assert SecretsManagerSecrets is environ.secrets.SecretsManagerSecrets
+
+    def test_backend_does_not_exist(self):
+        """
+        Asking for unknown backends raises an AttributeError.
+        """
+        with pytest.raises(
+            AttributeError,
+            match=r"module environ\.secrets has no attribute YoloSecrets",
+        ):
+            environ.secrets.YoloSecrets
@@ -0,0 +1,169 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from unittest.mock import patch
+
+import pytest
+
+import environ
+
+from environ.__main__ import main
+from environ.exceptions import MissingSecretError
+
+
+vault = environ.secrets.VaultEnvSecrets("S")
+
+
+@environ.config
+class Other:
+    x = environ.var("x")
+
+
+def _load_other_on_thread(val):
+    """
+    Converter that loads another config on another thread.
+    """
+    t = threading.Thread(target=environ.to_config, args=(Other, {}))
+    t.start()
+    t.join()
+
+    return val
+
+
+@environ.config
+class Cfg:
+    @environ.config
+    class DB:
+        host = environ.var("localhost")
+        pw = vault.secret(converter=_load_other_on_thread)
+
+    name = environ.var()
+    db = environ.group(DB)
+
+
+ENV = {"APP_NAME": "n", "S_DB_PW": "pw"}
+
+
+class TestProfile:
+    def test_profile(self):
+        """
+        The config is loaded and what happened is recorded -- ignoring loads
+        on other threads.
+        """
+        prof = environ.profile(Cfg, ENV)
+
+        assert Cfg("n", Cfg.DB("localhost", "pw")) == prof.config
+        assert (Cfg, None) == (prof.load.cls, prof.load.exception)
+        assert ["name", "db.host", "db.pw"] == [f.path for f in prof.fields]
+        assert [Cfg.DB, Cfg] == [g.cls for g in prof.groups]
+
+    def test_failed(self):
+        """
+        Exceptions are recorded instead of raised.
+        """
+        prof = environ.profile(Cfg, {})
+
+        assert prof.config is None
+        assert isinstance(prof.load.exception, MissingSecretError)
+
+    def test_report(self):
+        """
+        The report lists the slowest getters and classes, the backends, and
+        missing values.
+        """
+        report = environ.profile(Cfg, ENV).report(limit=3)
+
+        assert report.startswith("Loaded Cfg in ")
+        assert "(3 attributes, 2 classes)." in report
+        assert "Slowest getters:" in report
+        assert "S_DB_PW" in report
+        assert "Slowest converters and validators (per class):" in report
+        assert "  Cfg.DB  db" in report
+        assert "  requests  attributes  cached  duration  backend" in report
+        assert "  0         2           0       " in report
+        assert "Missing values (defaults used):" in report
+        assert "  db.host    APP_DB_HOST" in report
+        assert "failed" not in report
+
+    def test_report_nothing_missing(self):
+        """
+        If nothing is missing, there's no section for it.
+        """
+        report = environ.profile(Other, {"APP_X": "y"}).report()
+
+        assert "Missing values" not in report
+
+    def test_report_failed(self):
+        """
+        If loading failed, the report says so.
+        """
+        report = environ.profile(Cfg, {}).report()
+
+        assert "Loaded Cfg" in report
+        assert "Slowest converters" not in report
+        assert report.endswith("Loading failed: MissingSecretError: S_DB_PW")
+
+    def test_report_prefetched(self):
+        """
+        Prefetched values have no getters to report.
+        """
+        environ.prefetch(Cfg, ENV).result()
+
+        report = environ.profile(Cfg, ENV).report()
+
+        assert "Slowest getters:" not in report
+        assert "  0         2           2       " in report
+
+
+class TestMain:
+    def test_profile(self, capsys):
+        """
+        `python -m environ profile` prints the report of loading a class from
+        os.environ.
+        """
+        with patch.dict("os.environ", {"S_PW": "pw"}):
+            assert 0 == main(["profile", f"{__name__}:Cfg.DB", "--limit=1"])
+
+        assert capsys.readouterr().out.startswith("Loaded Cfg.DB in ")
+
+    def test_failed(self, capsys):
+        """
+        If loading fails, the exit status is 1.
+        """
+        with patch.dict("os.environ", {}, clear=True):
+            assert 1 == main(["profile", f"{__name__}:Cfg"])
+
+        assert "Loading failed" in capsys.readouterr().out
+
+    @pytest.mark.parametrize(
+        ("spec", "error"),
+        [
+            ("environ", "not in the form"),
+            ("environ.nope:Cfg", "No module named"),
+            ("environ:Nope", "has no attribute"),
+        ],
+    )
+    def test_bad_class(self, capsys, spec, error):
+        """
+        Unimportable classes are usage errors.
+        """
+        with pytest.raises(SystemExit) as ei:
+            main(["profile", spec])
+
+        assert 2 == ei.value.code
+        assert error in capsys.readouterr().err
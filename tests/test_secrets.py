@@ -39,15 +39,28 @@ class TestSecretStr:
 
     def test_secret_str_censors(self):
         """
-        _SecretStr censors its __repr__ if it's called from another __repr__.
+        _SecretStr is censored in the reprs of config classes.
         """
         s = _SecretStr("abc")
 
-        @attrs.define
+        @environ.config
+        class Cfg:
+            s = environ.var()
+            t = environ.var()
+
+        assert "Cfg(s=<SECRET>, t='abc')" == repr(Cfg(s, "abc"))
+
+    def test_explicit_repr(self):
+        """
+        Fields with an explicit repr keep it.
+        """
+
+        @environ.config
         class Cfg:
-            s = attrs.field()
+            s = attrs.field(repr=False)
+            t = attrs.field(repr=lambda v: "***")
 
-        assert "Cfg(s=<SECRET>)" == repr(Cfg(s))
+        assert "Cfg(t=***)" == repr(Cfg(_SecretStr("abc"), "abc"))
 
 
 @pytest.fixture
@@ -322,6 +335,65 @@ class TestVaultEnvSecrets:
 
         assert _SecretStr("foo") == cfg.pw
 
+    def test_prefix_callable_once_per_load(self):
+        """
+        A callable vault_prefix is called only once per load -- no matter how
+        many secrets there are.
+        """
+        calls = []
+
+        def extract(env):
+            calls.append(env)
+            return env["TENANT"]
+
+        vault = VaultEnvSecrets(vault_prefix=extract)
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                pw = vault.secret()
+
+            a = vault.secret()
+            b = vault.secret()
+            db = environ.group(DB)
+
+        cfgs = list(
+            environ.to_config_many(
+                Cfg,
+                [
+                    {
+                        "TENANT": t,
+                        f"{t}_A": "a",
+                        f"{t}_B": "b",
+                        f"{t}_DB_PW": t,
+                    }
+                    for t in ("X", "Y")
+                ],
+            )
+        )
+
+        assert ["X", "Y"] == [cfg.db.pw for cfg in cfgs]
+        assert 2 == len(calls)
+
+    def test_static_names_cached(self, vault):
+        """
+        The names of the variables for static prefixes are computed once.
+        """
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                pw = vault.secret()
+
+            db = environ.group(DB)
+
+        environ.to_config(Cfg, {"SECRET_DB_PW": "a"})
+
+        assert {(("APP", "db"), "pw"): "SECRET_DB_PW"} == vault._vars
+        assert "b" == environ.to_config(Cfg, {"SECRET_DB_PW": "b"}).db.pw
+
 
 @pytest.fixture
 def secrets_dir(tmp_path):
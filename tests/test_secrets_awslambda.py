@@ -0,0 +1,224 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import http.client
+import json
+import socket
+import subprocess
+import sys
+
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import environ
+
+from environ.exceptions import MissingSecretError
+from environ.secrets import LambdaExtensionSecrets
+
+
+TOKEN = "t0k3n"  # noqa: S105
+SECRETS = {
+    "prod/db": {"SecretString": json.dumps({"user": "u", "password": "pw"})},
+    "prod/key": {"SecretString": "s3kr3t"},
+    "prod/keystore": {"SecretBinary": base64.b64encode(b"\x00\xff").decode()},
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and bodies are written separately; don't let Nagle's algorithm
+    # delay the latter.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        url = urlsplit(self.path)
+        secret_id = parse_qs(url.query).get("secretId", [None])[0]
+        if self.headers["X-Aws-Parameters-Secrets-Token"] != self.server.token:
+            status, body = 403, b"forbidden"
+        elif url.path != "/secretsmanager/get" or secret_id not in SECRETS:
+            status, body = 400, b"not found"
+        else:
+            status = 200
+            body = json.dumps({"Name": secret_id, **SECRETS[secret_id]})
+            body = body.encode()
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(name="extension")
+def _extension(http_server):
+    server = http_server(_Handler)
+    server.token = TOKEN
+
+    return server
+
+
+@pytest.fixture(name="lsm")
+def _lsm(extension):
+    lsm = LambdaExtensionSecrets(port=extension.server_port, token=TOKEN)
+
+    yield lsm
+
+    _close(lsm)
+
+
+def _close(lsm):
+    if lsm._http is not None:
+        lsm._http.close()
+
+
+class TestLambdaExtensionSecrets:
+    def test_secrets(self, extension, lsm):
+        """
+        Secrets are fetched from the extension over one kept-alive
+        connection.
+        """
+
+        @environ.config
+        class Cfg:
+            key = lsm.secret()
+            user = lsm.secret(name="DB", json_key="user")
+            password = lsm.secret(name="DB", json_key="password")
+            keystore = lsm.secret(binary=True)
+
+        env = {
+            "APP_KEY": "prod/key",
+            "DB": "prod/db",
+            "APP_KEYSTORE": "prod/keystore",
+        }
+        cfg = environ.to_config(Cfg, env)
+        environ.to_config(Cfg, env)
+
+        assert "s3kr3t" == cfg.key
+        assert ("u", "pw") == (cfg.user, cfg.password)
+        assert b"\x00\xff" == cfg.keystore
+        assert 1 == len(extension.connections)
+
+    def test_no_boto3(self):
+        """
+        The backend doesn't depend on boto3.
+        """
+        code = (
+            "import sys; sys.modules['boto3'] = None; "
+            "from environ.secrets import LambdaExtensionSecrets"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+    def test_boto3_not_imported(self):
+        """
+        The backend doesn't import botocore, even if it's installed.
+        """
+        code = (
+            "import sys; import environ.secrets.awslambda; "
+            "assert 'botocore' not in sys.modules"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+    def test_token_from_env(self, extension):
+        """
+        If no token is passed, AWS_SESSION_TOKEN is used.
+        """
+        lsm = LambdaExtensionSecrets(port=extension.server_port)
+
+        with patch.dict("os.environ", {"AWS_SESSION_TOKEN": TOKEN}):
+            assert "s3kr3t" == lsm.secret().converter(
+                lsm._get_secret_value("prod/key")
+            )
+
+        _close(lsm)
+
+    def test_port_from_env(self, extension):
+        """
+        If no port is passed, PARAMETERS_SECRETS_EXTENSION_HTTP_PORT is used.
+        """
+        lsm = LambdaExtensionSecrets(token=TOKEN)
+
+        with patch.dict(
+            "os.environ",
+            {
+                "PARAMETERS_SECRETS_EXTENSION_HTTP_PORT": str(
+                    extension.server_port
+                )
+            },
+        ):
+            assert (
+                "s3kr3t" == lsm._get_secret_value("prod/key")["SecretString"]
+            )
+
+        _close(lsm)
+
+    def test_errors(self, lsm):
+        """
+        Unsuccessful responses raise an HTTPException.
+        """
+        with pytest.raises(http.client.HTTPException, match="400"):
+            lsm._get_secret_value("nope")
+
+    def test_missing_env(self, lsm):
+        """
+        If the secret ID isn't in the environment, the default is used or
+        MissingSecretError raised.
+        """
+
+        @environ.config
+        class Cfg:
+            key = lsm.secret()
+
+        with pytest.raises(MissingSecretError):
+            environ.to_config(Cfg, {})
+
+    def test_reconnects(self, extension, lsm):
+        """
+        If the connection has been closed, a new one is opened.
+        """
+        lsm._get_secret_value("prod/key")
+        lsm._http._local.conn.sock.shutdown(socket.SHUT_RDWR)
+
+        assert "s3kr3t" == lsm._get_secret_value("prod/key")["SecretString"]
+        assert 2 == len(extension.connections)
+
+    def test_metrics(self, extension, lsm, registry):
+        """
+        Fetches and reconnects are reported.
+        """
+        lsm._get_secret_value("prod/key")
+        lsm._http._local.conn.sock.shutdown(socket.SHUT_RDWR)
+        lsm._get_secret_value("prod/key")
+        with pytest.raises(http.client.HTTPException):
+            lsm._get_secret_value("nope")
+
+        fetches = registry.get("environ_backend_fetches_total")
+
+        assert [2, 1] == [
+            fetches.value(backend="LambdaExtensionSecrets", outcome=o)
+            for o in ("ok", "error")
+        ]
+        assert 1 == registry.get("environ_backend_retries_total").value(
+            backend="LambdaExtensionSecrets"
+        )
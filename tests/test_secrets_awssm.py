@@ -14,22 +14,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import json
+import multiprocessing
 import os
+import pickle
+import stat
+import threading
+import time
 import uuid
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import patch
 
 import attrs
 import boto3
 import pytest
 
+from cryptography.fernet import Fernet
 from moto import mock_aws
 
 import environ
 
+from environ import snapshot
+from environ._environ_config import CNF_KEY, _ConfigEntry
 from environ.exceptions import MissingSecretError
-from environ.secrets import SecretsManagerSecrets
+from environ.secrets import SecretsManagerSecrets, awssm
 from environ.secrets._utils import _SecretStr
+from environ.secrets.awssm import HedgingPolicy
 
 
 @pytest.fixture(name="shut_boto_up", autouse=True, scope="session")
@@ -134,6 +147,27 @@ class TestAWSSMSecret:
             conf = environ.to_config(Cfg, {"APP_PW": "SecretName"})
             assert conf.pw == "no-default"
 
+    def test_client_created_once(self):
+        """
+        Getters that run concurrently create only one client.
+        """
+        calls = []
+
+        def build():
+            calls.append(None)
+            time.sleep(0.01)
+            return object()
+
+        backend = SecretsManagerSecrets()
+
+        with (
+            patch.object(awssm, "_build_secretsmanager_client", build),
+            ThreadPoolExecutor(8) as ex,
+        ):
+            clients = set(ex.map(lambda _: backend.client, range(8)))
+
+        assert 1 == len(calls) == len(clients)
+
     def test_default(self, sm, secret):
         """
         Defaults are used iff the key is missing.
@@ -196,3 +230,773 @@ class TestAWSSMSecret:
         cfg = environ.to_config(Cfg, {"APP_DB_PASSWORD": secret})
 
         assert _SecretStr("nested!") == cfg.db.password
+
+
+def _slow_first_call(sm, delay):
+    """
+    Make only the first call to get_secret_value of *sm* slow.
+    """
+    orig = sm.client.get_secret_value
+    calls = []
+
+    def get_secret_value(**kw):
+        calls.append(kw)
+        if len(calls) == 1:
+            time.sleep(delay)
+        return orig(**kw)
+
+    sm.client.get_secret_value = get_secret_value
+
+    return calls
+
+
+class TestHedging:
+    def test_hedge_wins(self, secretsmanager, secret):
+        """
+        If a request is slow, a hedge is issued and its response is used.
+        """
+        secretsmanager.create_secret(Name=secret)
+        secretsmanager.put_secret_value(SecretId=secret, SecretString="pw")
+        hp = HedgingPolicy(initial_delay=0.01)
+        sm = SecretsManagerSecrets(client=secretsmanager, hedging=hp)
+        calls = _slow_first_call(sm, 1)
+
+        @environ.config
+        class Cfg:
+            pw = sm.secret()
+
+        start = time.monotonic()
+        cfg = environ.to_config(Cfg, {"APP_PW": secret})
+
+        assert time.monotonic() - start < 1
+        assert "pw" == cfg.pw
+        assert 2 == len(calls)
+        assert 1 == hp.hedges_issued == hp.hedges_won
+
+    def test_hedges_are_requests(self, secretsmanager, secret):
+        """
+        Every attempt is recorded as a request of its own.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="pw")
+        sm = SecretsManagerSecrets(
+            client=secretsmanager, hedging=HedgingPolicy(initial_delay=0.01)
+        )
+        _slow_first_call(sm, 0.2)
+
+        @environ.config
+        class Cfg:
+            pw = sm.secret()
+
+        prof = environ.profile(Cfg, {"APP_PW": secret})
+
+        assert "pw" == prof.config.pw
+        assert {"SecretsManagerSecrets": 2} == prof.requests
+
+    def test_fast_requests_are_not_hedged(self, sm, secret):
+        """
+        Requests that finish before the delay are not hedged.
+        """
+        hp = HedgingPolicy(initial_delay=5)
+        sm.hedging = hp
+
+        @environ.config
+        class Cfg:
+            pw = sm.secret()
+
+        assert "foobar" == environ.to_config(Cfg, {"APP_PW": secret}).pw
+        assert 0 == hp.hedges_issued == hp.hedges_won
+
+    def test_original_wins(self):
+        """
+        If the original request wins the race, it's used and the hedge isn't
+        counted as won.
+        """
+        hp = HedgingPolicy(initial_delay=0.01)
+        calls = []
+
+        def fnc():
+            calls.append(None)
+            if len(calls) == 2:
+                time.sleep(1)
+                return "hedge"
+            time.sleep(0.05)
+            return "original"
+
+        assert "original" == hp.call(fnc)
+        assert 1 == hp.hedges_issued
+        assert 0 == hp.hedges_won
+
+    def test_failed_first_completion(self):
+        """
+        If the first completed request fails, the other one is used.
+        """
+        hp = HedgingPolicy(initial_delay=0.01)
+        calls = []
+
+        def fnc():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                return "original"
+            raise ValueError("boom")
+
+        assert "original" == hp.call(fnc)
+
+    def test_success_preferred(self):
+        """
+        If both requests completed, a failure doesn't shadow a success.
+        """
+        hp = HedgingPolicy(initial_delay=0.01)
+        calls = []
+        original_failed = threading.Event()
+
+        def fnc():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                original_failed.set()
+                raise ValueError("boom")
+            original_failed.wait()
+            return "hedge"
+
+        def wait_all(fs, timeout=None, return_when=None):
+            return concurrent.futures.wait(fs, timeout)
+
+        with patch.object(awssm, "wait", wait_all):
+            assert "hedge" == hp.call(fnc)
+
+        assert 1 == hp.hedges_won
+
+    def test_daemon_threads(self):
+        """
+        Requests run on daemon threads, so hanging ones don't prevent the
+        interpreter from exiting.
+        """
+        hp = HedgingPolicy()
+
+        assert 42 == hp.call(lambda: 42)
+        assert all(
+            t.daemon
+            for t in threading.enumerate()
+            if t.name == "environ-hedge"
+        )
+
+    def test_all_fail(self):
+        """
+        If all requests fail, the exception is raised.
+        """
+        hp = HedgingPolicy(initial_delay=0.01)
+
+        def fnc():
+            time.sleep(0.02)
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            hp.call(fnc)
+
+    def test_delay_from_percentile(self):
+        """
+        Once enough latencies are known, the delay is their percentile.
+        """
+        hp = HedgingPolicy(
+            percentile=0.5, initial_delay=42, min_samples=3, window=5
+        )
+
+        assert 42 == hp.delay()
+
+        hp._latencies.extend([100, 1, 2, 3, 4, 5])
+
+        assert 3 == hp.delay()
+
+
+class TestCache:
+    def test_revalidates_by_version(self, secretsmanager, secret):
+        """
+        Cached secrets are only downloaded again if their current version
+        changed.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="v1")
+        sm = SecretsManagerSecrets(client=secretsmanager, cache=True)
+
+        @environ.config
+        class Cfg:
+            pw = sm.secret()
+
+        env = {"APP_PW": secret}
+        with patch.object(
+            secretsmanager,
+            "get_secret_value",
+            wraps=secretsmanager.get_secret_value,
+        ) as gsv:
+            assert "v1" == environ.to_config(Cfg, env).pw
+            assert "v1" == environ.to_config(Cfg, env).pw
+            assert 1 == gsv.call_count
+
+            secretsmanager.put_secret_value(SecretId=secret, SecretString="v2")
+
+            assert "v2" == environ.to_config(Cfg, env).pw
+            assert "v2" == environ.to_config(Cfg, env).pw
+            assert 2 == gsv.call_count
+
+    def test_metrics(self, secretsmanager, secret, registry):
+        """
+        Fetches, their retries, and cache lookups are reported.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="v1")
+        sm = SecretsManagerSecrets(client=secretsmanager, cache=True)
+
+        sm._get_secret_value(secret)
+        sm._get_secret_value(secret)
+
+        fetches = registry.get("environ_backend_fetches_total")
+        cache = registry.get("environ_cache_lookups_total")
+
+        # get_secret_value and describe_secret.
+        assert 2 == fetches.value(
+            backend="SecretsManagerSecrets", outcome="ok"
+        )
+        assert 0 == registry.get("environ_backend_retries_total").value(
+            backend="SecretsManagerSecrets"
+        )
+        assert [1, 1] == [
+            cache.value(
+                backend="SecretsManagerSecrets", cache="memory", result=r
+            )
+            for r in ("hit", "miss")
+        ]
+
+    def test_no_cache_by_default(self, sm, secret):
+        """
+        Without cache=True, every load downloads the secret.
+        """
+
+        @environ.config
+        class Cfg:
+            pw = sm.secret()
+
+        env = {"APP_PW": secret}
+        with patch.object(
+            sm.client, "describe_secret", side_effect=AssertionError
+        ):
+            environ.to_config(Cfg, env)
+            sm.client.put_secret_value(SecretId=secret, SecretString="new")
+
+            assert "new" == environ.to_config(Cfg, env).pw
+
+    def test_no_current_version(self, secretsmanager, secret):
+        """
+        If there's no current version, the secret is fetched.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="v1")
+        sm = SecretsManagerSecrets(client=secretsmanager, cache=True)
+
+        assert (
+            "v1"
+            == sm._get({"X": secret}, {CNF_KEY: _ConfigEntry("X")}, (), "x")[
+                "SecretString"
+            ]
+        )
+
+        with (
+            patch.object(secretsmanager, "describe_secret", return_value={}),
+            patch.object(
+                secretsmanager,
+                "get_secret_value",
+                wraps=secretsmanager.get_secret_value,
+            ) as gsv,
+        ):
+            sm._get({"X": secret}, {CNF_KEY: _ConfigEntry("X")}, (), "x")
+
+        assert 1 == gsv.call_count
+
+
+@pytest.fixture(name="json_secret")
+def _json_secret(secretsmanager, secret):
+    secretsmanager.create_secret(
+        Name=secret,
+        SecretString=json.dumps(
+            {"username": "admin", "password": "s3kr3t", "port": 5432}
+        ),
+    )
+
+    return secret
+
+
+class TestJSONKey:
+    def test_fetched_and_parsed_once(self, secretsmanager, json_secret):
+        """
+        Multiple attributes that share a JSON secret cause only one fetch and
+        one parse per load.
+        """
+        sm = SecretsManagerSecrets(client=secretsmanager)
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                user = sm.secret(name="DB_SECRET", json_key="username")
+                password = sm.secret(name="DB_SECRET", json_key="password")
+                port = sm.secret(name="DB_SECRET", json_key="port")
+
+            db = environ.group(DB)
+
+        env = {"DB_SECRET": json_secret}
+        with (
+            patch.object(
+                secretsmanager,
+                "get_secret_value",
+                wraps=secretsmanager.get_secret_value,
+            ) as gsv,
+            patch.object(json, "loads", wraps=json.loads) as loads,
+        ):
+            cfg = environ.to_config(Cfg, env)
+
+            assert 1 == gsv.call_count
+            secret_string = secretsmanager.get_secret_value(
+                SecretId=json_secret
+            )["SecretString"]
+            assert 1 == sum(
+                c.args == (secret_string,) for c in loads.call_args_list
+            )
+
+            environ.to_config(Cfg, env)
+
+            assert 3 == gsv.call_count
+
+        assert Cfg.DB("admin", "s3kr3t", 5432) == cfg.db
+        assert isinstance(cfg.db.password, _SecretStr)
+        assert (
+            "Cfg(db=Cfg.DB(user=<SECRET>, password=<SECRET>, port=<SECRET>))"
+            == repr(cfg)
+        )
+
+    def test_same_secret_fetched_once(self, sm, secret):
+        """
+        Plain secrets that share a secret ID are fetched once per load too.
+        """
+
+        @environ.config
+        class Cfg:
+            a = sm.secret(name="S")
+            b = sm.secret(name="S")
+
+        with patch.object(
+            sm.client, "get_secret_value", wraps=sm.client.get_secret_value
+        ) as gsv:
+            cfg = environ.to_config(Cfg, {"S": secret})
+
+        assert Cfg("foobar", "foobar") == cfg
+        assert 1 == gsv.call_count
+
+    def test_missing_key(self, secretsmanager, json_secret):
+        """
+        Missing keys use the default or raise a MissingSecretError.
+        """
+        sm = SecretsManagerSecrets(client=secretsmanager)
+
+        @environ.config
+        class Cfg:
+            x = sm.secret(json_key="x", default="default")
+            y = sm.secret(json_key="y")
+
+        with pytest.raises(MissingSecretError) as ei:
+            environ.to_config(
+                Cfg, {"APP_X": json_secret, "APP_Y": json_secret}
+            )
+
+        assert ("APP_Y[y]",) == ei.value.args
+
+        @environ.config
+        class Cfg2:
+            x = sm.secret(json_key="x", default="default")
+
+        assert "default" == environ.to_config(Cfg2, {"APP_X": json_secret}).x
+
+    def test_converter(self, secretsmanager, json_secret):
+        """
+        Converters can be passed.
+        """
+        sm = SecretsManagerSecrets(client=secretsmanager)
+
+        @environ.config
+        class Cfg:
+            port = sm.secret(json_key="port", converter=str)
+
+        assert "5432" == environ.to_config(Cfg, {"APP_PORT": json_secret}).port
+
+    def test_repr_non_string(self, secretsmanager, secret):
+        """
+        Values of JSON keys are censored in reprs, even if they aren't
+        strings.
+        """
+        secretsmanager.create_secret(
+            Name=secret, SecretString=json.dumps({"password": 123456})
+        )
+        sm = SecretsManagerSecrets(client=secretsmanager)
+
+        @environ.config
+        class Cfg:
+            pw = sm.secret(name="DB_SECRET", json_key="password")
+
+        cfg = environ.to_config(Cfg, {"DB_SECRET": secret})
+
+        assert 123456 == cfg.pw
+        assert "Cfg(pw=<SECRET>)" == repr(cfg)
+
+
+binary_sm = SecretsManagerSecrets()
+
+
+@environ.config(frozen=True)
+class BinaryCfg:
+    keystore = binary_sm.secret(binary=True)
+
+
+class TestBinary:
+    def test_memoryview(self, secretsmanager, secret):
+        """
+        Binary secrets are returned as read-only memoryviews of the payload,
+        never decoded.
+        """
+        payload = b"\x00\xff" * 1024
+        secretsmanager.create_secret(Name=secret, SecretBinary=payload)
+        sm = SecretsManagerSecrets(client=secretsmanager)
+
+        @environ.config
+        class Cfg:
+            keystore = sm.secret(binary=True)
+
+        cfg = environ.to_config(Cfg, {"APP_KEYSTORE": secret})
+        ks = cfg.keystore
+
+        assert isinstance(ks, memoryview)
+        assert ks.readonly
+        assert payload == ks
+        assert "<memory" in repr(ks)
+        assert "Cfg(keystore=<SECRET>)" == repr(cfg)
+
+    def test_no_copy_from_cache(self, secretsmanager, secret):
+        """
+        Cached binary secrets share the same buffer across loads.
+        """
+        secretsmanager.create_secret(Name=secret, SecretBinary=b"ks")
+        sm = SecretsManagerSecrets(client=secretsmanager, cache=True)
+
+        @environ.config
+        class Cfg:
+            keystore = sm.secret(binary=True)
+
+        env = {"APP_KEYSTORE": secret}
+
+        assert (
+            environ.to_config(Cfg, env).keystore.obj
+            is environ.to_config(Cfg, env).keystore.obj
+        )
+
+    def test_string_secret_is_missing(self, sm, secret):
+        """
+        String secrets have no binary payload and are treated as missing.
+        """
+
+        @environ.config
+        class Cfg:
+            keystore = sm.secret(binary=True)
+
+        with pytest.raises(MissingSecretError) as ei:
+            environ.to_config(Cfg, {"APP_KEYSTORE": secret})
+
+        assert ("APP_KEYSTORE",) == ei.value.args
+
+        @environ.config
+        class Cfg2:
+            keystore = sm.secret(binary=True, default=None)
+
+        assert (
+            environ.to_config(Cfg2, {"APP_KEYSTORE": secret}).keystore is None
+        )
+
+    def test_converter(self, secretsmanager, secret):
+        """
+        Converters get the memoryview.
+        """
+        secretsmanager.create_secret(Name=secret, SecretBinary=b"ks")
+        sm = SecretsManagerSecrets(client=secretsmanager)
+
+        @environ.config
+        class Cfg:
+            keystore = sm.secret(binary=True, converter=bytes)
+
+        assert (
+            b"ks" == environ.to_config(Cfg, {"APP_KEYSTORE": secret}).keystore
+        )
+
+    def test_pickle(self):
+        """
+        Read-only memoryviews are pickled as bytes and come back read-only;
+        writable ones still can't be pickled.
+        """
+        mv = pickle.loads(pickle.dumps(memoryview(b"ks").toreadonly()))  # noqa: S301
+
+        assert isinstance(mv, memoryview)
+        assert mv.readonly
+        assert b"ks" == mv
+
+        with pytest.raises(TypeError, match="memoryview"):
+            pickle.dumps(memoryview(bytearray(b"ks")))
+
+    def test_snapshot(self, secretsmanager, secret, monkeypatch):
+        """
+        Configs with binary secrets can be snapshotted.
+        """
+        secretsmanager.create_secret(Name=secret, SecretBinary=b"ks")
+        monkeypatch.setattr(binary_sm, "_client", secretsmanager)
+        cfg = environ.to_config(BinaryCfg, {"APP_KEYSTORE": secret})
+
+        loaded = snapshot.loads(BinaryCfg, snapshot.dumps(cfg), environ={})
+
+        assert loaded.keystore.readonly
+        assert b"ks" == loaded.keystore
+
+    def test_process_pool(self, secretsmanager, secret, monkeypatch):
+        """
+        Configs with binary secrets can be loaded in a process pool.
+        """
+        secretsmanager.create_secret(Name=secret, SecretBinary=b"ks")
+        monkeypatch.setattr(binary_sm, "_client", secretsmanager)
+
+        # Forked workers inherit moto's mock.
+        with ProcessPoolExecutor(
+            1, mp_context=multiprocessing.get_context("fork")
+        ) as ex:
+            (cfg,) = environ.to_config_many(
+                BinaryCfg, [{"APP_KEYSTORE": secret}], executor=ex
+            )
+
+        assert cfg.keystore.readonly
+        assert b"ks" == cfg.keystore
+
+    def test_json_key_exclusive(self, sm):
+        """
+        binary and json_key can't be used together.
+        """
+        with pytest.raises(TypeError, match="mutually exclusive"):
+            sm.secret(binary=True, json_key="x")
+
+
+def _join_refreshes():
+    for t in threading.enumerate():
+        if t.name == "environ-refresh":
+            t.join()
+
+
+@pytest.fixture(name="disk_env")
+def _disk_env():
+    with patch.dict(
+        os.environ, {"SECRETS_KEY": Fernet.generate_key().decode()}
+    ):
+        yield
+
+
+class TestDiskCache:
+    @pytest.fixture(name="make")
+    def _make(self, secretsmanager, tmp_path, disk_env):
+        def make(**kw):
+            return SecretsManagerSecrets(
+                client=secretsmanager,
+                cache_dir=tmp_path / "cache",
+                cache_key_env="SECRETS_KEY",
+                **kw,
+            )
+
+        return make
+
+    def test_cold_start(self, secretsmanager, secret, make, tmp_path):
+        """
+        Secrets are stored encrypted and private on disk and served from
+        there on the next start while being checked in the background.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="s3kr3t")
+
+        assert "s3kr3t" == make()._get_secret_value(secret)["SecretString"]
+
+        (entry,) = (tmp_path / "cache").iterdir()
+        assert 0o600 == stat.S_IMODE(entry.stat().st_mode)
+        assert 0o700 == stat.S_IMODE((tmp_path / "cache").stat().st_mode)
+        assert b"s3kr3t" not in entry.read_bytes()
+
+        with (
+            patch.object(
+                secretsmanager, "get_secret_value", side_effect=AssertionError
+            ),
+            patch.object(
+                secretsmanager,
+                "describe_secret",
+                wraps=secretsmanager.describe_secret,
+            ) as ds,
+        ):
+            assert "s3kr3t" == make()._get_secret_value(secret)["SecretString"]
+            _join_refreshes()
+
+        assert 1 == ds.call_count
+
+    def test_metrics(self, secretsmanager, secret, make, registry):
+        """
+        Disk cache lookups are reported.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="s3kr3t")
+
+        make()._get_secret_value(secret)
+        make()._get_secret_value(secret)
+        _join_refreshes()
+
+        cache = registry.get("environ_cache_lookups_total")
+
+        assert [1, 1] == [
+            cache.value(
+                backend="SecretsManagerSecrets", cache="disk", result=r
+            )
+            for r in ("hit", "miss")
+        ]
+
+    def test_rotated(self, secretsmanager, secret, make):
+        """
+        If the secret changed, the background check downloads it for the next
+        start.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="v1")
+        make()._get_secret_value(secret)
+        secretsmanager.put_secret_value(SecretId=secret, SecretString="v2")
+
+        assert "v1" == make()._get_secret_value(secret)["SecretString"]
+        _join_refreshes()
+
+        assert "v2" == make()._get_secret_value(secret)["SecretString"]
+        _join_refreshes()
+
+    def test_binary(self, secretsmanager, secret, make):
+        """
+        Binary secrets survive the roundtrip.
+        """
+        secretsmanager.create_secret(Name=secret, SecretBinary=b"\x00\xff")
+        make()._get_secret_value(secret)
+
+        assert b"\x00\xff" == make()._get_secret_value(secret)["SecretBinary"]
+        _join_refreshes()
+
+    def test_expired(self, secretsmanager, secret, make):
+        """
+        Entries that are older than the TTL are ignored.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="s3kr3t")
+        make(cache_ttl=60)._get_secret_value(secret)
+
+        with (
+            patch(
+                "cryptography.fernet.time.time", return_value=time.time() + 61
+            ),
+            patch.object(
+                secretsmanager,
+                "get_secret_value",
+                wraps=secretsmanager.get_secret_value,
+            ) as gsv,
+        ):
+            make(cache_ttl=60)._get_secret_value(secret)
+
+        assert 1 == gsv.call_count
+
+    def test_wrong_key(self, secretsmanager, secret, make):
+        """
+        Entries that can't be decrypted are ignored.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="s3kr3t")
+        make()._get_secret_value(secret)
+
+        with (
+            patch.dict(
+                os.environ, {"SECRETS_KEY": Fernet.generate_key().decode()}
+            ),
+            patch.object(
+                secretsmanager,
+                "get_secret_value",
+                wraps=secretsmanager.get_secret_value,
+            ) as gsv,
+        ):
+            make()._get_secret_value(secret)
+
+        assert 1 == gsv.call_count
+
+    def test_no_key(self, secretsmanager, secret, make, tmp_path, caplog):
+        """
+        If the key isn't set, nothing is cached on disk.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="s3kr3t")
+
+        with patch.dict(os.environ, clear=True):
+            make()._get_secret_value(secret)
+            make()._get_secret_value(secret)
+
+        assert not (tmp_path / "cache").exists()
+        assert "SECRETS_KEY is not set" in caplog.text
+
+    def test_memory_cache(self, secretsmanager, secret, make):
+        """
+        The disk cache is only used if the secret isn't cached in memory.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="v1")
+        sm = make(cache=True)
+        sm._get_secret_value(secret)
+        secretsmanager.put_secret_value(SecretId=secret, SecretString="v2")
+
+        assert "v2" == sm._get_secret_value(secret)["SecretString"]
+        assert "v2" == make()._get_secret_value(secret)["SecretString"]
+        _join_refreshes()
+
+    def test_needs_key_env(self, tmp_path):
+        """
+        Secrets are never stored unencrypted.
+        """
+        with pytest.raises(TypeError, match="cache_key_env"):
+            SecretsManagerSecrets(cache_dir=tmp_path)
+
+    def test_store_fails(self, secretsmanager, secret, make, tmp_path, caplog):
+        """
+        If the secret can't be stored, loading still works and no temporary
+        files are left behind.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="s3kr3t")
+
+        with patch.object(Path, "replace", side_effect=OSError):
+            assert "s3kr3t" == make()._get_secret_value(secret)["SecretString"]
+
+        assert [] == list((tmp_path / "cache").iterdir())
+        assert "caching secret" in caplog.text
+
+    def test_fdopen_fails(self, secretsmanager, secret, make, tmp_path):
+        """
+        If the temporary file can't be opened, its descriptor is closed.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="s3kr3t")
+
+        with (
+            patch.object(os, "fdopen", side_effect=OSError),
+            patch.object(os, "close", wraps=os.close) as close,
+        ):
+            assert "s3kr3t" == make()._get_secret_value(secret)["SecretString"]
+
+        close.assert_called_once()
+        assert [] == list((tmp_path / "cache").iterdir())
+
+    def test_refresh_fails(self, secretsmanager, secret, make, caplog):
+        """
+        If the background check fails, it's logged.
+        """
+        secretsmanager.create_secret(Name=secret, SecretString="s3kr3t")
+        make()._get_secret_value(secret)
+
+        with patch.object(
+            secretsmanager, "describe_secret", side_effect=RuntimeError
+        ):
+            assert "s3kr3t" == make()._get_secret_value(secret)["SecretString"]
+            _join_refreshes()
+
+        assert "refreshing secret" in caplog.text
@@ -0,0 +1,292 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import boto3
+import pytest
+
+from moto import mock_aws
+
+import environ
+
+from environ.exceptions import MissingSecretError
+from environ.secrets import SSMParameters, awsssm
+from environ.secrets._utils import _SecretStr
+
+
+@pytest.fixture(name="force_region", autouse=True, scope="session")
+def _force_region():
+    with patch.dict(os.environ, {"AWS_DEFAULT_REGION": "us-east-1"}):
+        yield
+
+
+@pytest.fixture(name="client")
+def _client():
+    with mock_aws():
+        client = boto3.client("ssm", region_name="us-east-2")
+        for name, value, type in (
+            ("/app/prod/workers", "4", "String"),
+            ("/app/prod/db/host", "db.example.com", "String"),
+            ("/app/prod/db/password", "s3kr3t", "SecureString"),
+            ("/shared/api_key", "key", "SecureString"),
+        ):
+            client.put_parameter(Name=name, Value=value, Type=type)
+
+        yield client
+
+
+def _counting(client, method):
+    return patch.object(client, method, wraps=getattr(client, method))
+
+
+class TestSSMParameters:
+    def test_tree(self, client):
+        """
+        The config tree is mapped onto the parameter hierarchy and everything
+        is loaded with as few calls as possible.
+        """
+        ssm = SSMParameters("/app/prod/", client=client)
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                host = ssm.secret()
+                password = ssm.secret()
+
+            workers = ssm.secret(converter=int)
+            api_key = ssm.secret(name="/shared/api_key")
+            db = environ.group(DB)
+
+        with (
+            _counting(client, "get_parameters_by_path") as gpbp,
+            _counting(client, "get_parameters") as gp,
+        ):
+            cfg = environ.to_config(Cfg, {})
+
+        assert Cfg(4, "key", Cfg.DB("db.example.com", "s3kr3t")) == cfg
+        assert isinstance(cfg.db.password, _SecretStr)
+        assert "<SECRET>" in repr(cfg.db)
+        assert "db.example.com" in repr(cfg.db)
+        assert 1 == gpbp.call_count
+        assert 1 == gp.call_count
+
+    def test_no_app_prefix(self, client):
+        """
+        Without an app prefix, the first group is still part of the name.
+        """
+        ssm = SSMParameters("/app/prod", client=client)
+
+        @environ.config(prefix="")
+        class Cfg:
+            @environ.config
+            class DB:
+                password = ssm.secret()
+
+            workers = ssm.secret(converter=int)
+            db = environ.group(DB)
+
+        cfg = environ.to_config(Cfg, {})
+
+        assert 4 == cfg.workers
+        assert "s3kr3t" == cfg.db.password
+
+    def test_paginates(self, client):
+        """
+        All pages are loaded.
+        """
+        for i in range(25):
+            client.put_parameter(
+                Name=f"/many/p{i}", Value=str(i), Type="String"
+            )
+
+        ssm = SSMParameters("/many", client=client)
+
+        assert 25 == len(ssm._get_parameters())
+
+    def test_metrics(self, client, registry):
+        """
+        Each page is a fetch and cache lookups are reported.
+        """
+        for i in range(15):
+            client.put_parameter(
+                Name=f"/many/p{i}", Value=str(i), Type="String"
+            )
+
+        ssm = SSMParameters("/many", client=client, cache_ttl=60)
+        ssm._get_parameters()
+        ssm._get_parameters()
+
+        cache = registry.get("environ_cache_lookups_total")
+
+        assert 2 == registry.get("environ_backend_fetches_total").value(
+            backend="SSMParameters", outcome="ok"
+        )
+        assert [1, 1] == [
+            cache.value(backend="SSMParameters", cache="memory", result=r)
+            for r in ("hit", "miss")
+        ]
+
+    def test_profile(self, client):
+        """
+        Profiles count the requests, not the attributes they served.
+        """
+        ssm = SSMParameters("/app/prod/", client=client)
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                host = ssm.secret()
+                password = ssm.secret()
+
+            workers = ssm.secret()
+            api_key = ssm.secret(name="/shared/api_key")
+            db = environ.group(DB)
+
+        prof = environ.profile(Cfg, {})
+
+        # One GetParametersByPath and one GetParameters.
+        assert {"SSMParameters": 2} == prof.requests
+        assert "  2         4           " in prof.report()
+
+    def test_names_in_chunks(self, client):
+        """
+        Explicitly named parameters are fetched 10 at a time.
+        """
+        for i in range(25):
+            client.put_parameter(
+                Name=f"/other/p{i}", Value=str(i), Type="String"
+            )
+
+        ssm = SSMParameters("/app/prod", client=client)
+        for i in range(25):
+            ssm.secret(name=f"/other/p{i}")
+
+        with _counting(client, "get_parameters") as gp:
+            params = ssm._get_parameters()
+
+        assert "24" == params["/other/p24"]
+        assert [10, 10, 5] == [
+            len(c.kwargs["Names"]) for c in gp.call_args_list
+        ]
+
+    def test_missing(self, client):
+        """
+        Missing parameters use the default or raise MissingSecretError.
+        """
+        ssm = SSMParameters("/app/prod", client=client)
+
+        @environ.config
+        class Cfg:
+            x = ssm.secret("default")
+            y = ssm.secret(name="/nope")
+
+        with pytest.raises(MissingSecretError) as ei:
+            environ.to_config(Cfg, {})
+
+        assert ("/nope",) == ei.value.args
+
+    def test_no_decrypt(self, client):
+        """
+        If decrypt is false, SecureStrings are passed through encrypted.
+        """
+        ssm = SSMParameters("/app/prod", client=client, decrypt=False)
+
+        with _counting(client, "get_parameters_by_path") as gpbp:
+            ssm._get_parameters()
+
+        assert gpbp.call_args.kwargs["WithDecryption"] is False
+
+    def test_cache_ttl(self, client):
+        """
+        With a cache_ttl, parameters are only fetched again once it expired.
+        """
+        ssm = SSMParameters("/app/prod", client=client, cache_ttl=60)
+
+        @environ.config
+        class Cfg:
+            workers = ssm.secret()
+
+        with (
+            _counting(client, "get_parameters_by_path") as gpbp,
+            patch("time.monotonic", return_value=0),
+        ):
+            environ.to_config(Cfg, {})
+            environ.to_config(Cfg, {})
+
+            assert 1 == gpbp.call_count
+
+        with (
+            _counting(client, "get_parameters_by_path") as gpbp,
+            patch("time.monotonic", return_value=61),
+        ):
+            environ.to_config(Cfg, {})
+
+        assert 1 == gpbp.call_count
+
+    def test_no_cache_by_default(self, client):
+        """
+        Without a cache_ttl, every load fetches the parameters.
+        """
+        ssm = SSMParameters("/app/prod", client=client)
+
+        @environ.config
+        class Cfg:
+            workers = ssm.secret()
+
+        environ.to_config(Cfg, {})
+        client.put_parameter(
+            Name="/app/prod/workers", Value="8", Overwrite=True
+        )
+
+        assert "8" == environ.to_config(Cfg, {}).workers
+
+    def test_default_client(self):
+        """
+        If no client is passed, one is created lazily.
+        """
+        with mock_aws():
+            ssm = SSMParameters("/")
+
+            assert ssm._client is None
+            assert ssm.client is ssm.client
+
+    def test_client_created_once(self):
+        """
+        Getters that run concurrently create only one client.
+        """
+        calls = []
+
+        def build():
+            calls.append(None)
+            time.sleep(0.01)
+            return object()
+
+        backend = SSMParameters("/")
+
+        with (
+            patch.object(awsssm, "_build_ssm_client", build),
+            ThreadPoolExecutor(8) as ex,
+        ):
+            clients = set(ex.map(lambda _: backend.client, range(8)))
+
+        assert 1 == len(calls) == len(clients)
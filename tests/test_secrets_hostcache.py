@@ -0,0 +1,313 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import socket
+import stat
+import subprocess
+import sys
+
+from unittest.mock import patch
+
+import attrs
+import pytest
+
+import environ
+
+from environ.exceptions import ConfigError
+from environ.secrets import HostCacheSecrets, hostcache
+from environ.secrets._secretsmanager import _SecretsManagerBase
+from environ.secrets.hostcache import SecretCacheDaemon
+
+
+SECRETS = {
+    "prod/db": {"Name": "prod/db", "SecretString": "s3kr3t"},
+    "prod/keystore": {"Name": "prod/keystore", "SecretBinary": b"\x00\xff"},
+}
+
+
+@attrs.define
+class _Upstream(_SecretsManagerBase):
+    calls: list = attrs.Factory(list)
+
+    def _get_secret_value(self, secret_name):
+        self.calls.append(secret_name)
+
+        return dict(SECRETS[secret_name])
+
+
+@pytest.fixture(name="upstream")
+def _upstream():
+    return _Upstream()
+
+
+@pytest.fixture(name="path")
+def _path(tmp_path):
+    return str(tmp_path / "s.sock")
+
+
+@pytest.fixture(name="serve")
+def _serve(path, upstream, serve_in_thread):
+    def serve(ttl=300.0):
+        return serve_in_thread(SecretCacheDaemon(path, upstream, ttl))
+
+    return serve
+
+
+@pytest.fixture(name="daemon")
+def _daemon(serve):
+    daemon = serve()
+
+    yield daemon
+
+    daemon.shutdown()
+
+
+@pytest.fixture(name="make")
+def _make(path):
+    clients = []
+
+    def make(**kw):
+        client = HostCacheSecrets(path, **kw)
+        clients.append(client)
+
+        return client
+
+    yield make
+
+    for c in clients:
+        c.close()
+
+
+class TestHostCacheSecrets:
+    def test_shared(self, daemon, upstream, make):
+        """
+        Multiple clients share one fetch.
+        """
+        clients = [make() for _ in range(4)]
+
+        for hcs in clients:
+
+            @environ.config
+            class Cfg:
+                pw = hcs.secret()
+                keystore = hcs.secret(binary=True)
+
+            cfg = environ.to_config(
+                Cfg, {"APP_PW": "prod/db", "APP_KEYSTORE": "prod/keystore"}
+            )
+
+            assert "s3kr3t" == cfg.pw
+            assert b"\x00\xff" == cfg.keystore
+
+        assert ["prod/db", "prod/keystore"] == upstream.calls
+
+    def test_other_process(self, daemon, upstream, path):
+        """
+        Other processes share the cache.
+        """
+        make = HostCacheSecrets(path)
+        make._get_secret_value("prod/db")
+        make.close()
+
+        code = (
+            "from environ.secrets import HostCacheSecrets; "
+            f"hcs = HostCacheSecrets({path!r}); "
+            "print(hcs._get_secret_value('prod/db')['SecretString'])"
+        )
+        out = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+        assert "s3kr3t\n" == out
+        assert ["prod/db"] == upstream.calls
+
+    def test_ttl(self, serve, upstream, make):
+        """
+        Secrets are fetched again once the TTL is over.
+        """
+        daemon = serve(ttl=0)
+        try:
+            hcs = make()
+            hcs._get_secret_value("prod/db")
+            hcs._get_secret_value("prod/db")
+        finally:
+            daemon.shutdown()
+
+        assert ["prod/db", "prod/db"] == upstream.calls
+
+    def test_upstream_error(self, daemon, make):
+        """
+        If the daemon can't fetch a secret, ConfigError is raised.
+        """
+        with pytest.raises(ConfigError, match="KeyError: 'nope'"):
+            make()._get_secret_value("nope")
+
+    def test_socket_private(self, daemon, path):
+        """
+        The socket is only accessible by its owner.
+        """
+        assert 0o600 == stat.S_IMODE(socket_stat(path).st_mode)
+
+    def test_insecure_socket(self, daemon, path, make):
+        """
+        Clients refuse to use sockets that others can access.
+        """
+        socket_path = hostcache.Path(path)
+        socket_path.chmod(0o666)
+
+        with pytest.raises(ConfigError, match="insecure"):
+            make()._get_secret_value("prod/db")
+
+    def test_peer_rejected(self, daemon, upstream, make):
+        """
+        Connections from other users are rejected.
+        """
+        with (
+            patch.object(hostcache, "_peer_uid", return_value=12345),
+            pytest.raises(OSError),
+        ):
+            make()._get_secret_value("prod/db")
+
+        assert [] == upstream.calls
+
+    def test_fallback(self, path, make):
+        """
+        If the daemon isn't running, the fallback is used.
+        """
+        fallback = _Upstream()
+
+        assert (
+            "s3kr3t"
+            == make(fallback=fallback)._get_secret_value("prod/db")[
+                "SecretString"
+            ]
+        )
+        assert ["prod/db"] == fallback.calls
+
+    def test_no_fallback(self, path, make):
+        """
+        If the daemon isn't running and there's no fallback, the error is
+        raised.
+        """
+        with pytest.raises(FileNotFoundError):
+            make()._get_secret_value("prod/db")
+
+    def test_dead_daemon(self, path, make):
+        """
+        If the daemon died without removing its socket, the fallback is used.
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(path)
+        hostcache.Path(path).chmod(0o600)
+        fallback = _Upstream()
+
+        make(fallback=fallback)._get_secret_value("prod/db")
+
+        assert ["prod/db"] == fallback.calls
+
+    def test_hang_up(self):
+        """
+        If the daemon hangs up, ConnectionResetError is raised.
+        """
+        with pytest.raises(ConnectionResetError):
+            hostcache._readline(io.BytesIO())
+
+    def test_reconnects(self, serve, upstream, make):
+        """
+        If the daemon is restarted, clients reconnect.
+        """
+        hcs = make()
+        daemon = serve()
+        hcs._get_secret_value("prod/db")
+        daemon.shutdown()
+
+        daemon = serve()
+        try:
+            hcs._get_secret_value("prod/db")
+        finally:
+            daemon.shutdown()
+
+        assert ["prod/db", "prod/db"] == upstream.calls
+
+    def test_metrics(self, serve, make, registry):
+        """
+        Requests, reconnects, and the daemon's cache lookups are reported.
+        """
+        hcs = make()
+        daemon = serve()
+        hcs._get_secret_value("prod/db")
+        daemon.shutdown()
+
+        daemon = serve()
+        try:
+            hcs._get_secret_value("prod/db")
+            hcs._get_secret_value("prod/db")
+            with pytest.raises(ConfigError):
+                hcs._get_secret_value("nope")
+        finally:
+            daemon.shutdown()
+
+        fetches = registry.get("environ_backend_fetches_total")
+        cache = registry.get("environ_cache_lookups_total")
+
+        assert [3, 1] == [
+            fetches.value(backend="HostCacheSecrets", outcome=o)
+            for o in ("ok", "error")
+        ]
+        assert 1 == registry.get("environ_backend_retries_total").value(
+            backend="HostCacheSecrets"
+        )
+        assert [1, 3] == [
+            cache.value(backend="SecretCacheDaemon", cache="memory", result=r)
+            for r in ("hit", "miss")
+        ]
+
+
+class TestSecretCacheDaemon:
+    def test_stale_socket(self, path, serve):
+        """
+        Sockets that nobody listens on anymore are replaced.
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(path)
+
+        serve().shutdown()
+
+    def test_live_socket(self, daemon, path, upstream):
+        """
+        If another daemon is listening on the socket, an error is raised.
+        """
+        with pytest.raises(OSError, match="already listening"):
+            SecretCacheDaemon(path, upstream)
+
+    def test_main(self, path):
+        """
+        main() runs the daemon until interrupted and cleans up.
+        """
+        with patch.object(
+            hostcache._Server, "serve_forever", side_effect=KeyboardInterrupt
+        ):
+            hostcache.main([path, "--ttl", "1"])
+
+        assert not hostcache.Path(path).exists()
+
+
+def socket_stat(path):
+    return hostcache.Path(path).stat()
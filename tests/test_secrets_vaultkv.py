@@ -0,0 +1,395 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.client
+import json
+import time
+
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+
+import pytest
+
+import environ
+
+from environ.exceptions import MissingSecretError
+from environ.secrets import VaultKVSecrets
+from environ.secrets._utils import _SecretStr
+
+
+TOKEN = "s.t0k3n"  # noqa: S105
+APPROLE = {"role_id": "role", "secret_id": "s3cr3t"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and bodies are written separately; don't let Nagle's algorithm
+    # delay the latter.
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        vault = self.server
+        vault.connections.add(self.client_address)
+        vault.requests.append((self.command, self.path))
+
+        if self.path == "/v1/auth/approle/login":
+            self._login()
+        elif self.headers["X-Vault-Token"] != TOKEN:
+            self._reply(403, {"errors": ["permission denied"]})
+        elif self.path == "/v1/auth/token/renew-self":
+            if vault.revoked:
+                self._reply(403, {"errors": ["permission denied"]})
+                return
+
+            vault.renewals += 1
+            self._reply(200, {"auth": {"lease_duration": vault.token_ttl}})
+        else:
+            self._kv()
+
+    def _login(self):
+        creds = json.loads(
+            self.rfile.read(int(self.headers["Content-Length"]))
+        )
+        if creds != APPROLE:
+            self._reply(400, {"errors": ["invalid"]})
+            return
+
+        self._reply(
+            200,
+            {
+                "auth": {
+                    "client_token": TOKEN,
+                    "lease_duration": self.server.token_ttl,
+                    "renewable": True,
+                }
+            },
+        )
+
+    def _kv(self):
+        vault = self.server
+        _, _, mount, _, path = self.path.split("/", 4)
+        if self.command == "LIST":
+            keys = sorted(
+                {
+                    k[len(path) + 1 :].split("/")[0]
+                    + ("/" if "/" in k[len(path) + 1 :] else "")
+                    for k in vault.secrets
+                    if k.startswith(path + "/")
+                }
+            )
+            payload = {"data": {"keys": keys}} if keys else None
+        elif path in vault.secrets:
+            payload = {
+                "lease_duration": vault.lease_duration,
+                "data": {"data": vault.secrets[path], "metadata": {}},
+            }
+        else:
+            payload = None
+
+        if mount != "secret" or payload is None:
+            self._reply(404, {"errors": []})
+        else:
+            self._reply(200, payload)
+
+    do_GET = do_POST = do_LIST = _handle  # noqa: N815
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(name="vault")
+def _vault(http_server):
+    server = http_server(_Handler)
+    server.requests = []
+    server.renewals = 0
+    server.revoked = False
+    server.token_ttl = 3600
+    server.lease_duration = 0
+    server.secrets = {
+        "app/prod": {"api_key": "key"},
+        "app/prod/db": {"user": "u", "password": "pw", "port": 5432},
+        "app/prod/db/replica": {"host": "replica"},
+        "app/other": {"nope": "nope"},
+    }
+    server.url = f"http://localhost:{server.server_port}"
+
+    return server
+
+
+@pytest.fixture(name="make")
+def _make(vault):
+    backends = []
+
+    def make(**kw):
+        kw.setdefault("url", vault.url)
+        backend = VaultKVSecrets("app/prod", **kw)
+        backends.append(backend)
+
+        return backend
+
+    yield make
+
+    for b in backends:
+        b.close()
+
+
+class TestVaultKVSecrets:
+    def test_tree(self, vault, make):
+        """
+        The config tree is mapped onto the secrets below path which are listed
+        and read in one pass over one connection.
+        """
+        kv = make(token=TOKEN)
+
+        @environ.config
+        class Cfg:
+            @environ.config
+            class DB:
+                @environ.config
+                class Replica:
+                    host = kv.secret()
+
+                user = kv.secret()
+                pw = kv.secret(name="password")
+                port = kv.secret()
+                replica = environ.group(Replica)
+
+            api_key = kv.secret()
+            db = environ.group(DB)
+
+        cfg = environ.to_config(Cfg, {})
+
+        assert (
+            Cfg("key", Cfg.DB("u", "pw", 5432, Cfg.DB.Replica("replica")))
+            == cfg
+        )
+        assert isinstance(cfg.db.pw, _SecretStr)
+        assert (
+            "Cfg(api_key=<SECRET>, db=Cfg.DB(user=<SECRET>, pw=<SECRET>, "
+            "port=<SECRET>, replica=Cfg.DB.Replica(host=<SECRET>)))"
+        ) == repr(cfg)
+        assert 1 == len(vault.connections)
+        assert [
+            ("LIST", "/v1/secret/metadata/app/prod"),
+            ("LIST", "/v1/secret/metadata/app/prod/db"),
+            ("GET", "/v1/secret/data/app/prod"),
+            ("GET", "/v1/secret/data/app/prod/db"),
+            ("GET", "/v1/secret/data/app/prod/db/replica"),
+        ] == vault.requests
+
+    def test_no_app_prefix(self, make):
+        """
+        Without an app prefix, the first group is still part of the path.
+        """
+        kv = make(token=TOKEN)
+
+        @environ.config(prefix="")
+        class Cfg:
+            @environ.config
+            class DB:
+                password = kv.secret()
+
+            api_key = kv.secret()
+            db = environ.group(DB)
+
+        cfg = environ.to_config(Cfg, {})
+
+        assert "key" == cfg.api_key
+        assert "pw" == cfg.db.password
+
+    def test_missing(self, make):
+        """
+        Missing keys use the default or raise MissingSecretError.
+        """
+        kv = make(token=TOKEN)
+
+        @environ.config
+        class Cfg:
+            x = kv.secret("default")
+            y = kv.secret()
+
+        with pytest.raises(MissingSecretError) as ei:
+            environ.to_config(Cfg, {})
+
+        assert ("app/prod:y",) == ei.value.args
+
+    def test_empty(self, vault):
+        """
+        If there are no secrets at and below path, nothing is found.
+        """
+        kv = VaultKVSecrets("nothing", url=vault.url, token=TOKEN)
+
+        assert {} == kv._read_all()
+
+        kv.close()
+
+    def test_env(self, vault):
+        """
+        URL and token are taken from the environment by default.
+        """
+        kv = VaultKVSecrets("/app/prod/")
+
+        with patch.dict(
+            "os.environ", {"VAULT_ADDR": vault.url, "VAULT_TOKEN": TOKEN}
+        ):
+            assert "key" == kv._read_all()[""]["api_key"]
+
+        kv.close()
+
+    @pytest.mark.parametrize("var", ["VAULT_ADDR", "VAULT_TOKEN"])
+    def test_env_missing(self, vault, var):
+        """
+        If neither URL nor token are passed and the environment variables are
+        missing, MissingEnvValueError is raised.
+        """
+        env = {"VAULT_ADDR": vault.url, "VAULT_TOKEN": TOKEN}
+        del env[var]
+        kv = VaultKVSecrets("app/prod")
+
+        with (
+            patch.dict("os.environ", env, clear=True),
+            pytest.raises(environ.MissingEnvValueError) as ei,
+        ):
+            kv._read_all()
+
+        assert (var,) == ei.value.args
+
+        kv.close()
+
+    def test_errors(self, make):
+        """
+        Errors from Vault raise an HTTPException.
+        """
+        kv = make(token="wrong")  # noqa: S106
+
+        with pytest.raises(http.client.HTTPException, match="403"):
+            kv._read_all()
+
+    def test_approle(self, vault, make):
+        """
+        Tokens obtained using AppRole are cached.
+        """
+        kv = make(**APPROLE)
+
+        kv._read_all()
+        kv._read_all()
+
+        assert 1 == vault.requests.count(("POST", "/v1/auth/approle/login"))
+
+    def test_approle_expired(self, vault, make):
+        """
+        Expired tokens cause a new login.
+        """
+        vault.token_ttl = 0
+        kv = make(**APPROLE)
+
+        kv._read_all()
+
+        assert 1 < vault.requests.count(("POST", "/v1/auth/approle/login"))
+
+    def test_renew(self, vault, make):
+        """
+        If asked, the token is renewed in the background.
+        """
+        vault.token_ttl = 0.15
+        kv = make(**APPROLE, renew=True)
+
+        kv._read_all()
+        for _ in range(100):
+            if vault.renewals >= 2:
+                break
+            time.sleep(0.05)
+
+        assert vault.renewals >= 2
+        assert 1 == vault.requests.count(("POST", "/v1/auth/approle/login"))
+
+    def test_renew_fails(self, vault, make, caplog):
+        """
+        If renewing fails, it's logged and renewing stops.
+        """
+        vault.token_ttl = 0.03
+        vault.revoked = True
+        kv = make(**APPROLE, renew=True)
+
+        kv._read_all()
+        for _ in range(100):
+            if kv._renewer is None:
+                break
+            time.sleep(0.05)
+
+        assert "renewing vault token failed" in caplog.text
+        assert kv._renewer is None
+
+    def test_leases_cached(self, vault, make):
+        """
+        Secrets with leases are cached until the shortest lease expires.
+        """
+        vault.lease_duration = 60
+        kv = make(token=TOKEN)
+
+        kv._read_all()
+        n = len(vault.requests)
+        kv._read_all()
+
+        assert n == len(vault.requests)
+
+        with patch("time.monotonic", return_value=time.monotonic() + 61):
+            kv._read_all()
+
+        assert n < len(vault.requests)
+
+    def test_metrics(self, vault, make, registry):
+        """
+        Requests -- including logins -- and lease cache lookups are reported.
+        """
+        vault.lease_duration = 60
+        kv = make(**APPROLE)
+
+        kv._read_all()
+        kv._read_all()
+        with pytest.raises(http.client.HTTPException):
+            make(token="wrong")._read_all()  # noqa: S106
+
+        fetches = registry.get("environ_backend_fetches_total")
+        cache = registry.get("environ_cache_lookups_total")
+
+        assert [len(vault.requests) - 1, 1] == [
+            fetches.value(backend="VaultKVSecrets", outcome=o)
+            for o in ("ok", "error")
+        ]
+        assert [1, 2] == [
+            cache.value(backend="VaultKVSecrets", cache="lease", result=r)
+            for r in ("hit", "miss")
+        ]
+
+    def test_no_leases_not_cached(self, vault, make):
+        """
+        Secrets without leases are read on every load.
+        """
+        kv = make(token=TOKEN)
+
+        kv._read_all()
+        n = len(vault.requests)
+        kv._read_all()
+
+        assert 2 * n == len(vault.requests)
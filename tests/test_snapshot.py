@@ -0,0 +1,394 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import stat
+
+from unittest.mock import patch
+
+import attrs
+import pytest
+
+from cryptography.fernet import Fernet
+
+import environ
+
+from environ import snapshot
+from environ.secrets._utils import _SecretStr
+
+
+vault = environ.secrets.VaultEnvSecrets("SECRET")
+
+
+@environ.config(frozen=True)
+class Cfg:
+    @environ.config(frozen=True)
+    class DB:
+        host = environ.var()
+        port = environ.var("5432", converter=int)
+        password = vault.secret()
+
+    @environ.config(frozen=True)
+    class Opt:
+        x = environ.var()
+
+    name = environ.var()
+    db = environ.group(DB)
+    opt = environ.group(Opt, optional=True)
+
+
+ENV = {
+    "APP_NAME": "app",
+    "APP_DB_HOST": "db",
+    "SECRET_DB_PASSWORD": "s3kr3t",
+}
+
+
+@pytest.fixture(name="cfg")
+def _cfg():
+    return environ.to_config(Cfg, ENV)
+
+
+@pytest.fixture(name="key")
+def _key():
+    return Fernet.generate_key().decode()
+
+
+def _no_getters():
+    return patch.object(
+        environ.secrets.VaultEnvSecrets,
+        "_get",
+        side_effect=AssertionError("getter called"),
+    )
+
+
+class TestSnapshot:
+    def test_roundtrip(self, tmp_path, cfg):
+        """
+        Snapshots are loaded without running getters, converters, or
+        validators and are equal to the original.
+        """
+        p = tmp_path / "cfg.snap"
+        snapshot.dump(cfg, p)
+
+        with _no_getters():
+            loaded = snapshot.load(Cfg, p, environ={})
+
+        assert cfg == loaded
+        assert isinstance(loaded.db.password, _SecretStr)
+        assert 5432 == loaded.db.port
+        assert loaded.opt is None
+
+    def test_private_file(self, tmp_path, cfg):
+        """
+        Snapshots are only readable by the current user.
+        """
+        p = tmp_path / "cfg.snap"
+        snapshot.dump(cfg, p)
+
+        assert 0o600 == stat.S_IMODE(p.stat().st_mode)
+        assert [p] == list(tmp_path.iterdir())
+
+    def test_failed_dump_cleans_up(self, tmp_path, cfg):
+        """
+        If writing fails, no temporary files are left behind.
+        """
+        with (
+            patch.object(snapshot.Path, "replace", side_effect=OSError),
+            pytest.raises(OSError),
+        ):
+            snapshot.dump(cfg, tmp_path / "cfg.snap")
+
+        assert [] == list(tmp_path.iterdir())
+
+    def test_failed_fdopen_closes_fd(self, tmp_path, cfg):
+        """
+        If the temporary file can't be opened, its descriptor is closed.
+        """
+        with (
+            patch.object(snapshot.os, "fdopen", side_effect=OSError),
+            patch.object(snapshot.os, "close", wraps=snapshot.os.close) as c,
+            pytest.raises(OSError),
+        ):
+            snapshot.dump(cfg, tmp_path / "cfg.snap")
+
+        c.assert_called_once()
+        assert [] == list(tmp_path.iterdir())
+
+    def test_plain_secrets(self, cfg):
+        """
+        Without a key, secrets are stored in plain text.
+        """
+        assert b"s3kr3t" in snapshot.dumps(cfg)
+
+    def test_encrypted_secrets(self, cfg, key):
+        """
+        With a key, secrets are encrypted, but other values are not.
+        """
+        env = {"SNAP_KEY": key}
+        data = snapshot.dumps(cfg, key_env="SNAP_KEY", environ=env)
+
+        assert b"s3kr3t" not in data
+        assert b"db" in data
+
+        with _no_getters():
+            loaded = snapshot.loads(Cfg, data, key_env="SNAP_KEY", environ=env)
+
+        assert cfg == loaded
+
+    def test_missing_key_on_dump(self, cfg):
+        """
+        If the key isn't set, dumping fails.
+        """
+        with pytest.raises(environ.MissingEnvValueError) as ei:
+            snapshot.dumps(cfg, key_env="SNAP_KEY", environ={})
+
+        assert ("SNAP_KEY",) == ei.value.args
+
+    @pytest.mark.parametrize(
+        ("key_env", "env"),
+        [
+            (None, {}),
+            ("SNAP_KEY", {}),
+            ("SNAP_KEY", {"SNAP_KEY": Fernet.generate_key().decode()}),
+        ],
+    )
+    def test_undecryptable_falls_back(self, cfg, key, key_env, env):
+        """
+        If the secrets can't be decrypted, the config is loaded normally.
+        """
+        data = snapshot.dumps(
+            cfg, key_env="SNAP_KEY", environ={"SNAP_KEY": key}
+        )
+
+        loaded = snapshot.loads(
+            Cfg,
+            data,
+            key_env=key_env,
+            environ={**ENV, **env, "APP_NAME": "fresh"},
+        )
+
+        assert "fresh" == loaded.name
+
+    @pytest.mark.parametrize(
+        "mangle",
+        [
+            lambda data: b"",
+            lambda data: b"x" + data[1:],
+            lambda data: data[:10] + b"\xff" + data[11:],
+        ],
+        ids=["empty", "magic", "version"],
+    )
+    def test_unusable_falls_back(self, cfg, mangle):
+        """
+        Garbage and snapshots of a different format fall back to loading the
+        config normally.
+        """
+        loaded = snapshot.loads(
+            Cfg, mangle(snapshot.dumps(cfg)), environ={**ENV, "APP_NAME": "x"}
+        )
+
+        assert "x" == loaded.name
+
+    def test_missing_file_falls_back(self, tmp_path):
+        """
+        If the snapshot doesn't exist, the config is loaded normally.
+        """
+        assert environ.to_config(Cfg, ENV) == snapshot.load(
+            Cfg, tmp_path / "nope", environ=ENV
+        )
+
+    def test_schema_changed_falls_back(self, cfg):
+        """
+        If the schema hash changed, the config is loaded normally.
+        """
+        data = snapshot.dumps(cfg)
+
+        with patch.object(snapshot, "schema_hash", return_value=b"x" * 16):
+            loaded = snapshot.loads(
+                Cfg, data, environ={**ENV, "APP_NAME": "fresh"}
+            )
+
+        assert "fresh" == loaded.name
+
+    def test_different_class_falls_back(self, cfg):
+        """
+        If the snapshot contains a different class, the config is loaded
+        normally.
+        """
+        with patch.object(snapshot, "schema_hash", return_value=b"x" * 16):
+            data = snapshot.dumps(cfg.db)
+            loaded = snapshot.loads(
+                Cfg, data, environ={**ENV, "APP_NAME": "fresh"}
+            )
+
+        assert "fresh" == loaded.name
+
+
+class TestSchemaHash:
+    def test_stable(self):
+        """
+        The hash is stable and has 16 bytes.
+        """
+        h = snapshot.schema_hash(Cfg)
+
+        assert 16 == len(h)
+        assert h == snapshot.schema_hash(Cfg)
+
+    def test_changes(self):
+        """
+        The hash changes if the structure changes.
+        """
+
+        def make(**kw):
+            @environ.config(**kw)
+            class Cfg:
+                @environ.config
+                class Sub:
+                    y = environ.var(object())
+
+                x = environ.var("x")
+                sub = environ.group(Sub)
+
+            return Cfg
+
+        def make_other_default():
+            @environ.config
+            class Cfg:
+                @environ.config
+                class Sub:
+                    y = environ.var()
+
+                x = environ.var("y")
+                sub = environ.group(Sub)
+
+            return Cfg
+
+        hashes = {
+            snapshot.schema_hash(make()),
+            snapshot.schema_hash(make(prefix="OTHER")),
+            snapshot.schema_hash(make_other_default()),
+        }
+
+        assert 3 == len(hashes)
+        assert snapshot.schema_hash(make()) == snapshot.schema_hash(make())
+
+    def test_converters_validators_factories(self):
+        """
+        The hash changes if converters, validators, or default factories
+        change -- also of plain attrs attributes.
+        """
+
+        def make(converter=str, validator=None, factory=list, plain=str):
+            @environ.config
+            class Cfg:
+                port = environ.var(converter=converter, validator=validator)
+                tags = environ.var(attrs.Factory(factory))
+                other: int = attrs.field(default=0, converter=plain)
+
+            return Cfg
+
+        hashes = {
+            snapshot.schema_hash(make()),
+            snapshot.schema_hash(make(converter=int)),
+            snapshot.schema_hash(
+                make(validator=attrs.validators.instance_of(str))
+            ),
+            snapshot.schema_hash(
+                make(validator=attrs.validators.instance_of(bytes))
+            ),
+            snapshot.schema_hash(make(factory=dict)),
+            snapshot.schema_hash(make(plain=int)),
+        }
+
+        assert 6 == len(hashes)
+        assert snapshot.schema_hash(
+            make(validator=attrs.validators.instance_of(str))
+        ) == snapshot.schema_hash(
+            make(validator=attrs.validators.instance_of(str))
+        )
+
+
+@pytest.fixture(name="published")
+def _published():
+    cfg, shm = snapshot.publish(Cfg, ENV)
+
+    yield cfg, shm
+
+    shm.close()
+    shm.unlink()
+
+
+class TestSharedMemory:
+    def test_attach(self, published):
+        """
+        Published configs can be attached to without running getters.
+        """
+        cfg, shm = published
+
+        with _no_getters():
+            attached = snapshot.attach(Cfg, shm.name, environ={})
+
+        assert environ.to_config(Cfg, ENV) == cfg == attached
+        assert cfg is not attached
+
+    def test_attach_does_not_unlink(self, published):
+        """
+        Attaching leaves the segment intact for other workers.
+        """
+        cfg, shm = published
+
+        snapshot.attach(Cfg, shm.name)
+
+        assert cfg == snapshot.attach(Cfg, shm.name, environ={})
+
+    def test_encrypted(self):
+        """
+        Secrets in shared memory can be encrypted.
+        """
+        env = {**ENV, "SNAP_KEY": Fernet.generate_key().decode()}
+        cfg, shm = snapshot.publish(Cfg, env, key_env="SNAP_KEY")
+        try:
+            assert b"s3kr3t" not in bytes(shm.buf)
+            assert cfg == snapshot.attach(
+                Cfg, shm.name, key_env="SNAP_KEY", environ=env
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_missing_falls_back(self):
+        """
+        If the segment doesn't exist, the config is loaded normally.
+        """
+        assert environ.to_config(Cfg, ENV) == snapshot.attach(
+            Cfg, "environ-config-does-not-exist", environ=ENV
+        )
+
+    def test_must_be_frozen(self):
+        """
+        Only frozen configs with frozen groups can be published.
+        """
+
+        @environ.config(frozen=True)
+        class Partially:
+            @environ.config
+            class Sub:
+                x = environ.var("x")
+
+            sub = environ.group(Sub)
+
+        with pytest.raises(TypeError, match="Partially and all its groups"):
+            snapshot.publish(Partially, {})
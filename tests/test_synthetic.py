@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: Apache-2.0
+#
+# Copyright 2017 Hynek Schlawack
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+import environ
+
+from ._synthetic import generate
+
+
+fractions = st.floats(0, 1)
+shapes = st.builds(
+    generate,
+    fields=st.integers(0, 200),
+    depth=st.integers(1, 20),
+    optional=fractions,
+    secrets=fractions,
+    converters=fractions,
+    seed=st.integers(),
+)
+
+
+def _help_vars(cls):
+    return [
+        line.split(" ", 1)[0]
+        for line in environ.generate_help(cls).splitlines()
+    ]
+
+
+class TestGenerated:
+    @settings(max_examples=50, deadline=None)
+    @given(shapes)
+    def test_to_config(self, syn):
+        """
+        Generated configs load into the expected values.
+        """
+        assert syn.expected == environ.to_config(syn.cls, syn.environ)
+
+    @settings(max_examples=50, deadline=None)
+    @given(shapes)
+    def test_generate_help(self, syn):
+        """
+        Help for generated configs lists all variables.
+        """
+        assert syn.help_vars == _help_vars(syn.cls)
+
+    def test_at_scale(self):
+        """
+        Loading and help work for thousands of attributes in deep trees.
+        """
+        syn = generate(
+            5000, depth=200, optional=0.3, secrets=0.3, converters=0.3
+        )
+
+        assert syn.expected == environ.to_config(syn.cls, syn.environ)
+        assert syn.help_vars == _help_vars(syn.cls)
+
+    def test_repeatable(self):
+        """
+        The same seed generates the same shape.
+        """
+        a, b = (
+            generate(50, depth=5, optional=0.5, secrets=0.5, seed=42)
+            for _ in range(2)
+        )
+
+        assert (a.environ, a.help_vars) == (b.environ, b.help_vars)
+
+    def test_optional(self):
+        """
+        Half of the optional groups are left out of the environment and
+        expected to be None.
+        """
+        syn = generate(100, depth=100, optional=1.0)
+
+        groups = []
+        level = syn.expected
+        while level is not None:
+            groups.append(level.o)
+            level = getattr(level, "g", None)
+
+        assert 100 == len(groups)
+        assert 20 < groups.count(None) < 80
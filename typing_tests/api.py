@@ -20,6 +20,8 @@ import sys
 
 import environ
 
+from environ.secrets.awssm import HedgingPolicy
+
 
 if sys.version_info < (3, 11):
     from typing_extensions import assert_type
@@ -47,6 +49,32 @@ vault_secrets: environ.secrets.VaultEnvSecrets = (
 aws_secrets: environ.secrets.SecretsManagerSecrets = (
     environ.secrets.SecretsManagerSecrets()
 )
+hedged_aws_secrets = environ.secrets.SecretsManagerSecrets(
+    hedging=HedgingPolicy(percentile=0.99, initial_delay=0.05), cache=True
+)
+disk_cached_aws_secrets = environ.secrets.SecretsManagerSecrets(
+    cache_dir="/var/cache/app",
+    cache_key_env="SECRETS_CACHE_KEY",
+    cache_ttl=600,
+)
+lambda_secrets: environ.secrets.LambdaExtensionSecrets = (
+    environ.secrets.LambdaExtensionSecrets(port=2773, timeout=1.0)
+)
+vault_kv: environ.secrets.VaultKVSecrets = environ.secrets.VaultKVSecrets(
+    "app/prod",
+    url="https://vault:8200",
+    mount="kv",
+    renew=True,
+)
+vault_kv.close()
+host_cached: environ.secrets.HostCacheSecrets = (
+    environ.secrets.HostCacheSecrets(
+        "/run/environ.sock", fallback=environ.secrets.SecretsManagerSecrets()
+    )
+)
+ssm_params: environ.secrets.SSMParameters = environ.secrets.SSMParameters(
+    "/app/prod", decrypt=True, cache_ttl=60.0
+)
 
 
 @environ.config
@@ -67,6 +95,12 @@ class Config:
     d_secret: str = dir_secrets.secret(help="help!")
     v_secret: str = vault_secrets.secret()
     a_secret: str = aws_secrets.secret()
+    a_json_secret: str = aws_secrets.secret(json_key="password")
+    a_binary_secret: memoryview = aws_secrets.secret(binary=True)
+    ssm_param: str = ssm_params.secret(name="/shared/key")
+    l_secret: str = lambda_secrets.secret(json_key="password")
+    kv_secret: str = vault_kv.secret(name="password")
+    hc_secret: str = host_cached.secret()
 
 
 assert_type(environ.generate_help(Config), str)
@@ -99,3 +133,51 @@ class ConfigNoPrefix:
 @environ.config()
 class ConfigEmptyParens:
     test_var = environ.var()
+
+
+for c in environ.to_config_many(Config, [{"APP_X": "123"}]):
+    assert_type(c, "Config | Exception")
+
+
+@environ.config(frozen=True, cache_hash=True)
+class ConfigCachedHash:
+    test_var = environ.var()
+
+
+environ.snapshot.dump(cfg, "cfg.snap", key_env="SNAPSHOT_KEY")
+assert_type(environ.snapshot.load(Config, "cfg.snap"), Config)
+assert_type(environ.snapshot.loads(Config, b""), Config)
+assert_type(environ.snapshot.dumps(cfg), bytes)
+
+shared_cfg, shm = environ.snapshot.publish(ConfigCachedHash, {})
+assert_type(shared_cfg, ConfigCachedHash)
+assert_type(
+    environ.snapshot.attach(ConfigCachedHash, shm.name), ConfigCachedHash
+)
+
+assert_type(environ.prefetch(Config).result(), None)
+
+assert_type(environ.to_config(Config, timeout=1.5, fallback=True), Config)
+
+
+def on_field(event: environ.FieldEvent) -> None:
+    assert_type(event.duration, float | None)
+
+
+def on_load(event: environ.LoadEvent) -> None:
+    assert_type(event.exception, BaseException | None)
+
+
+remove_hooks = environ.instrument(on_field=on_field, on_load=on_load)
+assert_type(remove_hooks(), None)
+
+prof = environ.profile(Config, {})
+assert_type(prof, environ.LoadProfile)
+assert_type(prof.report(limit=5), str)
+
+registry = environ.metrics.enable()
+assert_type(registry, environ.metrics.Registry)
+assert_type(registry.render(), str)
+registry.counter("app_total", "App.", ("kind",)).inc(kind="x")
+registry.histogram("app_seconds", "App.", buckets=(0.1, 1.0)).observe(0.3)
+environ.metrics.disable()